@@ -25,4 +25,8 @@ celery_app.conf.beat_schedule = {
         "task": "core.tasks.ingest_sector_list",
         "schedule": crontab(minute=0, hour=8),
     },
+    "apply-history-retention": {
+        "task": "core.tasks.apply_history_retention",
+        "schedule": crontab(minute=0, hour=3),
+    },
 }
@@ -42,6 +42,17 @@ APP_ENV: str = env.str("APP_ENV")
 INFRA_SERVICE: str = env.str("INFRA_SERVICE", "MAIN")
 GIT_COMMIT: str = env.str("GIT_COMMIT", None)
 HOST_ALL_APIS = env.bool("HOST_ALL_APIS", default=False)
+# The interface the web services are served over (see the Procfile)
+SERVER_INTERFACE: str = env.str("SERVER_INTERFACE", "wsgi")
+# Serve the hot-path read endpoints with async views. Only worth it under
+# "asgi", and off until it's been shown to beat WSGI (see docs/apis/sso-profile.md)
+ASYNC_API_VIEWS: bool = env.bool("ASYNC_API_VIEWS", False)
+# Services that host a single API rather than the admin/frontend only load the
+# apps, middleware, URLs and routers that API needs
+API_ONLY_SERVICES = ["PEOPLEFINDER", "SSO_PROFILE", "SSO_SCIM"]
+SLIM_SERVICE: bool = env.bool(
+    "SLIM_SERVICE", INFRA_SERVICE in API_ONLY_SERVICES and not HOST_ALL_APIS
+)
 
 # Django
 # https://docs.djangoproject.com/en/5.1/topics/settings/
@@ -129,6 +140,13 @@ LOCAL_APPS = [
     "core.apps.CoreConfig",
 ]
 
+if SLIM_SERVICE:
+    # Keep the admin's models (e.g. LogEntry) without autodiscovering and
+    # importing every ModelAdmin
+    DJANGO_APPS[DJANGO_APPS.index("django.contrib.admin")] = (
+        "django.contrib.admin.apps.SimpleAdminConfig"
+    )
+
 # Application definition
 INSTALLED_APPS: list[str] = LOCAL_APPS + THIRD_PARTY_APPS + DJANGO_APPS
 
@@ -335,6 +353,20 @@ CELERY_RESULT_SERIALIZER = "json"
 # Celery beat
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers.DatabaseScheduler"
 
+# Write the audit log (the admin's LogEntry) from a Celery task once changes
+# commit, rather than in the transaction making them
+AUDIT_LOG_CELERY = env.bool("AUDIT_LOG_CELERY", default=False)
+
+# History retention (core.history), run nightly by Celery beat; 0 turns a step
+# off. Deleting history and audit records is a retention decision, so both are
+# off unless set for the environment.
+HISTORY_RETENTION_DAYS = env.int("HISTORY_RETENTION_DAYS", default=0)
+AUDIT_LOG_RETENTION_DAYS = env.int("AUDIT_LOG_RETENTION_DAYS", default=0)
+HISTORY_RETENTION_BATCH_SIZE = env.int("HISTORY_RETENTION_BATCH_SIZE", default=5000)
+# Collapse the no-op history rows written in this many of the last minutes,
+# overlapping the previous run
+HISTORY_COMPACTION_MINUTES = env.int("HISTORY_COMPACTION_MINUTES", default=25 * 60)
+
 # Disabled as Ninja calls shouldn't be cached.
 CACHES: dict[str, Any] = {
     "default": {
@@ -343,6 +375,21 @@ CACHES: dict[str, Any] = {
         "KEY_PREFIX": "identity_",
     }
 }
+# How long (seconds) a minimal profile may be served from the cache; writes
+# invalidate it sooner.
+SSO_PROFILE_CACHE_TIMEOUT: int = env.int("SSO_PROFILE_CACHE_TIMEOUT", 60 * 60)
+# The SSO_PROFILE service also keeps a small in-process cache in front of the
+# shared one, kept in sync across pods via Redis pub/sub.
+SSO_PROFILE_LOCAL_CACHE_ENABLED: bool = env.bool(
+    "SSO_PROFILE_LOCAL_CACHE_ENABLED", INFRA_SERVICE == "SSO_PROFILE"
+)
+SSO_PROFILE_LOCAL_CACHE_MAX_ENTRIES: int = env.int(
+    "SSO_PROFILE_LOCAL_CACHE_MAX_ENTRIES", 10_000
+)
+SSO_PROFILE_LOCAL_CACHE_TIMEOUT: int = env.int("SSO_PROFILE_LOCAL_CACHE_TIMEOUT", 60)
+SSO_PROFILE_CACHE_INVALIDATION_CHANNEL: str | None = env.str(
+    "SSO_PROFILE_CACHE_INVALIDATION_CHANNEL", "identity_profile_minimal_invalidation"
+)
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -377,3 +424,16 @@ AUTH_PASSWORD_VALIDATORS: list[dict[str, str]] = [
 CLAM_AV_USERNAME = env.str("CLAM_AV_USERNAME", default=None)
 CLAM_AV_PASSWORD = env.str("CLAM_AV_PASSWORD", default=None)
 CLAM_AV_DOMAIN = env.str("CLAM_AV_DOMAIN", default=None)
+
+# The Staff SSO user sync aborts rather than delete more than this percentage
+# of users, e.g. when the feed it reads is truncated; 100 turns the check off
+SSO_SYNC_MAX_DELETION_PERCENT = env.int("SSO_SYNC_MAX_DELETION_PERCENT", default=10)
+# Number of processes the sync_sso_users command partitions the Staff SSO user
+# feed across; the admin action always syncs in its own process
+SSO_SYNC_WORKERS = env.int("SSO_SYNC_WORKERS", default=1)
+# Copy the Staff SSO user feed into a staging table and merge it in SQL, rather
+# than writing it through the ORM
+SSO_SYNC_COPY = env.bool("SSO_SYNC_COPY", default=False)
+# Upsert each chunk of the country, UK staff location and sector list exports
+# with one INSERT ... ON CONFLICT, rather than a row at a time
+DATA_FLOW_BULK_INGEST = env.bool("DATA_FLOW_BULK_INGEST", default=False)
@@ -13,7 +13,15 @@ STORAGES["staticfiles"][
 ] = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
 # Required for tests to bypass SSO.
-MIDDLEWARE.remove("authbroker_client.middleware.ProtectAllViewsMiddleware")  # noqa
+if "authbroker_client.middleware.ProtectAllViewsMiddleware" in MIDDLEWARE:  # noqa
+    MIDDLEWARE.remove("authbroker_client.middleware.ProtectAllViewsMiddleware")  # noqa
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+SSO_PROFILE_CACHE_INVALIDATION_CHANNEL = None
 
 # Turn off Celery
 CELERY_ALWAYS_EAGER = True
@@ -1,16 +1,34 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
 from core.api import main_api, people_finder_api, scim_api, sso_profile_api
 
 
-urlpatterns = [
-    path("api/scim/", scim_api.urls),
-    path("api/sso/", sso_profile_api.urls),
-    path("api/peoplefinder/", people_finder_api.urls),
-    path("api/", main_api.urls),
+api_urlpatterns = {
+    "SSO_SCIM": [path("api/scim/", scim_api.urls)],
+    "SSO_PROFILE": [path("api/sso/", sso_profile_api.urls)],
+    "PEOPLEFINDER": [path("api/peoplefinder/", people_finder_api.urls)],
+    "MAIN": [path("api/", main_api.urls)],
+}
+
+if settings.SLIM_SERVICE:
+    urlpatterns = [*api_urlpatterns[settings.INFRA_SERVICE]]
+else:
+    urlpatterns = [
+        *api_urlpatterns["SSO_SCIM"],
+        *api_urlpatterns["SSO_PROFILE"],
+        *api_urlpatterns["PEOPLEFINDER"],
+        *api_urlpatterns["MAIN"],
+    ]
+
+urlpatterns += [
+    # the admin and auth are kept everywhere for logging in to the API docs
     path("admin/", admin.site.urls),
     path("auth/", include("authbroker_client.urls")),
     path("pingdom/", include("pingdom.urls")),
-    path("", include("core.urls")),
 ]
+
+if not settings.SLIM_SERVICE or settings.INFRA_SERVICE == "PEOPLEFINDER":
+    # profile photos
+    urlpatterns.append(path("", include("core.urls")))
@@ -2,6 +2,7 @@ import datetime as dt
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 from profiles.models.combined import Profile
 from profiles.models.generic import Country, Email, UkStaffLocation
@@ -11,6 +12,7 @@ from profiles.models.peoplefinder import (
     PeopleFinderTeamTree,
 )
 from profiles.models.staff_sso import StaffSSOProfile, StaffSSOProfileEmail
+from profiles.services.combined import local_minimal_cache
 from profiles.services.peoplefinder.team import get_root_team
 
 
@@ -19,6 +21,12 @@ pytestmark = pytest.mark.django_db
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True, scope="function")
+def clear_cache():
+    cache.clear()
+    local_minimal_cache.clear()
+
+
 @pytest.fixture(autouse=True, scope="function")
 def basic_user():
     return User.objects.create_user(
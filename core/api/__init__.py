@@ -3,12 +3,6 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django_hawk.utils import DjangoHawkAuthenticationFailed, authenticate_request
 from ninja import NinjaAPI
 
-from core.api.main import router as main_router
-from core.api.peoplefinder.profile import router as peoplefinder_profile_router
-from core.api.peoplefinder.team import router as peoplefinder_team_router
-from core.api.scim import router as scim_router
-from core.api.sso_profile import router as sso_profile_router
-
 
 def do_hawk_auth(request) -> bool:
     if settings.APP_ENV in ("local", "test", "staging"):
@@ -27,7 +21,11 @@ main_api = NinjaAPI(
     auth=[do_hawk_auth],
     docs_decorator=staff_member_required,
 )
+# Routers are only imported by the services that host them, so each service
+# only loads the code it serves
 if settings.INFRA_SERVICE == "MAIN" or settings.HOST_ALL_APIS:
+    from core.api.main import router as main_router
+
     main_api.add_router("", main_router)
 
 scim_api = NinjaAPI(
@@ -39,7 +37,11 @@ scim_api = NinjaAPI(
     docs_decorator=staff_member_required,
 )
 if settings.INFRA_SERVICE == "SSO_SCIM" or settings.HOST_ALL_APIS:
+    from core.api.scim import bulk_router as scim_bulk_router
+    from core.api.scim import router as scim_router
+
     scim_api.add_router("/v2/Users", scim_router)
+    scim_api.add_router("/v2/Bulk", scim_bulk_router)
 
 sso_profile_api = NinjaAPI(
     title="SSO Fast Profile API",
@@ -50,6 +52,8 @@ sso_profile_api = NinjaAPI(
     docs_decorator=staff_member_required,
 )
 if settings.INFRA_SERVICE == "SSO_PROFILE" or settings.HOST_ALL_APIS:
+    from core.api.sso_profile import router as sso_profile_router
+
     sso_profile_api.add_router("", sso_profile_router)
 
 people_finder_api = NinjaAPI(
@@ -61,6 +65,9 @@ people_finder_api = NinjaAPI(
     docs_decorator=staff_member_required,
 )
 if settings.INFRA_SERVICE == "PEOPLEFINDER" or settings.HOST_ALL_APIS:
+    from core.api.peoplefinder.profile import router as peoplefinder_profile_router
+    from core.api.peoplefinder.team import router as peoplefinder_team_router
+
     people_finder_api.add_router("", peoplefinder_profile_router)
     people_finder_api.add_router("", peoplefinder_team_router)
 
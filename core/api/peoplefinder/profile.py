@@ -1,7 +1,9 @@
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from ninja import Form, Router
 
 from core import services as core_services
+from core.etags import etag_matches, make_etag, not_modified
 from core.schemas import Error
 from core.schemas.peoplefinder.profile import (
     CountryResponse,
@@ -39,9 +41,14 @@ router.add_router("reference", reference_router)
         404: Error,
     },
 )
-def get_profile(request, slug: str):
+def get_profile(request, slug: str, response: HttpResponse):
     """Endpoint to return a full peoplefinder profile record"""
     try:
+        # checked before loading the profile, so a 304 skips serialisation
+        etag = make_etag(core_services.get_peoplefinder_profile_version(slug=slug))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response["ETag"] = etag
         return core_services.get_peoplefinder_profile_by_slug(slug=slug)
     except PeopleFinderProfile.DoesNotExist:
         return 404, {
@@ -1,6 +1,8 @@
+from django.http import HttpResponse
 from ninja import Router
 
 from core import services as core_services
+from core.etags import etag_matches, make_etag, not_modified
 from core.schemas import Error
 from core.schemas.peoplefinder.team import (
     CreateTeamRequest,
@@ -48,9 +50,16 @@ def get_hierarcy_of_all_teams(request) -> tuple[int, PeopleFinderHierarchyData |
         404: Error,
     },
 )
-def get_team(request, slug: str) -> tuple[int, PeopleFinderTeamData | dict]:
+def get_team(
+    request, slug: str, response: HttpResponse
+) -> tuple[int, PeopleFinderTeamData | dict] | HttpResponse:
     """Endpoint to return a peoplefinder team record and parent team(s) information"""
     try:
+        # checked before loading the team, so a 304 skips serialisation
+        etag = make_etag(core_services.get_peoplefinder_team_version(slug=slug))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response["ETag"] = etag
         team = core_services.get_peoplefinder_team_by_slug(slug=slug)
         return 200, core_services.get_peoplefinder_team_and_parents(team)
     except PeopleFinderTeam.DoesNotExist:
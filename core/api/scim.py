@@ -1,38 +1,140 @@
-from ninja import Router
+from django.conf import settings
+from django.urls import reverse
+from ninja import Query, Router
 
 from core import services as core_services
 from core.schemas.scim import (
+    BulkRequest,
+    BulkResponse,
     CreateUserRequest,
     CreateUserResponse,
     GetUserResponse,
+    ListUserResponse,
+    PatchUserRequest,
+    PatchUserResponse,
     ScimErrorSchema,
     UpdateUserRequest,
     UpdateUserResponse,
 )
+from core.scim_bulk import get_user_id, plan_operations
+from core.scim_filters import (
+    InvalidCursor,
+    InvalidFilter,
+    decode_cursor,
+    encode_cursor,
+    parse_filter,
+)
+from core.scim_patch import InvalidPatch, parse_patch
 from profiles.models.combined import Profile
 from user.exceptions import UserExists
 from user.models import User
 
 
 router = Router()
+bulk_router = Router()
+
+MAX_PAGE_SIZE = 1000
+MAX_BULK_OPERATIONS = 5000
 
 
 @router.get(
-    "/{id}",
+    "",
     response={
-        200: GetUserResponse,
-        404: ScimErrorSchema,
+        200: ListUserResponse,
+        400: ScimErrorSchema,
     },
+    exclude_none=True,
 )
-def get_user(request, id: str):
-    """Returns the Identity record (internally: Profile) with the given ID"""
+def list_users(
+    request,
+    filter_: str | None = Query(None, alias="filter"),
+    startIndex: int = 1,
+    count: int = 100,
+    cursor: str | None = None,
+):
+    """
+    Lists the Identity records matching the filter, a page at a time. Follow
+    `nextCursor` (start with an empty `cursor`) rather than `startIndex` to walk
+    every page cheaply: cursor pages leave out `totalResults`, rather than
+    count every match each time.
+    """
     try:
-        return core_services.get_identity_by_id(id=id, include_inactive=True)
-    except Profile.DoesNotExist:
-        return 404, {
-            "status": "404",
-            "detail": "Unable to find user",
+        filters = parse_filter(filter_) if filter_ else {}
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidFilter as e:
+        return 400, {
+            "status": "400",
+            "scimType": "invalidFilter",
+            "detail": str(e),
         }
+    except InvalidCursor as e:
+        return 400, {
+            "status": "400",
+            "scimType": "invalidCursor",
+            "detail": str(e),
+        }
+    count = max(0, min(count, MAX_PAGE_SIZE))
+    startIndex = max(1, startIndex)
+
+    profiles = core_services.get_identities(**filters)
+    page = []
+    next_cursor = None
+    if count:
+        # one extra to tell whether there's a next page
+        page = core_services.get_identities_page(
+            profiles=profiles, count=count + 1, after=after, offset=startIndex - 1
+        )
+        if len(page) > count:
+            page = page[:count]
+            next_cursor = encode_cursor(page[-1].sso_email_id)
+
+    return 200, {
+        "totalResults": profiles.count() if cursor is None else None,
+        # a cursor replaces the index, see RFC 9865
+        "startIndex": None if cursor is not None else startIndex,
+        "itemsPerPage": len(page),
+        "nextCursor": next_cursor,
+        "Resources": page,
+    }
+
+
+if settings.ASYNC_API_VIEWS:
+
+    @router.get(
+        "/{id}",
+        response={
+            200: GetUserResponse,
+            404: ScimErrorSchema,
+        },
+    )
+    async def get_user(request, id: str):
+        """Returns the Identity record (internally: Profile) with the given ID"""
+        try:
+            return await core_services.aget_identity_by_id(id=id, include_inactive=True)
+        except Profile.DoesNotExist:
+            return 404, {
+                "status": "404",
+                "detail": "Unable to find user",
+            }
+
+else:
+
+    @router.get(
+        "/{id}",
+        response={
+            200: GetUserResponse,
+            404: ScimErrorSchema,
+        },
+    )
+    def get_user(request, id: str):
+        """Returns the Identity record (internally: Profile) with the given ID"""
+        try:
+            return core_services.get_identity_by_id(id=id, include_inactive=True)
+        except Profile.DoesNotExist:
+            return 404, {
+                "status": "404",
+                "detail": "Unable to find user",
+            }
 
 
 @router.post(
@@ -103,6 +205,7 @@ def update_user(
             contact_email=str(contact_email) if contact_email else core_services.UNSET,
             is_active=scim_user.active,
         )
+        core_services.forget_identity_sync_states(ids=[id])
         return 200, profile
     except User.DoesNotExist:
         return 404, {
@@ -111,20 +214,101 @@ def update_user(
         }
 
 
+@router.patch(
+    "/{id}",
+    response={200: PatchUserResponse, 400: ScimErrorSchema, 404: ScimErrorSchema},
+)
+def patch_user(request, id: str, patch_request: PatchUserRequest):
+    """
+    Updates only the attributes of the given Identity record that the
+    operations touch: active, name.givenName, name.familyName and emails.
+    """
+    try:
+        profile = core_services.get_identity_by_id(id=id, include_inactive=True)
+    except Profile.DoesNotExist:
+        return 404, {
+            "status": "404",
+            "detail": "User does not exist",
+        }
+    try:
+        changes = parse_patch(
+            operations=patch_request.Operations, emails=profile.emails
+        )
+    except InvalidPatch as e:
+        return 400, {
+            "status": "400",
+            "scimType": e.scim_type,
+            "detail": e.detail,
+        }
+
+    core_services.partial_update_identity(profile=profile, **changes)
+    core_services.forget_identity_sync_states(ids=[id])
+    return 200, profile
+
+
 @router.delete("/{id}", response={204: None, 404: ScimErrorSchema})
 def delete_user(
     request,
     id: str,
-) -> int | tuple[int, dict]:
+) -> tuple[int, dict | None]:
     """Deleted the Identity record with the given ID"""
     try:
         profile = core_services.get_identity_by_id(id=id, include_inactive=True)
         core_services.delete_identity(
             profile=profile,
         )
-        return 204
+        return 204, None
     except User.DoesNotExist:
         return 404, {
             "status": "404",
             "detail": "User does not exist",
         }
+
+
+@bulk_router.post(
+    "",
+    response={
+        200: BulkResponse,
+        413: ScimErrorSchema,
+    },
+    exclude_none=True,
+)
+def bulk(request, bulk_request: BulkRequest):
+    """
+    Applies many POST, PUT and DELETE operations on Identity records in a
+    single transaction. If failOnErrors is given and that many operations are
+    invalid, none are applied and only the errors are returned.
+    """
+    if len(bulk_request.Operations) > MAX_BULK_OPERATIONS:
+        return 413, {
+            "status": "413",
+            "detail": f"Unable to apply more than {MAX_BULK_OPERATIONS} operations at once",
+        }
+
+    existing_ids = core_services.get_existing_identity_ids(
+        ids=[
+            id
+            for id in map(get_user_id, bulk_request.Operations)
+            if isinstance(id, str)
+        ]
+    )
+    plan = plan_operations(
+        operations=bulk_request.Operations,
+        existing_ids=existing_ids,
+        get_location=lambda id: request.build_absolute_uri(
+            reverse("scim:get_user", kwargs={"id": id})
+        ),
+    )
+
+    fail_on_errors = bulk_request.failOnErrors
+    if fail_on_errors and plan.errors >= fail_on_errors:
+        errors = [result for result in plan.results if "response" in result]
+        return 200, {"Operations": errors[:fail_on_errors]}
+
+    core_services.bulk_apply_identity_changes(
+        creates=plan.creates, updates=plan.updates, deletes=plan.deletes
+    )
+    core_services.forget_identity_sync_states(
+        ids=[identity["id"] for identity in plan.updates]
+    )
+    return 200, {"Operations": plan.results}
@@ -1,26 +1,166 @@
+import json
+
+from django.conf import settings
+from django.http import HttpResponse
 from ninja import Router
 
 from core import services as core_services
+from core.etags import etag_matches, make_etag, not_modified
 from core.schemas import Error
-from core.schemas.profiles import ProfileMinimal
+from core.schemas.profiles import (
+    BulkProfileMinimalByEmailRequest,
+    BulkProfileMinimalByEmailResponse,
+    BulkProfileMinimalRequest,
+    BulkProfileMinimalResponse,
+    ProfileMinimal,
+    ProfileMinimalCacheStats,
+)
 from profiles.models.combined import Profile
 
 
 router = Router()
 
+MAX_BULK_IDS = 500
+
+
+@router.get(
+    "cache/stats",
+    response={
+        200: ProfileMinimalCacheStats,
+    },
+)
+def get_cache_stats(request):
+    """Cache statistics for the process serving the request, for sizing the caches"""
+    return core_services.get_identity_cache_stats()
+
+
+# NB must be registered before "{id}" so POSTs aren't routed to the GET-only path
+@router.post(
+    "bulk",
+    response={
+        200: BulkProfileMinimalResponse,
+        400: Error,
+    },
+)
+def get_users(request, bulk_request: BulkProfileMinimalRequest):
+    """Returns the minimal Identity records for many IDs in a single request"""
+    if len(bulk_request.ids) > MAX_BULK_IDS:
+        return 400, {
+            "message": f"Unable to look up more than {MAX_BULK_IDS} users at once",
+        }
+    found = core_services.get_identities_minimal_by_ids(ids=bulk_request.ids)
+    # the documents are already serialised, so splice them in rather than
+    # validating them back through the response schema
+    content = b"".join(
+        [
+            b'{"results":[',
+            b",".join(found["results"]),
+            b'],"inactive":',
+            json.dumps(found["inactive"]).encode(),
+            b',"missing":',
+            json.dumps(found["missing"]).encode(),
+            b"}",
+        ]
+    )
+    return HttpResponse(content, content_type="application/json")
+
+
+# NB must be registered before "by-email/{email}", as above
+@router.post(
+    "by-email/bulk",
+    response={
+        200: BulkProfileMinimalByEmailResponse,
+        400: Error,
+    },
+)
+def get_users_by_email(request, bulk_request: BulkProfileMinimalByEmailRequest):
+    """Returns the minimal Identity records for many email addresses in a single request"""
+    if len(bulk_request.emails) > MAX_BULK_IDS:
+        return 400, {
+            "message": f"Unable to look up more than {MAX_BULK_IDS} users at once",
+        }
+    found = core_services.get_identities_minimal_by_emails(emails=bulk_request.emails)
+    results = b",".join(
+        json.dumps(email).encode() + b":" + document
+        for email, document in found["results"].items()
+    )
+    content = b"".join(
+        [
+            b'{"results":{',
+            results,
+            b'},"missing":',
+            json.dumps(found["missing"]).encode(),
+            b"}",
+        ]
+    )
+    return HttpResponse(content, content_type="application/json")
+
 
 @router.get(
-    "{id}",
+    "by-email/{email}",
     response={
         200: ProfileMinimal,
         404: Error,
     },
 )
-def get_user(request, id: str):
-    """Optimised, low-flexibility endpoint to return a minimal Identity record (internally: Profile)"""
+def get_user_by_email(request, email: str):
+    """Returns the minimal Identity record that has the given email address, in any case"""
     try:
-        return core_services.get_identity_by_id(id=id)
+        document = core_services.get_identity_minimal_by_email(email=email)
     except Profile.DoesNotExist:
         return 404, {
             "message": "Unable to find user",
         }
+    return document_response(request, document)
+
+
+if settings.ASYNC_API_VIEWS:
+
+    @router.get(
+        "{id}",
+        response={
+            200: ProfileMinimal,
+            404: Error,
+        },
+    )
+    async def get_user(request, id: str):
+        """Optimised, low-flexibility endpoint to return a minimal Identity record (internally: Profile)"""
+        try:
+            document = await core_services.aget_identity_minimal_by_id(id=id)
+        except Profile.DoesNotExist:
+            return 404, {
+                "message": "Unable to find user",
+            }
+        return document_response(request, document)
+
+else:
+
+    @router.get(
+        "{id}",
+        response={
+            200: ProfileMinimal,
+            404: Error,
+        },
+    )
+    def get_user(request, id: str):
+        """Optimised, low-flexibility endpoint to return a minimal Identity record (internally: Profile)"""
+        try:
+            document = core_services.get_identity_minimal_by_id(id=id)
+        except Profile.DoesNotExist:
+            return 404, {
+                "message": "Unable to find user",
+            }
+        return document_response(request, document)
+
+
+def document_response(request, document: bytes) -> HttpResponse:
+    """
+    Respond with a pre-serialised document, already matching the ProfileMinimal
+    schema, or with a 304 if the client's copy is current
+    """
+    etag = make_etag(document)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return HttpResponse(
+        document, content_type="application/json", headers={"ETag": etag}
+    )
@@ -0,0 +1,174 @@
+"""
+Audit log sink for the admin's LogEntry. Entries logged inside an atomic()
+block are collected and written together with a single bulk_create when it
+ends, or by a Celery task once it commits if AUDIT_LOG_CELERY is set. Outside
+of one they're written straight away.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import partial
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.contrib.admin.options import get_content_type_for_model
+from django.db import models, transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+# The entries of the atomic() block being run, if any
+buffer: ContextVar[Optional[list[LogEntry]]] = ContextVar("audit_buffer", default=None)
+
+# LogEntry fields passed to the Celery task
+ENTRY_FIELDS = (
+    "action_time",
+    "user_id",
+    "content_type_id",
+    "object_id",
+    "object_repr",
+    "action_flag",
+    "change_message",
+)
+
+
+def build_entry(
+    user_id: str, obj: models.Model, action_flag: int, change_message: str
+) -> LogEntry:
+    """
+    The entry LogEntry.objects.log_action would write for the object, timed now
+    so that entries keep the order they were logged in
+    """
+    return LogEntry(
+        action_time=timezone.now(),
+        user_id=user_id,
+        content_type_id=get_content_type_for_model(obj).pk,
+        object_id=str(obj.pk),
+        object_repr=str(obj)[:200],
+        action_flag=action_flag,
+        change_message=change_message,
+    )
+
+
+def log_action(
+    user_id: str, obj: models.Model, action_flag: int, change_message: str
+) -> None:
+    log_entries(
+        entries=[
+            build_entry(
+                user_id=user_id,
+                obj=obj,
+                action_flag=action_flag,
+                change_message=change_message,
+            )
+        ]
+    )
+
+
+def log_actions(
+    user_id: str,
+    objs: Iterable[models.Model],
+    action_flag: int,
+    change_message: str,
+) -> None:
+    log_entries(
+        entries=[
+            build_entry(
+                user_id=user_id,
+                obj=obj,
+                action_flag=action_flag,
+                change_message=change_message,
+            )
+            for obj in objs
+        ]
+    )
+
+
+def log_entries(entries: list[LogEntry]) -> None:
+    if not entries:
+        return
+    entries_buffer = buffer.get()
+    if entries_buffer is None:
+        LogEntry.objects.bulk_create(entries)
+    else:
+        entries_buffer.extend(entries)
+
+
+@contextmanager
+def atomic() -> Iterator[None]:
+    """
+    Run the block in a transaction, collecting the audit entries logged in it
+    to write them together at the end. When the block raises, its entries are
+    dropped along with the changes they record; a nested block's entries are
+    left to the outermost one.
+    """
+    entries_buffer = buffer.get()
+    if entries_buffer is not None:
+        start = len(entries_buffer)
+        try:
+            with transaction.atomic():
+                yield
+        except BaseException:
+            del entries_buffer[start:]
+            raise
+        return
+
+    token = buffer.set([])
+    try:
+        with transaction.atomic():
+            yield
+            flush(entries=buffer.get() or [])
+    finally:
+        buffer.reset(token)
+
+
+def flush(entries: list[LogEntry]) -> None:
+    if not entries:
+        return
+    if not settings.AUDIT_LOG_CELERY:
+        LogEntry.objects.bulk_create(entries)
+        return
+    transaction.on_commit(
+        partial(
+            enqueue,
+            entries=[
+                {
+                    **{field: getattr(entry, field) for field in ENTRY_FIELDS},
+                    "action_time": entry.action_time.isoformat(),
+                }
+                for entry in entries
+            ],
+        )
+    )
+
+
+def enqueue(entries: list[dict]) -> None:
+    """
+    Queue the entries of a committed block for the Celery task, writing them
+    now if they can't be queued rather than losing them
+    """
+    from core.tasks import write_audit_entries
+
+    try:
+        write_audit_entries.delay(entries)
+    except Exception:
+        logger.exception("Unable to queue %s audit entries", len(entries))
+        write(entries=entries)
+
+
+def write(entries: list[dict]) -> None:
+    LogEntry.objects.bulk_create(
+        [
+            LogEntry(
+                **{
+                    **entry,
+                    "action_time": datetime.fromisoformat(entry["action_time"]),
+                }
+            )
+            for entry in entries
+        ]
+    )
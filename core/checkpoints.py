@@ -0,0 +1,119 @@
+"""
+Checkpoints for the DataFlow S3 ingests. Each chunk of an export an importer
+writes is committed together with how many lines it has got through, so that
+a run that dies part way is resumed from its last chunk by the next run over
+the same S3 object, and so that whatever is missing from the export is only
+deleted once all of it has been read.
+
+The S3 object each importer last ingested in full is recorded too, by its key,
+ETag and size, so that a run over an export that hasn't changed is skipped.
+"""
+
+import logging
+
+from data_flow_s3_import.types import S3ObjectSummary
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import IngestCheckpoint, IngestRecord
+
+
+logger = logging.getLogger(__name__)
+
+
+def start(importer: str, source: S3ObjectSummary) -> IngestCheckpoint:
+    """
+    The importer's checkpoint in the S3 object, where its last run over the
+    object got to, or a fresh one if the last run was over another object
+    """
+    checkpoint, created = IngestCheckpoint.objects.get_or_create(
+        importer=importer,
+        defaults={"source_key": source.key, "source_etag": source.e_tag},
+    )
+    if (checkpoint.source_key, checkpoint.source_etag) != (source.key, source.e_tag):
+        checkpoint.source_key = source.key
+        checkpoint.source_etag = source.e_tag
+        checkpoint.lines = 0
+        checkpoint.completed = False
+        checkpoint.save()
+    elif not created:
+        logger.info(
+            "Resuming %s from line %s of %s",
+            importer,
+            checkpoint.lines,
+            source.key,
+        )
+    return checkpoint
+
+
+def advance(checkpoint: IngestCheckpoint, lines: int) -> None:
+    """
+    Move the checkpoint on past a chunk of lines. To be called in the
+    transaction the chunk was written in, so that both are committed or
+    neither is.
+    """
+    checkpoint.lines += lines
+    checkpoint.save(update_fields=["lines", "updated"])
+
+
+def complete(checkpoint: IngestCheckpoint) -> None:
+    """
+    Mark every line of the export as processed
+    """
+    checkpoint.completed = True
+    checkpoint.save(update_fields=["completed", "updated"])
+
+
+def finish(checkpoint: IngestCheckpoint) -> None:
+    """
+    Drop the checkpoint, once the run is done with it
+    """
+    checkpoint.delete()
+
+
+def is_unchanged(importer: str, source: S3ObjectSummary) -> bool:
+    """
+    Whether the S3 object is the one the importer last ingested in full, by
+    its key, ETag and size, counting the run as skipped if it is
+    """
+    return bool(
+        IngestRecord.objects.filter(
+            importer=importer,
+            source_key=source.key,
+            source_etag=source.e_tag,
+            source_size=source.size,
+        ).update(skips=F("skips") + 1, checked=timezone.now())
+    )
+
+
+def record_ingest(importer: str, source: S3ObjectSummary) -> None:
+    """
+    Record the S3 object as the one the importer last ingested in full
+    """
+    now = timezone.now()
+    source_fields = {
+        "source_key": source.key,
+        "source_etag": source.e_tag,
+        "source_size": source.size,
+        "ingested": now,
+        "checked": now,
+    }
+    if not IngestRecord.objects.filter(importer=importer).update(
+        ingests=F("ingests") + 1, **source_fields
+    ):
+        IngestRecord.objects.create(importer=importer, ingests=1, **source_fields)
+
+
+def get_ingest_stats(importer: str) -> dict:
+    """
+    How many of the importer's runs have been ingested, and skipped as the
+    export was unchanged, and when it last ingested one
+    """
+    record = IngestRecord.objects.filter(importer=importer).first()
+    if record is None:
+        return {"ingests": 0, "skips": 0, "last_ingested": None}
+    return {
+        "ingests": record.ingests,
+        "skips": record.skips,
+        "last_ingested": record.ingested.isoformat(),
+    }
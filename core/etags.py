@@ -0,0 +1,36 @@
+import hashlib
+
+from django.http import HttpRequest, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+
+def make_etag(*parts: str | int | bytes) -> str:
+    """
+    A strong ETag for a response, derived from a record's version token(s) or
+    its serialised content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x1f")
+    return quote_etag(digest.hexdigest())
+
+
+def etag_matches(request: HttpRequest, etag: str) -> bool:
+    """
+    Whether the client's If-None-Match header says it already has this version
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    # weak comparison, as If-None-Match requires
+    return "*" in etags or etag.removeprefix("W/") in (
+        tag.removeprefix("W/") for tag in etags
+    )
+
+
+def not_modified(etag: str) -> HttpResponseNotModified:
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,8 @@
+class SyncDeletionLimitExceeded(Exception):
+    def __init__(self, message):
+        self.message = message
+
+
+class IngestScanIncomplete(Exception):
+    def __init__(self, message):
+        self.message = message
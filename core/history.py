@@ -0,0 +1,127 @@
+"""
+Lifecycle of the history kept by django-simple-history and the admin's
+LogEntry: rows past their retention period are deleted in batches, keeping
+the latest history row of every object, and consecutive history rows that
+record no change are collapsed.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.core.management import call_command
+from django.db import models
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from simple_history.exceptions import NotHistoricalModelError  # type: ignore
+from simple_history.models import registered_models  # type: ignore
+from simple_history.utils import get_history_model_for_model  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+# Fields bumped by every save, that don't make a history row a change
+COMPACTION_EXCLUDED_FIELDS = ["revision", "modified"]
+
+
+def get_history_models() -> list[type[models.Model]]:
+    history_models = []
+    for model in registered_models.values():
+        try:
+            history_models.append(get_history_model_for_model(model))
+        except NotHistoricalModelError:
+            # the through models of historical many-to-many fields
+            continue
+    return history_models
+
+
+def delete_in_batches(queryset: models.QuerySet, batch_size: int) -> int:
+    """
+    Delete the rows of the queryset a batch at a time, so that pruning a large
+    backlog doesn't hold locks for long. Returns the number of rows deleted.
+    """
+    deleted = 0
+    while pks := list(queryset.values_list("pk", flat=True)[:batch_size]):
+        queryset.model._base_manager.filter(pk__in=pks).delete()
+        deleted += len(pks)
+    return deleted
+
+
+def get_superseded_history(
+    history_model: type[models.Model],
+) -> models.QuerySet:
+    """
+    The history rows that a later row of the same object supersedes, leaving
+    out the latest row of each object
+    """
+    object_pk = history_model.instance_type._meta.pk.attname  # type: ignore
+    later = history_model.objects.filter(  # type: ignore
+        Q(history_date__gt=OuterRef("history_date"))
+        | Q(history_date=OuterRef("history_date"), pk__gt=OuterRef("pk")),
+        **{object_pk: OuterRef(object_pk)},
+    )
+    return history_model.objects.filter(Exists(later))  # type: ignore
+
+
+def prune_history(days: int, batch_size: int) -> dict[str, int]:
+    """
+    Delete the superseded history rows older than the given number of days;
+    returns the number deleted by historical model
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    return {
+        history_model._meta.label: delete_in_batches(
+            queryset=get_superseded_history(history_model).filter(
+                history_date__lt=cutoff
+            ),
+            batch_size=batch_size,
+        )
+        for history_model in get_history_models()
+    }
+
+
+def prune_audit_log(days: int, batch_size: int) -> int:
+    """
+    Delete the audit log entries older than the given number of days; returns
+    the number deleted
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    return delete_in_batches(
+        queryset=LogEntry.objects.filter(action_time__lt=cutoff),
+        batch_size=batch_size,
+    )
+
+
+def compact_history(minutes: int) -> None:
+    """
+    Collapse consecutive history rows of the last given minutes that record no
+    change, keeping the earliest of them
+    """
+    call_command(
+        "clean_duplicate_history",
+        auto=True,
+        minutes=minutes,
+        excluded_fields=COMPACTION_EXCLUDED_FIELDS,
+        verbosity=0,
+    )
+
+
+def apply_retention() -> None:
+    """
+    Apply the retention policy in the settings, where 0 turns a step off
+    """
+    if settings.HISTORY_COMPACTION_MINUTES:
+        compact_history(minutes=settings.HISTORY_COMPACTION_MINUTES)
+    if settings.HISTORY_RETENTION_DAYS:
+        for label, deleted in prune_history(
+            days=settings.HISTORY_RETENTION_DAYS,
+            batch_size=settings.HISTORY_RETENTION_BATCH_SIZE,
+        ).items():
+            logger.info("History retention: deleted %s %s rows", deleted, label)
+    if settings.AUDIT_LOG_RETENTION_DAYS:
+        deleted = prune_audit_log(
+            days=settings.AUDIT_LOG_RETENTION_DAYS,
+            batch_size=settings.HISTORY_RETENTION_BATCH_SIZE,
+        )
+        logger.info("History retention: deleted %s audit log entries", deleted)
@@ -0,0 +1,88 @@
+import http.client
+import random
+import statistics
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from profiles.models.combined import Profile
+
+
+ENDPOINTS = {
+    "sso-profile": "/api/sso/{id}",
+    "scim": "/api/scim/v2/Users/{id}",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests a running SSO profile or SCIM service with concurrent GETs for "
+        "random users, reporting throughput per server core and latency. Run it "
+        "once against the WSGI deployment and once against the ASGI one "
+        "(SERVER_INTERFACE=asgi, ASYNC_API_VIEWS=true) with the same number of "
+        "server cores, from a host that isn't running the service."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("base_url", help="e.g. http://localhost:8000")
+        parser.add_argument("--endpoint", choices=ENDPOINTS, default="sso-profile")
+        parser.add_argument("-c", "--concurrency", type=int, default=32)
+        parser.add_argument("-d", "--duration", type=int, default=30)
+        parser.add_argument(
+            "--server-cores",
+            type=int,
+            required=True,
+            help="CPU cores available to the service under test",
+        )
+
+    def handle(self, *args, **kwargs):
+        ids = list(
+            Profile.objects.filter(is_active=True).values_list(
+                "sso_email_id", flat=True
+            )[:10_000]
+        )
+        if not ids:
+            raise CommandError("No active profiles to request")
+
+        url = urlsplit(kwargs["base_url"])
+        path_template = ENDPOINTS[kwargs["endpoint"]]
+        deadline = time.monotonic() + kwargs["duration"]
+        latencies: list[float] = []
+        failures: list[int] = []
+
+        def worker():
+            # one keep-alive connection per worker, as a client pool would
+            connection = http.client.HTTPConnection(url.hostname, url.port, timeout=10)
+            while time.monotonic() < deadline:
+                path = path_template.format(id=quote(random.choice(ids)))
+                start = time.perf_counter()
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status != 200:
+                    failures.append(response.status)
+            connection.close()
+
+        threads = [
+            threading.Thread(target=worker) for _ in range(kwargs["concurrency"])
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        throughput = len(latencies) / elapsed
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(f"requests:          {len(latencies)}")
+        self.stdout.write(f"non-200 responses: {len(failures)}")
+        self.stdout.write(f"throughput:        {throughput:.0f} req/s")
+        self.stdout.write(
+            f"per server core:   {throughput / kwargs['server_cores']:.0f} req/s"
+        )
+        self.stdout.write(f"p50 latency:       {percentiles[49]:.2f} ms")
+        self.stdout.write(f"p99 latency:       {percentiles[98]:.2f} ms")
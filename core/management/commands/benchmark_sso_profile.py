@@ -0,0 +1,57 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core.schemas.profiles import ProfileMinimal
+from profiles.models.combined import Profile, ProfileMinimalDocument
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the latency of serving SSO minimal profiles by ORM + schema "
+        "serialisation against serving the pre-serialised documents. Caches are "
+        "bypassed, so both paths hit the database."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("-n", "--iterations", type=int, default=1000)
+
+    def handle(self, *args, **kwargs):
+        iterations = kwargs["iterations"]
+        sso_email_ids = list(
+            ProfileMinimalDocument.objects.filter(is_active=True).values_list(
+                "profile_id", flat=True
+            )[:1000]
+        )
+        if not sso_email_ids:
+            raise CommandError(
+                "No minimal profile documents found, run rebuild_minimal_profile_documents first"
+            )
+        sample = [random.choice(sso_email_ids) for _ in range(iterations)]
+
+        def orm_and_schema(sso_email_id: str) -> bytes:
+            profile = Profile.objects.get(sso_email_id=sso_email_id, is_active=True)
+            return ProfileMinimal.from_orm(profile).json().encode()
+
+        def document(sso_email_id: str) -> bytes:
+            return bytes(
+                ProfileMinimalDocument.objects.filter(
+                    profile_id=sso_email_id, is_active=True
+                )
+                .values_list("document", flat=True)
+                .get()
+            )
+
+        self.stdout.write(f"{'path':<16}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+        for name, func in (("orm + schema", orm_and_schema), ("document", document)):
+            timings = []
+            for sso_email_id in sample:
+                start = time.perf_counter()
+                func(sso_email_id)
+                timings.append((time.perf_counter() - start) * 1000)
+            percentiles = statistics.quantiles(timings, n=100)
+            self.stdout.write(
+                f"{name:<16}{percentiles[49]:>10.3f}{percentiles[98]:>10.3f}"
+            )
@@ -8,8 +8,16 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("-d", "--dry-run", action="store_true")
+        parser.add_argument(
+            "-b",
+            "--bulk",
+            action="store_true",
+            default=None,
+            help="Upsert each chunk of the export with one INSERT ... ON CONFLICT",
+        )
 
     def handle(self, *args, **kwargs):
         dry_run = kwargs["dry_run"]
 
-        CountriesS3Ingest()
+        if CountriesS3Ingest(bulk=kwargs["bulk"]).unchanged:
+            self.stdout.write("Skipped, as the export is unchanged since last ingested")
@@ -0,0 +1,76 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandParser
+
+
+# Run in a fresh interpreter per measurement, so nothing is already imported
+STARTUP_SCRIPT = """
+import json, resource, sys, time
+
+start = time.perf_counter()
+from config.wsgi import application
+from django.urls import get_resolver
+
+get_resolver().url_patterns  # otherwise loaded on the first request
+print(
+    json.dumps(
+        {
+            "seconds": time.perf_counter() - start,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "modules": len(sys.modules),
+        }
+    )
+)
+"""
+
+WEB_SERVICES = ["MAIN", "PEOPLEFINDER", "SSO_PROFILE", "SSO_SCIM"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the startup time and peak RSS of each web infra-service's WSGI "
+        "application, with and without SLIM_SERVICE. Run it with the production "
+        "settings, as HOST_ALL_APIS loads every router regardless."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("-n", "--repeat", type=int, default=5)
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write(
+            f"{'service':<14}{'mode':<6}{'startup (ms)':>14}"
+            f"{'max RSS (MiB)':>15}{'modules':>9}"
+        )
+        for service in WEB_SERVICES:
+            modes = [False] if service == "MAIN" else [False, True]
+            for slim in modes:
+                runs = [
+                    self.measure(service=service, slim=slim)
+                    for _ in range(kwargs["repeat"])
+                ]
+                self.stdout.write(
+                    f"{service:<14}{'slim' if slim else 'full':<6}"
+                    f"{statistics.median(r['seconds'] for r in runs) * 1000:>14.0f}"
+                    f"{statistics.median(r['max_rss_kb'] for r in runs) / 1024:>15.1f}"
+                    f"{runs[0]['modules']:>9}"
+                )
+
+    def measure(self, service: str, slim: bool) -> dict:
+        env = {
+            **os.environ,
+            "INFRA_SERVICE": service,
+            "SLIM_SERVICE": str(slim),
+            "HOST_ALL_APIS": "False",
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            env=env,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        return json.loads(result.stdout.splitlines()[-1])
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from core import services
+
+
+class Command(BaseCommand):
+    help = "(Re)builds the pre-serialised minimal profile documents served by the SSO profile API."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("-b", "--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **kwargs):
+        count = services.rebuild_identity_minimal_documents(
+            batch_size=kwargs["batch_size"]
+        )
+        self.stdout.write(f"Rebuilt {count} minimal profile documents")
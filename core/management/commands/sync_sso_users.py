@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from core.utils import StaffSSOUserS3Ingest
@@ -10,8 +11,28 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("-d", "--dry-run", action="store_true")
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            default=settings.SSO_SYNC_WORKERS,
+            help="Number of processes to partition the feed across",
+        )
+        parser.add_argument(
+            "-c",
+            "--copy",
+            action="store_true",
+            default=None,
+            help="Copy the feed into a staging table and merge it in SQL",
+        )
 
     def handle(self, *args, **kwargs):
         dry_run = kwargs["dry_run"]
 
-        StaffSSOUserS3Ingest()
+        counts = StaffSSOUserS3Ingest(
+            workers=kwargs["workers"], copy=kwargs["copy"]
+        ).counts
+        self.stdout.write(
+            f"Created {counts.created}, changed {counts.changed}, skipped "
+            f"{counts.skipped} unchanged and deleted {counts.deleted} users"
+        )
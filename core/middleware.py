@@ -1,13 +1,32 @@
-from django.views.decorators.cache import never_cache
+from asgiref.sync import iscoroutinefunction
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from django.utils.decorators import sync_and_async_middleware
 
 
+@sync_and_async_middleware
 def no_cache(get_response):
-    """Applies Django's built-in cache header method to all requests"""
+    """
+    Applies Django's built-in cache header method to all requests. Responses
+    with an ETag may be kept by the client, but must be revalidated on every use.
+    """
 
-    @never_cache
-    def middleware(request):
-        response = get_response(request)
-        response["Pragma"] = "no-cache"  # not handled by the built-in decorator
+    def add_cache_headers(response):
+        if response.has_header("ETag"):
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            add_never_cache_headers(response)
+            response["Pragma"] = "no-cache"  # not handled by the built-in method
         return response
 
+    # async under ASGI, so async views aren't pushed back onto a thread
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            return add_cache_headers(await get_response(request))
+
+    else:
+
+        def middleware(request):
+            return add_cache_headers(get_response(request))
+
     return middleware
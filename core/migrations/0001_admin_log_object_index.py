@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    The admin's history view lists the LogEntry rows of one object, which
+    django_admin_log has no index for. It's built concurrently so the table
+    isn't locked against writes meanwhile; LogEntry belongs to the admin app,
+    so this is SQL rather than AddIndexConcurrently.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("admin", "0003_logentry_add_action_flag_choices"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS "core_admin_log_object_idx" '
+                'ON "django_admin_log" ("content_type_id", "object_id", "action_time")'
+            ),
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "core_admin_log_object_idx"',
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_ingestcheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("importer", models.CharField(max_length=255, unique=True)),
+                ("source_key", models.CharField(max_length=1024)),
+                ("source_etag", models.CharField(max_length=255)),
+                ("source_size", models.PositiveBigIntegerField()),
+                ("ingested", models.DateTimeField()),
+                ("ingests", models.PositiveIntegerField(default=0)),
+                ("skips", models.PositiveIntegerField(default=0)),
+                ("checked", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django import forms
+from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
+from django.db import models
 
 
 class _TypedMultipleChoiceField(forms.TypedMultipleChoiceField):
@@ -34,3 +36,66 @@ class ChoiceArrayField(ArrayField):
         # Skip our parent's formfield implementation completely as we don't care for it.
         # pylint:disable=bad-super-call
         return super().formfield(**defaults)
+
+
+class StaffSSOSyncState(models.Model):
+    """
+    The hash of the Staff SSO record a user was last synced from, and the
+    revision of the combined Profile that sync left, so that the next sync can
+    skip records that haven't changed on either side.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sso_sync_state",
+    )
+    source_hash = models.CharField(max_length=64)
+    profile_revision = models.PositiveBigIntegerField()
+    synced = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Staff SSO sync state: {self.user_id}"
+
+
+class IngestCheckpoint(models.Model):
+    """
+    How far an importer's run has got through an S3 export, moved on in the
+    transaction of each chunk it writes, so that a run that dies can be resumed
+    from its last chunk rather than started again.
+    """
+
+    importer = models.CharField(max_length=255, unique=True)
+    source_key = models.CharField(max_length=1024)
+    source_etag = models.CharField(max_length=255)
+    # lines of the export processed and committed
+    lines = models.PositiveBigIntegerField(default=0)
+    # whether every line of the export has been processed
+    completed = models.BooleanField(default=False)
+    started = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Ingest checkpoint: {self.importer} at line {self.lines}"
+
+
+class IngestRecord(models.Model):
+    """
+    The S3 object an importer last ingested in full, so that a run over an
+    export that hasn't changed since can be skipped, with how many runs have
+    been ingested and skipped.
+    """
+
+    importer = models.CharField(max_length=255, unique=True)
+    source_key = models.CharField(max_length=1024)
+    source_etag = models.CharField(max_length=255)
+    source_size = models.PositiveBigIntegerField()
+    ingested = models.DateTimeField()
+    ingests = models.PositiveIntegerField(default=0)
+    # runs skipped as the export was unchanged
+    skips = models.PositiveIntegerField(default=0)
+    checked = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Ingest record: {self.importer} of {self.source_key}"
@@ -1,4 +1,4 @@
-from ninja import Field, ModelSchema
+from ninja import Field, ModelSchema, Schema
 
 from profiles.models.combined import Profile
 
@@ -15,3 +15,41 @@ class ProfileMinimal(ModelSchema):
             "contact_email",
             "emails",
         ]
+
+
+class BulkProfileMinimalRequest(Schema):
+    ids: list[str]
+
+
+class BulkProfileMinimalResponse(Schema):
+    results: list[ProfileMinimal]
+    inactive: list[str]
+    missing: list[str]
+
+
+class BulkProfileMinimalByEmailRequest(Schema):
+    emails: list[str]
+
+
+class BulkProfileMinimalByEmailResponse(Schema):
+    results: dict[str, ProfileMinimal]
+    missing: list[str]
+
+
+class SharedCacheStats(Schema):
+    hits: int
+    misses: int
+
+
+class LocalCacheStats(Schema):
+    entries: int
+    max_entries: int
+    approximate_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class ProfileMinimalCacheStats(Schema):
+    shared: SharedCacheStats
+    local: LocalCacheStats
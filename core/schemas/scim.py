@@ -4,7 +4,7 @@
 # the order they're in) but not represented in our data models.
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Any, Literal
 
 from ninja import Field, Schema
 
@@ -94,6 +94,7 @@ class ScimErrorSchema(Schema):
             "invalidValue",
             "invalidVers",
             "sensitive",
+            "invalidCursor",
         ]
         | None
     ) = None
@@ -161,5 +162,71 @@ class UpdateUserResponse(MinimalUserResponse):
     name: Name
 
 
+class PatchOperation(Schema):
+    """
+    See https://datatracker.ietf.org/doc/html/rfc7644#section-3.5.2
+    """
+
+    # case-insensitive, as some clients send "Replace"
+    op: str
+    path: str | None = None
+    value: Any = None
+
+
+class PatchUserRequest(Schema):
+    schemas: list[str] = ["urn:ietf:params:scim:api:messages:2.0:PatchOp"]
+    Operations: list[PatchOperation]
+
+
+class PatchUserResponse(MinimalUserResponse):
+    name: Name
+
+
 class GetUserResponse(MinimalUserResponse):
     name: Name
+
+
+class ListUserResponse(Schema):
+    """
+    See https://datatracker.ietf.org/doc/html/rfc7644#section-3.4.2, and
+    https://datatracker.ietf.org/doc/html/rfc9865 for the cursor
+    """
+
+    schemas: list[str] = ["urn:ietf:params:scim:api:messages:2.0:ListResponse"]
+    totalResults: int | None = None
+    startIndex: int | None = None
+    itemsPerPage: int
+    nextCursor: str | None = None
+    Resources: list[GetUserResponse]
+
+
+class BulkOperation(Schema):
+    """
+    See https://datatracker.ietf.org/doc/html/rfc7644#section-3.7
+    """
+
+    method: Literal["POST", "PUT", "DELETE"]
+    bulkId: str | None = None
+    # version
+    path: str
+    data: dict | None = None
+
+
+class BulkRequest(Schema):
+    schemas: list[str] = ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"]
+    failOnErrors: int | None = None
+    Operations: list[BulkOperation]
+
+
+class BulkOperationResult(Schema):
+    method: str
+    bulkId: str | None = None
+    # version
+    location: str | None = None
+    status: str
+    response: ScimErrorSchema | None = None
+
+
+class BulkResponse(Schema):
+    schemas: list[str] = ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"]
+    Operations: list[BulkOperationResult]
@@ -0,0 +1,158 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from pydantic import ValidationError
+
+from core.schemas.scim import BulkOperation, CreateUserRequest, UpdateUserRequest
+from profiles.types import UNSET
+
+
+# /Users for POST, /Users/{id} for PUT and DELETE
+USER_PATH = re.compile(r"/Users(?:/(?P<id>[^/]+))?")
+
+
+class BulkOperationError(Exception):
+    def __init__(self, status: int, detail: str, scim_type: str | None = None):
+        self.status = status
+        self.detail = detail
+        self.scim_type = scim_type
+
+
+@dataclass
+class BulkPlan:
+    """
+    The changes a bulk request makes, in the form
+    core.services.bulk_apply_identity_changes takes them, and the result of
+    each of its operations.
+    """
+
+    creates: list[dict] = field(default_factory=list)
+    updates: list[dict] = field(default_factory=list)
+    deletes: list[str] = field(default_factory=list)
+    results: list[dict] = field(default_factory=list)
+    errors: int = 0
+
+
+def get_user_id(operation: BulkOperation) -> str | None:
+    """
+    The User ID an operation applies to, if it has one
+    """
+    match = USER_PATH.fullmatch(operation.path)
+    if match is None:
+        return None
+    if operation.method == "POST":
+        return (operation.data or {}).get("externalId")
+    return match["id"]
+
+
+def plan_operations(
+    operations: list[BulkOperation],
+    existing_ids: set[str],
+    get_location: Callable[[str], str],
+) -> BulkPlan:
+    """
+    Validate every operation of a bulk request against the IDs of the users
+    that already exist, without applying any of them.
+    """
+    plan = BulkPlan()
+    seen_ids: set[str] = set()
+    for operation in operations:
+        result: dict[str, Any] = {
+            "method": operation.method,
+            "bulkId": operation.bulkId,
+        }
+        try:
+            id = plan_operation(
+                operation=operation,
+                existing_ids=existing_ids,
+                seen_ids=seen_ids,
+                plan=plan,
+            )
+        except BulkOperationError as e:
+            plan.errors += 1
+            result["status"] = str(e.status)
+            result["response"] = {
+                "status": str(e.status),
+                "scimType": e.scim_type,
+                "detail": e.detail,
+            }
+        else:
+            result["status"] = {"POST": "201", "PUT": "200", "DELETE": "204"}[
+                operation.method
+            ]
+            result["location"] = get_location(id)
+        plan.results.append(result)
+    return plan
+
+
+def plan_operation(
+    operation: BulkOperation,
+    existing_ids: set[str],
+    seen_ids: set[str],
+    plan: BulkPlan,
+) -> str:
+    """
+    Add a single operation to the plan, returning the User ID it applies to
+    """
+    match = USER_PATH.fullmatch(operation.path)
+    if match is None or (match["id"] is None) != (operation.method == "POST"):
+        raise BulkOperationError(
+            400, f"Unsupported path: {operation.path}", "invalidPath"
+        )
+
+    if operation.method == "DELETE":
+        id = match["id"]
+        check_id(id=id, exists=True, existing_ids=existing_ids, seen_ids=seen_ids)
+        plan.deletes.append(id)
+        return id
+
+    scim_user: CreateUserRequest | UpdateUserRequest
+    try:
+        if operation.method == "POST":
+            scim_user = CreateUserRequest.model_validate(operation.data or {})
+        else:
+            scim_user = UpdateUserRequest.model_validate(operation.data or {})
+    except ValidationError as e:
+        error = e.errors()[0]
+        raise BulkOperationError(
+            400,
+            f"Invalid User {".".join(map(str, error["loc"]))}: {error["msg"]}",
+            "invalidSyntax",
+        )
+    if not scim_user.emails:
+        raise BulkOperationError(400, "Cannot create user with no email")
+
+    identity = {
+        "first_name": scim_user.name.givenName,
+        "last_name": scim_user.name.familyName,
+        "all_emails": [email.value for email in scim_user.emails],
+        "is_active": scim_user.active,
+    }
+    if operation.method == "POST":
+        id = scim_user.externalId
+        check_id(id=id, exists=False, existing_ids=existing_ids, seen_ids=seen_ids)
+        identity["primary_email"] = scim_user.get_primary_email()
+        identity["contact_email"] = scim_user.get_contact_email()
+        plan.creates.append({"id": id, **identity})
+    else:
+        id = match["id"]
+        check_id(id=id, exists=True, existing_ids=existing_ids, seen_ids=seen_ids)
+        identity["primary_email"] = scim_user.get_primary_email() or UNSET
+        identity["contact_email"] = scim_user.get_contact_email() or UNSET
+        plan.updates.append({"id": id, **identity})
+    return id
+
+
+def check_id(id: str, exists: bool, existing_ids: set[str], seen_ids: set[str]):
+    if id in seen_ids:
+        raise BulkOperationError(
+            400,
+            "Only one operation per user is allowed in a bulk request",
+            "invalidValue",
+        )
+    if exists and id not in existing_ids:
+        raise BulkOperationError(404, "User does not exist")
+    if not exists and id in existing_ids:
+        raise BulkOperationError(409, "User has been previously created", "uniqueness")
+    seen_ids.add(id)
@@ -0,0 +1,101 @@
+import base64
+import binascii
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any
+
+
+class InvalidFilter(Exception):
+    pass
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+# attrPath SP compareOp SP compValue, see https://datatracker.ietf.org/doc/html/rfc7644#section-3.4.2.2
+FILTER_EXPRESSION = re.compile(
+    r"\s*(?P<attribute>[A-Za-z][\w.:]*)\s+(?P<operator>[A-Za-z]{2})\s+"
+    r'(?P<value>"(?:[^"\\]|\\.)*"|true|false)\s*',
+    re.IGNORECASE,
+)
+AND = re.compile(r"and\s+", re.IGNORECASE)
+
+# (attribute, operator) -> the core.services.get_identities filter it's
+# translated to, all of which are backed by an index
+SUPPORTED_FILTERS = {
+    ("username", "eq"): "id",
+    ("externalid", "eq"): "id",
+    ("emails.value", "eq"): "email",
+    ("active", "eq"): "is_active",
+    ("meta.lastmodified", "gt"): "modified_after",
+}
+
+
+def parse_filter(filter: str) -> dict[str, Any]:
+    """
+    Translate a SCIM filter of supported expressions, optionally joined by
+    "and", into keyword arguments for core.services.get_identities.
+    """
+    filters: dict[str, Any] = {}
+    position = 0
+    while True:
+        match = FILTER_EXPRESSION.match(filter, position)
+        if match is None:
+            raise InvalidFilter(f"Unable to parse filter at: {filter[position:]}")
+        key = SUPPORTED_FILTERS.get(
+            (match["attribute"].lower(), match["operator"].lower())
+        )
+        if key is None:
+            raise InvalidFilter(
+                f"Unsupported filter: {match['attribute']} {match['operator']}"
+            )
+        if key in filters:
+            raise InvalidFilter(f"Repeated filter on {match['attribute']}")
+        # values are JSON, bar the case of true and false
+        value = match["value"]
+        if not value.startswith('"'):
+            value = value.lower()
+        filters[key] = parse_value(key=key, value=json.loads(value))
+
+        position = match.end()
+        if position == len(filter):
+            return filters
+        conjunction = AND.match(filter, position)
+        if conjunction is None:
+            raise InvalidFilter(f"Unsupported filter at: {filter[position:]}")
+        position = conjunction.end()
+
+
+def parse_value(key: str, value: str | bool) -> Any:
+    if key == "is_active":
+        if not isinstance(value, bool):
+            raise InvalidFilter("active can only be compared to true or false")
+        return value
+    if not isinstance(value, str):
+        raise InvalidFilter(f"Expected a string value, got {value}")
+    if key == "modified_after":
+        try:
+            modified_after = datetime.fromisoformat(value)
+        except ValueError:
+            raise InvalidFilter(f"Invalid date-time: {value}")
+        if modified_after.tzinfo is None:
+            modified_after = modified_after.replace(tzinfo=timezone.utc)
+        return modified_after
+    return value
+
+
+def encode_cursor(sso_email_id: str) -> str:
+    """
+    An opaque cursor for the page after the given profile, see
+    https://datatracker.ietf.org/doc/html/rfc9865
+    """
+    return base64.urlsafe_b64encode(sso_email_id.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
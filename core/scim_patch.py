@@ -0,0 +1,121 @@
+from typing import Any
+
+from core.schemas.scim import Email, PatchOperation
+from profiles.types import UNSET
+
+
+class InvalidPatch(Exception):
+    def __init__(self, detail: str, scim_type: str):
+        self.detail = detail
+        self.scim_type = scim_type
+
+
+# Lower-cased attribute path -> the core.services.partial_update_identity
+# argument it sets
+PATCH_PATHS = {
+    "active": "is_active",
+    "name.givenname": "first_name",
+    "name.familyname": "last_name",
+    "emails": "all_emails",
+}
+
+
+def parse_patch(operations: list[PatchOperation], emails: list[str]) -> dict[str, Any]:
+    """
+    Translate the operations of a SCIM PATCH into keyword arguments for
+    core.services.partial_update_identity, setting only the attributes they
+    touch. Takes the user's current email addresses, that "add"ed emails are
+    added to.
+    """
+    changes: dict[str, Any] = {}
+    for operation in operations:
+        op = operation.op.lower()
+        if op not in ("add", "replace", "remove"):
+            raise InvalidPatch(
+                f"Unsupported operation: {operation.op}", "invalidSyntax"
+            )
+        for path, value in get_path_values(operation):
+            key = PATCH_PATHS.get(path.lower())
+            if key is None:
+                raise InvalidPatch(f"Unsupported path: {path}", "invalidPath")
+            if op == "remove":
+                raise InvalidPatch(f"{path} cannot be removed", "mutability")
+            if key == "all_emails":
+                changes.update(
+                    parse_emails(value=value, emails=emails, replace=op == "replace")
+                )
+            elif key == "is_active":
+                changes[key] = parse_active(value)
+            elif isinstance(value, str) and value:
+                changes[key] = value
+            else:
+                raise InvalidPatch(f"Invalid value for {path}", "invalidValue")
+    return changes
+
+
+def get_path_values(operation: PatchOperation) -> list[tuple[str, Any]]:
+    """
+    The (path, value) pairs an operation sets; without a path, or with the path
+    of a complex attribute, its value holds them.
+    """
+    if operation.path is not None and operation.path.lower() != "name":
+        return [(operation.path, operation.value)]
+    if not isinstance(operation.value, dict):
+        raise InvalidPatch("Expected the attributes to set", "invalidValue")
+    prefix = "name." if operation.path is not None else ""
+    path_values = []
+    for attribute, value in operation.value.items():
+        if attribute.lower() == "name" and not prefix and isinstance(value, dict):
+            path_values += [(f"name.{k}", v) for k, v in value.items()]
+        else:
+            path_values.append((f"{prefix}{attribute}", value))
+    return path_values
+
+
+def parse_active(value: Any) -> bool:
+    # some clients send booleans as strings
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    if not isinstance(value, bool):
+        raise InvalidPatch("active can only be true or false", "invalidValue")
+    return value
+
+
+def parse_emails(value: Any, emails: list[str], replace: bool) -> dict[str, Any]:
+    """
+    The email arguments for the given SCIM emails, replacing or added to the
+    given addresses. Replacing clears the primary and contact emails unless new
+    ones are given, as PUT does, while adding leaves them as they are.
+    """
+    if isinstance(value, dict):
+        value = [value]
+    try:
+        new_emails = [
+            Email(
+                value=email["value"],
+                type=email.get("type"),
+                primary=bool(email.get("primary", False)),
+            )
+            for email in value
+        ]
+    except (AttributeError, KeyError, TypeError):
+        raise InvalidPatch("Invalid value for emails", "invalidValue")
+    if not all(isinstance(email.value, str) for email in new_emails):
+        raise InvalidPatch("Invalid value for emails", "invalidValue")
+
+    if replace:
+        emails = []
+    all_emails = list(dict.fromkeys([*emails, *(email.value for email in new_emails)]))
+    if not all_emails:
+        raise InvalidPatch("Cannot update user to have no email", "invalidValue")
+    unchanged = UNSET if replace else None
+    return {
+        "all_emails": all_emails,
+        "primary_email": next(
+            (email.value for email in new_emails if email.primary), unchanged
+        ),
+        "contact_email": next(
+            (email.value for email in new_emails if email.type == "contact"),
+            unchanged,
+        ),
+    }
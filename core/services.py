@@ -1,7 +1,10 @@
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 
+from django.db.models import QuerySet
+
+from core import audit, staging
 from profiles import services as profile_services
 from profiles.models import LearningInterest, Workday
 from profiles.models.combined import Profile
@@ -40,6 +43,100 @@ def get_identity_by_id(id: str, include_inactive: bool = False) -> Profile:
     )
 
 
+async def aget_identity_by_id(id: str, include_inactive: bool = False) -> Profile:
+    """
+    Retrieve an profile by its User ID, asynchronously.
+    """
+    return await profile_services.aget_by_id(
+        sso_email_id=id, include_inactive=include_inactive
+    )
+
+
+def get_identities(
+    id: Optional[str] = None,
+    email: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    modified_after: Optional[datetime] = None,
+) -> QuerySet[Profile]:
+    """
+    Retrieve the profiles matching every given filter, for listing.
+    """
+    return profile_services.get_filtered_profiles(
+        sso_email_id=id,
+        email=email,
+        is_active=is_active,
+        modified_after=modified_after,
+    )
+
+
+def get_identities_page(
+    profiles: QuerySet[Profile],
+    count: int,
+    after: Optional[str] = None,
+    offset: int = 0,
+) -> list[Profile]:
+    """
+    Retrieve a page of profiles in User ID order, after the given User ID
+    (keyset pagination) or else from the given offset.
+    """
+    return profile_services.get_profiles_page(
+        profiles=profiles, count=count, after=after, offset=offset
+    )
+
+
+def get_identity_minimal_by_id(id: str) -> bytes:
+    """
+    Retrieve the pre-serialised minimal JSON document of an active profile by
+    its User ID. Served from the cache where possible, for use on the SSO "hot-path".
+    """
+    return profile_services.get_minimal_by_id(sso_email_id=id)
+
+
+async def aget_identity_minimal_by_id(id: str) -> bytes:
+    """
+    Async version of get_identity_minimal_by_id, for the ASGI deployment mode.
+    """
+    return await profile_services.aget_minimal_by_id(sso_email_id=id)
+
+
+def get_identities_minimal_by_ids(ids: list[str]) -> dict[str, list]:
+    """
+    Retrieve the pre-serialised minimal JSON documents of many profiles by their
+    User IDs, reporting those that are inactive or missing separately.
+    """
+    return profile_services.get_minimal_by_ids(sso_email_ids=ids)
+
+
+def get_identity_minimal_by_email(email: str) -> bytes:
+    """
+    Retrieve the pre-serialised minimal JSON document of an active profile by
+    any of its email addresses, case-insensitively.
+    """
+    return profile_services.get_minimal_by_email(email=email)
+
+
+def get_identities_minimal_by_emails(emails: list[str]) -> dict:
+    """
+    Retrieve the pre-serialised minimal JSON documents of many profiles by their
+    email addresses, reporting those that don't match an active profile separately.
+    """
+    return profile_services.get_minimal_by_emails(emails=emails)
+
+
+def rebuild_identity_minimal_documents(batch_size: int = 1000) -> int:
+    """
+    (Re)build the pre-serialised minimal JSON documents of every profile.
+    """
+    return profile_services.rebuild_minimal_documents(batch_size=batch_size)
+
+
+def get_identity_cache_stats() -> dict:
+    """
+    Retrieve the minimal profile cache statistics for this process.
+    """
+    return profile_services.get_minimal_cache_stats()
+
+
 def get_profile_by_slug(
     slug: str, include_inactive: bool = False
 ) -> PeopleFinderProfile:
@@ -49,6 +146,7 @@ def get_profile_by_slug(
     return profile_services.get_by_slug(slug=slug, include_inactive=include_inactive)
 
 
+@audit.atomic()
 def create_peoplefinder_profile(
     slug: str,
     sso_email_id: str,
@@ -130,6 +228,7 @@ def create_peoplefinder_profile(
     )
 
 
+@audit.atomic()
 def update_peoplefinder_profile(
     profile: Profile,
     slug: str,
@@ -213,6 +312,7 @@ def update_peoplefinder_profile(
     )
 
 
+@audit.atomic()
 def create_identity(
     id: str,
     first_name: str,
@@ -242,6 +342,7 @@ def create_identity(
     )
 
 
+@audit.atomic()
 def update_identity(
     profile: Profile,
     first_name: str,
@@ -250,9 +351,10 @@ def update_identity(
     is_active: bool,
     primary_email: str | Unset | None = None,
     contact_email: str | Unset | None = None,
-) -> None:
+) -> int:
     """
     Function for updating an existing user (archive / unarchive) and their profile information.
+    Records that don't change are left unsaved: returns the number of history rows avoided.
     """
 
     user = user_services.get_by_id(
@@ -266,7 +368,43 @@ def update_identity(
             user_services.archive(user)
             profile_services.archive(profile=profile)
 
-    profile_services.update_from_sso(
+    return profile_services.update_from_sso(
+        profile=profile,
+        first_name=first_name,
+        last_name=last_name,
+        all_emails=all_emails,
+        primary_email=primary_email,
+        contact_email=contact_email,
+    )
+
+
+@audit.atomic()
+def partial_update_identity(
+    profile: Profile,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    all_emails: Optional[list[str]] = None,
+    primary_email: str | Unset | None = None,
+    contact_email: str | Unset | None = None,
+    is_active: Optional[bool] = None,
+) -> None:
+    """
+    Like update_identity, but only writes the given fields, e.g. a change of
+    is_active alone only archives / unarchives the user and their profile.
+    """
+    if is_active is not None:
+        user = user_services.get_by_id(
+            sso_email_id=profile.sso_email_id, include_inactive=True
+        )
+        if user.is_active != is_active:
+            if user.is_active == False:
+                user_services.unarchive(user)
+                profile_services.unarchive(profile=profile)
+            else:
+                user_services.archive(user)
+                profile_services.archive(profile=profile)
+
+    profile_services.partial_update_from_sso(
         profile=profile,
         first_name=first_name,
         last_name=last_name,
@@ -276,6 +414,7 @@ def update_identity(
     )
 
 
+@audit.atomic()
 def delete_identity(profile: Profile) -> None:
     """
     Function for deleting an existing user and their profile information.
@@ -290,6 +429,144 @@ def delete_identity(profile: Profile) -> None:
         user_services.delete_from_database(user=user)
 
 
+def get_existing_identity_ids(ids: list[str]) -> set[str]:
+    """
+    Which of the given User IDs belong to an existing user, active or not.
+    """
+    return user_services.get_existing_ids(sso_email_ids=ids)
+
+
+def get_identity_ids_missing_from(ids: Iterable[str]) -> list[str]:
+    """
+    The IDs of the users, active or not, that aren't among the given ones. The
+    given IDs are loaded into a staging table, rather than sent as parameters.
+    """
+    with staging.staging_table(
+        name="staging_identity_ids",
+        columns={"id": "varchar"},
+        rows=((id,) for id in ids),
+        index=["id"],
+    ) as table:
+        return user_services.get_ids_missing_from(table=table, column="id")
+
+
+def get_identity_count() -> int:
+    """
+    The number of users, active or not.
+    """
+    return user_services.get_count()
+
+
+def get_unchanged_identity_ids(source_hashes: dict[str, str]) -> set[str]:
+    """
+    Which of the given users were last synced from a record with the same hash,
+    by User ID, and haven't had their combined Profile written to since.
+    """
+    return profile_services.get_unchanged_sso_ids(source_hashes=source_hashes)
+
+
+def record_identity_source_hashes(source_hashes: dict[str, str]) -> None:
+    """
+    Record the hashes of the records the given users were just synced from,
+    by User ID, along with the revision of their combined Profile.
+    """
+    profile_services.record_sso_source_hashes(source_hashes=source_hashes)
+
+
+def forget_identity_sync_states(ids: list[str]) -> None:
+    """
+    Forget what the given users were last synced from, by User ID, so that the
+    next sync writes them whatever their records hash to. For writes to the
+    users from anywhere but the sync.
+    """
+    profile_services.forget_sso_sync_states(sso_email_ids=ids)
+
+
+def bulk_apply_identity_changes(
+    creates: list[dict], updates: list[dict], deletes: list[str]
+) -> int:
+    """
+    Apply many identity creations, updates and deletions in a single
+    transaction, set-based so that the number of queries doesn't grow with the
+    number of users. Creates and updates hold the create_identity and
+    update_identity arguments of a user, by `id` rather than profile. Each user
+    may appear only once. Returns the number of history rows avoided.
+    """
+    history_rows_avoided = 0
+    with audit.atomic():
+        if creates:
+            bulk_create_identities(identities=creates)
+        if updates:
+            history_rows_avoided = bulk_update_identities(identities=updates)
+        if deletes:
+            bulk_delete_identities(ids=deletes)
+    return history_rows_avoided
+
+
+def bulk_create_identities(identities: list[dict]) -> list[Profile]:
+    """
+    Set-based version of create_identity
+    """
+    user_services.bulk_create(
+        users=[
+            {"sso_email_id": identity["id"], "is_active": identity["is_active"]}
+            for identity in identities
+        ]
+    )
+    return profile_services.bulk_create_from_sso(
+        profiles=[
+            {
+                "sso_email_id": identity["id"],
+                "first_name": identity["first_name"],
+                "last_name": identity["last_name"],
+                "all_emails": identity["all_emails"],
+                "primary_email": identity.get("primary_email"),
+                "contact_email": identity.get("contact_email"),
+                "is_active": identity["is_active"],
+            }
+            for identity in identities
+        ]
+    )
+
+
+def bulk_update_identities(identities: list[dict]) -> int:
+    """
+    Set-based version of update_identity
+    """
+    is_active = {identity["id"]: identity["is_active"] for identity in identities}
+    users = user_services.get_by_ids(sso_email_ids=list(is_active))
+    user_services.bulk_archive(
+        users=[user for user in users if user.is_active and not is_active[user.pk]]
+    )
+    user_services.bulk_unarchive(
+        users=[user for user in users if not user.is_active and is_active[user.pk]]
+    )
+    return profile_services.bulk_update_from_sso(
+        profiles=[
+            {
+                "sso_email_id": identity["id"],
+                "first_name": identity["first_name"],
+                "last_name": identity["last_name"],
+                "all_emails": identity["all_emails"],
+                "primary_email": identity.get("primary_email"),
+                "contact_email": identity.get("contact_email"),
+                "is_active": identity["is_active"],
+            }
+            for identity in identities
+        ]
+    )
+
+
+def bulk_delete_identities(ids: list[str]) -> None:
+    """
+    Set-based version of delete_identity
+    """
+    profile_services.bulk_delete(profile_ids=ids)
+    user_services.bulk_delete_from_database(
+        users=user_services.get_by_ids(sso_email_ids=ids)
+    )
+
+
 def get_peoplefinder_profile_by_slug(slug: str) -> PeopleFinderProfile:
     """
     Retrieve peoplefinder profile by its slug.
@@ -297,6 +574,22 @@ def get_peoplefinder_profile_by_slug(slug: str) -> PeopleFinderProfile:
     return profile_services.get_peoplefinder_profile_by_slug(slug=slug)
 
 
+def get_peoplefinder_profile_version(slug: str) -> str:
+    """
+    Retrieve the version token of a peoplefinder profile by its slug, changed
+    by every write to it.
+    """
+    return profile_services.get_peoplefinder_profile_version(slug=slug)
+
+
+def get_peoplefinder_team_version(slug: str) -> str:
+    """
+    Retrieve the version token of a People Finder Team by its slug, changed by
+    every write to it or its parents.
+    """
+    return profile_services.get_peoplefinder_team_version(slug=slug)
+
+
 def get_peoplefinder_team_by_slug(slug: str) -> PeopleFinderTeam:
     """
     Retrieve a People Finder Team by its slug.
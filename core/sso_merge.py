@@ -0,0 +1,457 @@
+"""
+Set-based merge of the Staff SSO user feed, for the ingest's copy mode. The
+feed is copied as it is into a staging table, and the users, their Staff SSO
+profiles and emails and their combined profiles are merged from it with
+INSERT ... ON CONFLICT, UPDATE ... FROM and DELETE ... USING statements.
+
+Each statement writes the history rows of what it changed, as
+django-simple-history would, and returns those rows; the audit log entries
+and minimal documents are written from them, as the ORM path would.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import batched
+from typing import Iterable
+
+from django.contrib.admin.models import ADDITION, CHANGE
+from django.db import connection, models
+from django.utils import timezone
+
+from core import audit, staging
+from profiles import services as profile_services
+from profiles.models.combined import Profile
+from profiles.models.generic import Email
+from profiles.models.staff_sso import StaffSSOProfile, StaffSSOProfileEmail
+from user import services as user_services
+from user.models import User
+
+
+# Fields of the combined profile synced from the feed, in the order the ORM
+# path lists them in its change message
+PROFILE_FIELDS = [
+    "first_name",
+    "last_name",
+    "primary_email",
+    "contact_email",
+    "emails",
+    "is_active",
+]
+
+# The users of the feed, the last listed of each ID, with their emails in the
+# order create_identity takes them
+USERS_QUERY = """
+SELECT DISTINCT ON (id)
+    id,
+    first_name,
+    last_name,
+    is_active,
+    primary_email,
+    contact_email,
+    ARRAY(
+        SELECT address
+        FROM unnest(all_emails) WITH ORDINALITY AS email(address, position)
+        GROUP BY address
+        ORDER BY min(position)
+    ) AS emails
+FROM (
+    SELECT
+        n,
+        line->'object'->>'dit:StaffSSO:User:emailUserId' AS id,
+        line->'object'->>'dit:firstName' AS first_name,
+        line->'object'->>'dit:lastName' AS last_name,
+        line->'object'->>'dit:StaffSSO:User:status' = 'active' AS is_active,
+        line->'object'->'dit:emailAddress'->>0 AS primary_email,
+        line->'object'->>'dit:StaffSSO:User:contactEmailAddress' AS contact_email,
+        ARRAY(
+            SELECT jsonb_array_elements_text(line->'object'->'dit:emailAddress')
+        ) || (line->'object'->>'dit:StaffSSO:User:contactEmailAddress') AS all_emails
+    FROM {feed}
+) AS feed
+ORDER BY id, n DESC
+"""
+
+
+@dataclass
+class MergeResult:
+    """
+    The IDs of the users of the feed, by what the merge did with them, and of
+    the users missing from it
+    """
+
+    created: set[str] = field(default_factory=set)
+    changed: set[str] = field(default_factory=set)
+    skipped: set[str] = field(default_factory=set)
+    missing: list[str] = field(default_factory=list)
+
+
+def table(model: type[models.Model]) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def history_insert(model: type[models.Model], source: str, history_type: str) -> str:
+    """
+    SQL writing the history rows of the model for the rows of the source,
+    with the given history_type expression
+    """
+    history_model = model.history.model  # type: ignore
+    columns = ", ".join(
+        connection.ops.quote_name(history_field.column)
+        for history_field in history_model._meta.concrete_fields
+        if not history_field.name.startswith("history_")
+    )
+    return (
+        f"INSERT INTO {table(history_model)} ({columns}, history_date, "
+        "history_type, history_change_reason, history_user_id) "
+        f"SELECT {columns}, %(now)s, {history_type}, NULL, NULL FROM {source}"
+    )
+
+
+def fetch(sql: str, params: dict) -> list[tuple]:
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def merge_feed(lines: Iterable[str]) -> MergeResult:
+    """
+    Create, update, archive or unarchive the users of the feed and their
+    profiles, in one transaction. The users missing from the feed are found,
+    but left for the caller to delete.
+    """
+    with audit.atomic():
+        with staging.staging_table(
+            name="staging_sso_feed",
+            columns={"n": "bigint", "line": "jsonb"},
+            rows=((n, line.rstrip("\n")) for n, line in enumerate(lines)),
+        ) as feed:
+            with staging.derived_table(
+                name="staging_sso_users",
+                query=USERS_QUERY.format(feed=feed),
+                index=["id"],
+            ) as users:
+                return merge_users(users=users, now=timezone.now())
+
+
+def merge_users(users: str, now: datetime) -> MergeResult:
+    params = {"now": now}
+    user_rows = fetch(
+        f"""
+        INSERT INTO {table(User)} (sso_email_id, password, is_superuser, is_staff, is_active)
+        SELECT id, '', false, false, is_active FROM {users}
+        ON CONFLICT (sso_email_id) DO UPDATE SET is_active = EXCLUDED.is_active
+        WHERE {table(User)}.is_active IS DISTINCT FROM EXCLUDED.is_active
+        RETURNING sso_email_id, is_active, (xmax = 0) AS inserted
+        """,
+        params,
+    )
+    created = {id for id, _, inserted in user_rows if inserted}
+    archived = {
+        id for id, is_active, inserted in user_rows if not inserted and not is_active
+    }
+    unarchived = {
+        id for id, is_active, inserted in user_rows if not inserted and is_active
+    }
+    log(User, created, ADDITION, "Creating new User record")
+    log(User, archived, CHANGE, "Archiving User record")
+    log(User, unarchived, CHANGE, "Unarchiving User record")
+
+    fetch(
+        f"""
+        WITH created AS (
+            INSERT INTO {table(Email)} (address)
+            SELECT DISTINCT address FROM {users}, unnest(emails) AS address
+            ON CONFLICT (address) DO NOTHING
+            RETURNING *
+        ), history AS ({history_insert(Email, "created", "'+'")})
+        SELECT count(*) FROM created
+        """,
+        params,
+    )
+
+    sso_rows = fetch(
+        f"""
+        WITH previous AS (
+            SELECT user_id, first_name, last_name FROM {table(StaffSSOProfile)}
+            WHERE user_id IN (SELECT id FROM {users})
+        ), merged AS (
+            INSERT INTO {table(StaffSSOProfile)} (user_id, first_name, last_name)
+            SELECT id, first_name, last_name FROM {users}
+            ON CONFLICT (user_id) DO UPDATE
+            SET first_name = EXCLUDED.first_name, last_name = EXCLUDED.last_name
+            WHERE ({table(StaffSSOProfile)}.first_name, {table(StaffSSOProfile)}.last_name)
+                IS DISTINCT FROM (EXCLUDED.first_name, EXCLUDED.last_name)
+            RETURNING {table(StaffSSOProfile)}.*, (xmax = 0) AS inserted
+        ), history AS (
+            {history_insert(StaffSSOProfile, "merged", "CASE WHEN inserted THEN '+' ELSE '~' END")}
+        )
+        SELECT
+            user_id,
+            inserted,
+            {changed_fields(["first_name", "last_name"], "merged", "previous")}
+        FROM merged LEFT JOIN previous USING (user_id)
+        """,
+        params,
+    )
+    sso_created = {id for id, inserted, _ in sso_rows if inserted}
+    sso_changes = {id: fields for id, inserted, fields in sso_rows if not inserted}
+    for id in merge_emails(users=users, params=params) - sso_created:
+        sso_changes.setdefault(id, []).append("emails")
+    sso_changed = set(sso_changes)
+    log_profiles(
+        StaffSSOProfile,
+        "user_id",
+        sso_created,
+        ADDITION,
+        "Creating new StaffSSOProfile",
+    )
+    log_changes(StaffSSOProfile, "user_id", sso_changes)
+
+    profile_rows = merge_profiles(users=users, params=params)
+    profiles_created = {id for id, inserted, _ in profile_rows if inserted}
+    profile_changes = {
+        id: fields for id, inserted, fields in profile_rows if not inserted
+    }
+    profiles_changed = set(profile_changes)
+    log_profiles(Profile, "pk", profiles_created, ADDITION, "Creating new Profile")
+    log_profiles(
+        Profile, "pk", profiles_changed & archived, CHANGE, "Archiving Profile record"
+    )
+    log_profiles(
+        Profile,
+        "pk",
+        profiles_changed & unarchived,
+        CHANGE,
+        "Unarchiving Profile record",
+    )
+    # is_active changes are logged as archiving or unarchiving
+    log_changes(
+        Profile,
+        "pk",
+        {
+            id: [field for field in fields if field != "is_active"]
+            for id, fields in profile_changes.items()
+        },
+    )
+    profile_services.refresh_minimal_documents(
+        sso_email_ids=sorted(profiles_created | profiles_changed)
+    )
+
+    staged = {id for (id,) in fetch(f"SELECT id FROM {users}", params)}
+    changed = (archived | unarchived | sso_changed | profiles_changed) - created
+    return MergeResult(
+        created=created,
+        changed=changed,
+        skipped=staged - created - changed,
+        missing=user_services.get_ids_missing_from(table=users, column="id"),
+    )
+
+
+def merge_emails(users: str, params: dict) -> set[str]:
+    """
+    Bring the Staff SSO profiles' links to their emails in line with the feed,
+    as reconcile_emails would. Returns the IDs of the users whose links changed.
+    """
+    link = table(StaffSSOProfileEmail)
+    with staging.derived_table(
+        name="staging_sso_emails",
+        query=f"""
+            SELECT
+                profile.id AS profile_id,
+                profile.user_id,
+                email.id AS email_id,
+                address.position,
+                address.address = users.primary_email AS is_primary,
+                address.address = users.contact_email AS is_contact
+            FROM {users} AS users
+            JOIN {table(StaffSSOProfile)} AS profile ON profile.user_id = users.id
+            CROSS JOIN LATERAL unnest(users.emails)
+                WITH ORDINALITY AS address(address, position)
+            JOIN {table(Email)} AS email ON email.address = address.address
+        """,
+        index=["profile_id", "email_id"],
+    ) as links:
+        removed = fetch(
+            f"""
+            WITH removed AS (
+                DELETE FROM {link} AS link
+                USING {users} AS users
+                JOIN {table(StaffSSOProfile)} AS profile ON profile.user_id = users.id
+                WHERE link.profile_id = profile.id AND NOT EXISTS (
+                    SELECT 1 FROM {links} AS staged
+                    WHERE staged.profile_id = link.profile_id
+                    AND staged.email_id = link.email_id
+                )
+                RETURNING link.*
+            ), history AS ({history_insert(StaffSSOProfileEmail, "removed", "'-'")})
+            SELECT DISTINCT profile.user_id FROM removed
+            JOIN {table(StaffSSOProfile)} AS profile ON profile.id = removed.profile_id
+            """,
+            params,
+        )
+        updated = fetch(
+            f"""
+            WITH updated AS (
+                UPDATE {link} AS link
+                SET is_primary = staged.is_primary, is_contact = staged.is_contact
+                FROM {links} AS staged
+                WHERE link.profile_id = staged.profile_id
+                AND link.email_id = staged.email_id
+                AND (link.is_primary, link.is_contact)
+                    IS DISTINCT FROM (staged.is_primary, staged.is_contact)
+                RETURNING link.*
+            ), history AS ({history_insert(StaffSSOProfileEmail, "updated", "'~'")})
+            SELECT DISTINCT profile.user_id FROM updated
+            JOIN {table(StaffSSOProfile)} AS profile ON profile.id = updated.profile_id
+            """,
+            params,
+        )
+        created = fetch(
+            f"""
+            WITH created AS (
+                INSERT INTO {link} (profile_id, email_id, is_primary, is_contact)
+                SELECT profile_id, email_id, is_primary, is_contact
+                FROM {links} AS staged
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {link} AS link
+                    WHERE link.profile_id = staged.profile_id
+                    AND link.email_id = staged.email_id
+                )
+                ORDER BY profile_id, position
+                ON CONFLICT (profile_id, email_id) DO NOTHING
+                RETURNING *
+            ), history AS ({history_insert(StaffSSOProfileEmail, "created", "'+'")})
+            SELECT DISTINCT profile.user_id FROM created
+            JOIN {table(StaffSSOProfile)} AS profile ON profile.id = created.profile_id
+            """,
+            params,
+        )
+    return {id for (id,) in [*removed, *updated, *created]}
+
+
+def merge_profiles(users: str, params: dict) -> list[tuple[str, bool, list[str]]]:
+    """
+    Create or update the combined profiles from the Staff SSO profiles just
+    merged, as generate_combined_profiles_data derives them. Returns the ID of
+    each profile written, whether it was created and the fields that changed.
+    """
+    profile = table(Profile)
+    columns = ", ".join(PROFILE_FIELDS)
+    return fetch(
+        f"""
+        WITH derived AS (
+            SELECT
+                users.id,
+                users.first_name,
+                users.last_name,
+                coalesce(links.primary_email, links.emails[1]) AS primary_email,
+                coalesce(
+                    links.contact_email, links.primary_email, links.emails[1]
+                ) AS contact_email,
+                coalesce(links.emails, '{{}}') AS emails,
+                users.is_active
+            FROM {users} AS users
+            JOIN {table(StaffSSOProfile)} AS sso ON sso.user_id = users.id
+            LEFT JOIN LATERAL (
+                SELECT
+                    array_agg(email.address ORDER BY link.id) AS emails,
+                    (array_agg(email.address ORDER BY link.id)
+                        FILTER (WHERE link.is_primary))[1] AS primary_email,
+                    (array_agg(email.address ORDER BY link.id)
+                        FILTER (WHERE link.is_contact))[1] AS contact_email
+                FROM {table(StaffSSOProfileEmail)} AS link
+                JOIN {table(Email)} AS email ON email.id = link.email_id
+                WHERE link.profile_id = sso.id
+            ) AS links ON true
+        ), previous AS (
+            SELECT sso_email_id, {columns} FROM {profile}
+            WHERE sso_email_id IN (SELECT id FROM derived)
+        ), merged AS (
+            INSERT INTO {profile} (sso_email_id, {columns}, revision, modified)
+            SELECT id, {columns}, 1, %(now)s FROM derived
+            ON CONFLICT (sso_email_id) DO UPDATE SET
+                {", ".join(f"{name} = EXCLUDED.{name}" for name in PROFILE_FIELDS)},
+                revision = {profile}.revision + 1,
+                modified = EXCLUDED.modified
+            WHERE ({", ".join(f"{profile}.{name}" for name in PROFILE_FIELDS)})
+                IS DISTINCT FROM
+                ({", ".join(f"EXCLUDED.{name}" for name in PROFILE_FIELDS)})
+            RETURNING {profile}.*, (xmax = 0) AS inserted
+        ), history AS (
+            {history_insert(Profile, "merged", "CASE WHEN inserted THEN '+' ELSE '~' END")}
+        )
+        SELECT
+            sso_email_id,
+            inserted,
+            {changed_fields(PROFILE_FIELDS, "merged", "previous")}
+        FROM merged LEFT JOIN previous USING (sso_email_id)
+        """,
+        params,
+    )
+
+
+def changed_fields(fields: list[str], new: str, old: str) -> str:
+    """
+    SQL for the array of the names of the fields whose values differ between
+    the rows new and old, in the order given
+    """
+    names = ", ".join(
+        f"CASE WHEN {new}.{name} IS DISTINCT FROM {old}.{name} THEN '{name}' END"
+        for name in fields
+    )
+    return f"array_remove(ARRAY[{names}]::text[], NULL)"
+
+
+def log(
+    model: type[models.Model], ids: set[str], action_flag: int, change_message: str
+) -> None:
+    audit.log_actions(
+        user_id="via-api",
+        objs=[model(pk=id) for id in sorted(ids)],
+        action_flag=action_flag,
+        change_message=change_message,
+    )
+
+
+def log_changes(
+    model: type[models.Model], user_field: str, changes: dict[str, list[str]]
+) -> None:
+    """
+    Log the updates of the profiles of the given users, naming the fields that
+    changed on each as the ORM path does. Users with no fields listed aren't
+    logged.
+    """
+    ids: dict[tuple[str, ...], set[str]] = {}
+    for id, fields in changes.items():
+        if fields:
+            ids.setdefault(tuple(fields), set()).add(id)
+    for names, changed in ids.items():
+        log_profiles(
+            model,
+            user_field,
+            changed,
+            CHANGE,
+            f"Updating {model.__name__} record: {", ".join(names)}",
+        )
+
+
+def log_profiles(
+    model: type[models.Model],
+    user_field: str,
+    ids: set[str],
+    action_flag: int,
+    change_message: str,
+) -> None:
+    """
+    Log an action on the profiles of the given users, read back a batch at a
+    time for their pks and names
+    """
+    for batch in batched(sorted(ids), 1000):
+        audit.log_actions(
+            user_id="via-api",
+            objs=model.objects.filter(**{f"{user_field}__in": batch}).order_by(
+                user_field
+            ),
+            action_flag=action_flag,
+            change_message=change_message,
+        )
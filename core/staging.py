@@ -0,0 +1,86 @@
+"""
+Staging tables for the ingests: rows are loaded with COPY into a temporary
+table, to be joined against in SQL rather than sent as long parameter lists.
+"""
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Sequence
+
+from django.db import connection
+
+
+@contextmanager
+def staging_table(
+    name: str,
+    columns: dict[str, str],
+    rows: Iterable[Sequence],
+    index: Sequence[str] = (),
+) -> Iterator[str]:
+    """
+    Load the rows into a temporary table with the given columns (name to SQL
+    type), indexed on the given columns once loaded, and dropped at the end of
+    the block. Yields the quoted table name.
+    """
+    qn = connection.ops.quote_name
+    definition = ", ".join(f"{qn(column)} {type}" for column, type in columns.items())
+    with temporary_table(name=name, definition=f"({definition})") as table:
+        with connection.cursor() as cursor:
+            copy_rows(cursor=cursor, table=table, columns=list(columns), rows=rows)
+            analyse(cursor=cursor, table=table, index=index)
+        yield table
+
+
+@contextmanager
+def derived_table(
+    name: str,
+    query: str,
+    params: Optional[dict] = None,
+    index: Sequence[str] = (),
+) -> Iterator[str]:
+    """
+    Stage the results of a query in a temporary table, indexed on the given
+    columns and dropped at the end of the block. Yields the quoted table name.
+    """
+    with temporary_table(name=name, definition=f"AS {query}", params=params) as table:
+        with connection.cursor() as cursor:
+            analyse(cursor=cursor, table=table, index=index)
+        yield table
+
+
+@contextmanager
+def temporary_table(
+    name: str, definition: str, params: Optional[dict] = None
+) -> Iterator[str]:
+    table = connection.ops.quote_name(name)
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TEMPORARY TABLE {table} {definition}", params)
+    try:
+        yield table
+    except BaseException:
+        # a table created in a transaction that's failed goes with its rollback
+        if not connection.in_atomic_block:
+            drop(table=table)
+        raise
+    drop(table=table)
+
+
+def drop(table: str) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def copy_rows(cursor, table: str, columns: list[str], rows: Iterable[Sequence]) -> None:
+    qn = connection.ops.quote_name
+    with cursor.copy(
+        f"COPY {table} ({', '.join(qn(column) for column in columns)}) FROM STDIN"
+    ) as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+def analyse(cursor, table: str, index: Sequence[str] = ()) -> None:
+    qn = connection.ops.quote_name
+    if index:
+        cursor.execute(f"CREATE INDEX ON {table} ({', '.join(qn(c) for c in index)})")
+    # temporary tables are never analysed by autovacuum
+    cursor.execute(f"ANALYZE {table}")
@@ -1,17 +1,41 @@
 from config.celery import celery_app
-from core.utils import CountriesS3Ingest, SectorListS3Ingest, UkStaffLocationsS3Ingest
+
+
+# The ingests (boto3, smart_open) are imported by the tasks themselves, so that
+# discovering the tasks doesn't load them. The ingest tasks return whether they
+# were skipped as their export was unchanged, with their importer's run counts.
 
 
 @celery_app.task()
 def ingest_countries():
-    CountriesS3Ingest()
+    from core.utils import CountriesS3Ingest
+
+    return CountriesS3Ingest().get_stats()
 
 
 @celery_app.task()
 def ingest_uk_staff_locations():
-    UkStaffLocationsS3Ingest()
+    from core.utils import UkStaffLocationsS3Ingest
+
+    return UkStaffLocationsS3Ingest().get_stats()
 
 
 @celery_app.task()
 def ingest_sector_list():
-    SectorListS3Ingest()
+    from core.utils import SectorListS3Ingest
+
+    return SectorListS3Ingest().get_stats()
+
+
+@celery_app.task()
+def apply_history_retention():
+    from core.history import apply_retention
+
+    apply_retention()
+
+
+@celery_app.task()
+def write_audit_entries(entries: list[dict]):
+    from core.audit import write
+
+    write(entries=entries)
@@ -1,5 +1,6 @@
 import json
 import logging
+from functools import cache
 
 from django import template
 from django.conf import settings
@@ -12,7 +13,10 @@ logger = logging.getLogger(__name__)
 register = template.Library()
 
 
+@cache
 def load_manifest() -> dict:
+    # read on first use rather than on import, as every process loads the
+    # template tag libraries but only the frontend renders these tags
     with settings.VITE_MANIFEST_PATH.open() as f:
         manifest = json.load(f)
 
@@ -21,16 +25,13 @@ def load_manifest() -> dict:
     return manifest
 
 
-manifest = load_manifest()
-
-
 @register.simple_tag(takes_context=True)
 def vite_css(context, filename: str) -> str:
     if settings.VITE_DEV:
         return ""
 
     return mark_safe(
-        f'<link rel="stylesheet" href="{static(manifest[filename]["file"])}">'
+        f'<link rel="stylesheet" href="{static(load_manifest()[filename]["file"])}">'
     )
 
 
@@ -40,7 +41,7 @@ def vite_js(context, filename: str) -> str:
         return ""
 
     return mark_safe(
-        f'<script type="module" src="{static(manifest[filename]["file"])}"></script>'
+        f'<script type="module" src="{static(load_manifest()[filename]["file"])}"></script>'
     )
 
 
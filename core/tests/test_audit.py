@@ -0,0 +1,144 @@
+import pytest
+from django.contrib.admin.models import ADDITION, CHANGE, LogEntry
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core import audit, services
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_log_action_outside_atomic_writes_straight_away(basic_user):
+    audit.log_action(
+        user_id="via-api", obj=basic_user, action_flag=CHANGE, change_message="1"
+    )
+
+    log = LogEntry.objects.get()
+    assert log.is_change()
+    assert log.user.pk == "via-api"
+    assert log.object_id == basic_user.pk
+    assert log.object_repr == str(basic_user)
+    assert log.get_change_message() == "1"
+
+
+def test_atomic_writes_entries_together_in_order(basic_user):
+    with CaptureQueriesContext(connection) as queries:
+        with audit.atomic():
+            for message in ("1", "2", "3"):
+                audit.log_action(
+                    user_id="via-api",
+                    obj=basic_user,
+                    action_flag=CHANGE,
+                    change_message=message,
+                )
+            assert LogEntry.objects.count() == 0
+
+    inserts = [
+        query
+        for query in queries.captured_queries
+        if query["sql"].startswith('INSERT INTO "django_admin_log"')
+    ]
+    assert len(inserts) == 1
+    assert [log.change_message for log in LogEntry.objects.order_by("pk")] == [
+        "1",
+        "2",
+        "3",
+    ]
+
+
+def test_atomic_drops_entries_of_blocks_that_raise(basic_user):
+    with audit.atomic():
+        audit.log_action(
+            user_id="via-api", obj=basic_user, action_flag=CHANGE, change_message="1"
+        )
+        with pytest.raises(ValueError):
+            with audit.atomic():
+                audit.log_action(
+                    user_id="via-api",
+                    obj=basic_user,
+                    action_flag=CHANGE,
+                    change_message="2",
+                )
+                raise ValueError
+        audit.log_action(
+            user_id="via-api", obj=basic_user, action_flag=CHANGE, change_message="3"
+        )
+
+    assert [log.change_message for log in LogEntry.objects.order_by("pk")] == [
+        "1",
+        "3",
+    ]
+
+    with pytest.raises(ValueError):
+        with audit.atomic():
+            audit.log_action(
+                user_id="via-api",
+                obj=basic_user,
+                action_flag=CHANGE,
+                change_message="4",
+            )
+            raise ValueError
+    assert LogEntry.objects.count() == 2
+
+
+def test_atomic_queues_entries_on_commit(
+    basic_user, settings, mocker, django_capture_on_commit_callbacks
+):
+    settings.AUDIT_LOG_CELERY = True
+    delay = mocker.patch("core.tasks.write_audit_entries.delay")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with audit.atomic():
+            audit.log_actions(
+                user_id="via-api",
+                objs=[basic_user, basic_user],
+                action_flag=ADDITION,
+                change_message="Creating",
+            )
+            delay.assert_not_called()
+
+    assert LogEntry.objects.count() == 0
+    (entries,) = delay.call_args.args
+    assert len(entries) == 2
+    assert entries[0]["object_id"] == basic_user.pk
+
+    audit.write(entries=entries)
+    assert LogEntry.objects.filter(action_flag=ADDITION).count() == 2
+
+
+def test_atomic_writes_entries_that_cannot_be_queued(
+    basic_user, settings, mocker, django_capture_on_commit_callbacks
+):
+    settings.AUDIT_LOG_CELERY = True
+    mocker.patch("core.tasks.write_audit_entries.delay", side_effect=ConnectionError)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with audit.atomic():
+            audit.log_action(
+                user_id="via-api",
+                obj=basic_user,
+                action_flag=CHANGE,
+                change_message="1",
+            )
+
+    assert LogEntry.objects.count() == 1
+
+
+def test_create_identity_writes_one_audit_insert():
+    with CaptureQueriesContext(connection) as queries:
+        services.create_identity(
+            id="new_user@email.com",
+            first_name="New",
+            last_name="User",
+            all_emails=["new_user@email.com"],
+            is_active=True,
+        )
+
+    inserts = [
+        query
+        for query in queries.captured_queries
+        if query["sql"].startswith('INSERT INTO "django_admin_log"')
+    ]
+    assert len(inserts) == 1
+    assert LogEntry.objects.count() == 3
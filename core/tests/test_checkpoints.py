@@ -0,0 +1,82 @@
+import pytest
+
+from core import checkpoints
+from core.models import IngestCheckpoint, IngestRecord
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_start_resumes_the_same_object(mocker):
+    source = mocker.Mock(key="users/export.jsonl", e_tag='"abc"')
+    checkpoint = checkpoints.start(importer="importer", source=source)
+    checkpoints.advance(checkpoint=checkpoint, lines=2)
+
+    resumed = checkpoints.start(importer="importer", source=source)
+
+    assert resumed.pk == checkpoint.pk
+    assert resumed.lines == 2
+
+
+def test_start_restarts_for_another_object(mocker):
+    checkpoint = checkpoints.start(
+        importer="importer", source=mocker.Mock(key="users/old.jsonl", e_tag='"abc"')
+    )
+    checkpoints.advance(checkpoint=checkpoint, lines=2)
+    checkpoints.complete(checkpoint=checkpoint)
+
+    restarted = checkpoints.start(
+        importer="importer", source=mocker.Mock(key="users/new.jsonl", e_tag='"def"')
+    )
+
+    assert restarted.pk == checkpoint.pk
+    assert restarted.source_key == "users/new.jsonl"
+    assert restarted.lines == 0
+    assert not restarted.completed
+
+
+def test_finish(mocker):
+    checkpoint = checkpoints.start(
+        importer="importer", source=mocker.Mock(key="users/export.jsonl", e_tag='"a"')
+    )
+    checkpoints.advance(checkpoint=checkpoint, lines=1)
+
+    checkpoints.finish(checkpoint=checkpoint)
+
+    assert not IngestCheckpoint.objects.exists()
+
+
+def test_is_unchanged(mocker):
+    source = mocker.Mock(key="countries/export.jsonl", e_tag='"abc"', size=100)
+    assert not checkpoints.is_unchanged(importer="importer", source=source)
+
+    checkpoints.record_ingest(importer="importer", source=source)
+
+    assert checkpoints.is_unchanged(importer="importer", source=source)
+    assert not checkpoints.is_unchanged(
+        importer="importer",
+        source=mocker.Mock(key="countries/export.jsonl", e_tag='"def"', size=100),
+    )
+    assert not checkpoints.is_unchanged(importer="other", source=source)
+    stats = checkpoints.get_ingest_stats(importer="importer")
+    assert stats["ingests"] == 1
+    assert stats["skips"] == 1
+
+
+def test_record_ingest_counts_ingests(mocker):
+    checkpoints.record_ingest(
+        importer="importer",
+        source=mocker.Mock(key="countries/old.jsonl", e_tag='"abc"', size=100),
+    )
+    checkpoints.record_ingest(
+        importer="importer",
+        source=mocker.Mock(key="countries/new.jsonl", e_tag='"def"', size=200),
+    )
+
+    record = IngestRecord.objects.get(importer="importer")
+    assert record.ingests == 2
+    assert (record.source_key, record.source_etag, record.source_size) == (
+        "countries/new.jsonl",
+        '"def"',
+        200,
+    )
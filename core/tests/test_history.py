@@ -0,0 +1,103 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import audit, history
+from profiles.models.combined import Profile
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_history_models():
+    assert Profile.history.model in history.get_history_models()
+
+
+def test_prune_history(combined_profile):
+    combined_profile.first_name = "Jane"
+    combined_profile.save()
+    old = combined_profile.history.earliest("history_date")
+    combined_profile.history.filter(pk=old.pk).update(
+        history_date=timezone.now() - timedelta(days=31)
+    )
+
+    deleted = history.prune_history(days=30, batch_size=1)
+
+    assert deleted[Profile.history.model._meta.label] == 1
+    assert list(combined_profile.history.values_list("first_name", flat=True)) == [
+        "Jane"
+    ]
+
+
+def test_prune_history_keeps_the_latest_row(combined_profile):
+    combined_profile.first_name = "Jane"
+    combined_profile.save()
+    combined_profile.history.update(history_date=timezone.now() - timedelta(days=31))
+
+    deleted = history.prune_history(days=30, batch_size=1)
+
+    assert deleted[Profile.history.model._meta.label] == 1
+    assert list(combined_profile.history.values_list("first_name", flat=True)) == [
+        "Jane"
+    ]
+
+
+def test_prune_audit_log(basic_user):
+    for _ in range(3):
+        audit.log_action(
+            user_id="via-api", obj=basic_user, action_flag=CHANGE, change_message=""
+        )
+    LogEntry.objects.filter(
+        pk__in=LogEntry.objects.order_by("pk").values("pk")[:2]
+    ).update(action_time=timezone.now() - timedelta(days=31))
+
+    assert history.prune_audit_log(days=30, batch_size=1) == 2
+    assert LogEntry.objects.count() == 1
+
+
+def test_compact_history_collapses_no_op_rows(combined_profile):
+    for _ in range(3):
+        combined_profile.save()
+    combined_profile.first_name = "Jane"
+    combined_profile.save()
+    combined_profile.save()
+    assert combined_profile.history.count() == 6
+
+    history.compact_history(minutes=60)
+
+    assert list(
+        combined_profile.history.order_by("history_date").values_list(
+            "first_name", flat=True
+        )
+    ) == ["John", "Jane"]
+
+
+def test_compaction_benchmark(combined_profile):
+    """
+    Rows read, and time taken, by a history view of a profile rewritten by
+    repeated syncs, before and after compaction
+    """
+
+    def read_history() -> tuple[int, float]:
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            rows = len(list(combined_profile.history.all()))
+            ms = (time.perf_counter() - start) * 1000
+        assert len(queries) == 1
+        return rows, ms
+
+    for _ in range(200):
+        combined_profile.save()
+
+    rows_before, ms_before = read_history()
+    history.compact_history(minutes=60)
+    rows_after, ms_after = read_history()
+
+    assert rows_before == 201
+    assert rows_after == 1
+    assert ms_after <= ms_before
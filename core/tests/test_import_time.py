@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+pytestmark = pytest.mark.django_db
+
+# Modules that API processes should never load on startup
+HEAVY_MODULES = ["boto3", "botocore", "data_flow_s3_import.ingest", "smart_open", "PIL"]
+
+# Cumulative import time, after django.setup(), of the modules on each API's
+# startup path. Wall-clock timings vary between machines and under load, so
+# these only run with the e2e tests: test_api_services_do_not_load_heavy_modules
+# is what guards the startup path in CI.
+IMPORT_BUDGETS_MS = {
+    "core.api.sso_profile": 300,
+    "core.api.scim": 300,
+    "core.api.peoplefinder.profile": 400,
+    "core.api.peoplefinder.team": 400,
+    "config.urls": 600,
+}
+
+
+def run_python(
+    code: str, infra_service: str = "MAIN", python_args: tuple[str, ...] = ()
+) -> subprocess.CompletedProcess:
+    """
+    Run code in a fresh interpreter, after django.setup(), as the given service
+    """
+    env = {
+        f"{infra_service}_HAWK_ID": "xxx",
+        f"{infra_service}_HAWK_KEY": "xxx",
+        **os.environ,
+        "INFRA_SERVICE": infra_service,
+        "SLIM_SERVICE": str(infra_service != "MAIN"),
+    }
+    return subprocess.run(
+        [sys.executable, *python_args, "-c", f"import django; django.setup(); {code}"],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def get_cumulative_import_time_ms(module: str) -> float:
+    """
+    Cumulative import time of a module in a fresh interpreter, from the
+    `-X importtime` report (in microseconds) on stderr
+    """
+    result = run_python(f"import {module}", python_args=("-X", "importtime"))
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise AssertionError(f"{module} was already imported by django.setup()")
+
+
+@pytest.mark.parametrize("infra_service", ["PEOPLEFINDER", "SSO_PROFILE", "SSO_SCIM"])
+def test_api_services_do_not_load_heavy_modules(infra_service):
+    result = run_python(
+        "import sys; "
+        "from django.urls import get_resolver; "
+        "get_resolver().url_patterns; "
+        "print('\\n'.join(sys.modules))",
+        infra_service,
+    )
+    loaded = set(result.stdout.splitlines())
+    assert not [
+        module
+        for module in loaded
+        if any(
+            module == heavy or module.startswith(f"{heavy}.") for heavy in HEAVY_MODULES
+        )
+    ]
+
+
+@pytest.mark.e2e
+@pytest.mark.parametrize("module,budget_ms", IMPORT_BUDGETS_MS.items())
+def test_import_time_budget(module, budget_ms):
+    assert get_cumulative_import_time_ms(module) <= budget_ms
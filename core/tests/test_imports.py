@@ -1,17 +1,39 @@
 import copy
 import json
+from datetime import date
+from typing import Any
 from unittest.mock import call
 
 import boto3
 import pytest
 from data_flow_s3_import.tests.utils import S3BotoResource
 from django.conf import settings
+from django.db import connection
 from django.test import override_settings
-
-from core.services import create_identity, get_identity_by_id
-from core.utils import StaffSSOUserS3Ingest
+from django.test.utils import CaptureQueriesContext
+
+from core import checkpoints
+from core.exceptions import IngestScanIncomplete, SyncDeletionLimitExceeded
+from core.models import IngestCheckpoint
+from core.services import (
+    bulk_create_identities,
+    create_identity,
+    get_identity_by_id,
+    partial_update_identity,
+)
+from core.utils import (
+    CountriesS3Ingest,
+    SectorListS3Ingest,
+    StaffSSOUserS3Ingest,
+    SyncCounts,
+    UkStaffLocationsS3Ingest,
+)
 from core.utils import get_s3_resource as util_s3_resource
+from core.utils import process_partition
 from profiles.models.combined import Profile
+from profiles.models.generic import Country, SectorList, UkStaffLocation
+from profiles.models.staff_sso import StaffSSOProfile
+from user.models import User
 
 
 pytestmark = pytest.mark.django_db
@@ -158,20 +180,493 @@ def test_process_all(mocker):
         "core.utils.StaffSSOUserS3Ingest._get_data_to_ingest",
         return_value=[1, 2, 3, 4],
     )
-    mock_process_row = mocker.patch(
-        "core.utils.StaffSSOUserS3Ingest.process_row", return_value="__pk__"
+    mock_process_chunk = mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest.process_chunk",
+        side_effect=lambda lines: [f"__pk{line}__" for line in lines],
     )
     mock_delete = mocker.patch(
         "core.utils.StaffSSOUserS3Ingest.delete_unimported_profiles"
     )
     dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+    dfs.chunk_size = 3
     dfs.process_all()
 
     mock_get_data.assert_called_once_with()
-    assert mock_process_row.call_count == 4
+    assert mock_process_chunk.call_args_list == [
+        call(lines=(1, 2, 3)),
+        call(lines=(4,)),
+    ]
     mock_delete.assert_called_once_with(
-        imported_pks=["__pk__", "__pk__", "__pk__", "__pk__"]
+        imported_pks=["__pk1__", "__pk2__", "__pk3__", "__pk4__"]
+    )
+
+
+def sso_user_line(sso_email_id: str, first_name: str, status: str = "active") -> str:
+    user: dict[str, Any] = copy.deepcopy(john_smith)
+    user["object"]["dit:StaffSSO:User:emailUserId"] = sso_email_id
+    user["object"]["dit:firstName"] = first_name
+    user["object"]["dit:StaffSSO:User:status"] = status
+    user["object"]["dit:emailAddress"] = [f"work.{sso_email_id}"]
+    user["object"]["dit:StaffSSO:User:contactEmailAddress"] = f"contact.{sso_email_id}"
+    return json.dumps(user)
+
+
+def test_process_all_partitioned(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_data_to_ingest",
+        return_value=[1, 2, 3, 4],
+    )
+    mock_process_partitions = mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest.process_partitions",
+        return_value=["__pk__"],
+    )
+    mock_delete = mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest.delete_unimported_profiles"
+    )
+    dfs = StaffSSOUserS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name", workers=2
+    )
+    dfs.process_all()
+
+    mock_process_partitions.assert_called_once_with(lines=[1, 2, 3, 4])
+    mock_delete.assert_called_once_with(imported_pks=["__pk__"])
+
+
+def test_get_partition(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    dfs = StaffSSOUserS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name", workers=4
+    )
+    partitions = {
+        dfs.get_partition(line=sso_user_line(f"user{i}@example.com", "Jane"))
+        for i in range(100)
+    }
+
+    assert partitions == {0, 1, 2, 3}
+    line = sso_user_line("user@example.com", "Jane")
+    assert dfs.get_partition(line=line) == dfs.get_partition(
+        line=line.replace("Jane", "Joan")
+    )
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_process_partitions(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    create_identity(
+        id="user0@example.com",
+        first_name="Billy",
+        last_name="Smith",
+        all_emails=["work.user0@example.com"],
+        is_active=True,
+    )
+    dfs = StaffSSOUserS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name", workers=3
+    )
+    dfs.chunk_size = 2
+    ids = [f"user{i}@example.com" for i in range(10)]
+
+    imported_pks = dfs.process_partitions(
+        lines=(sso_user_line(id, "Jane") for id in ids)
+    )
+
+    assert sorted(imported_pks) == sorted(ids)
+    assert dfs.counts == SyncCounts(created=9, changed=1)
+    assert set(
+        Profile.objects.filter(first_name="Jane").values_list("sso_email_id", flat=True)
+    ) == set(ids)
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_process_partition_commits_each_chunk(mocker, tmp_path):
+    in_transaction = []
+
+    def process_chunk(self, lines):
+        in_transaction.append(connection.in_atomic_block)
+        return [
+            json.loads(line)["object"]["dit:StaffSSO:User:emailUserId"]
+            for line in lines
+        ]
+
+    mocker.patch.object(
+        StaffSSOUserS3Ingest, "process_chunk", autospec=True, side_effect=process_chunk
+    )
+    path = tmp_path / "0.jsonl"
+    ids = [f"user{i}@example.com" for i in range(3)]
+    path.write_text("".join(sso_user_line(id, "Jane") + "\n" for id in ids))
+
+    imported_pks, _, _ = process_partition(path=str(path), chunk_size=2)
+
+    assert imported_pks == ids
+    assert in_transaction == [True, True]
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_process_partitions_resume_from_their_checkpoints(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    source = mocker.Mock(key="users/export.jsonl", e_tag='"abc"')
+    ids = [f"user{i}@example.com" for i in range(6)]
+    dfs = StaffSSOUserS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name", workers=2
+    )
+    dfs.chunk_size = 2
+    dfs.ingest_file = source
+
+    # a run that got through every partition, but died before deleting users
+    dfs.process_partitions(lines=[sso_user_line(id, "Jane") for id in ids])
+
+    assert set(IngestCheckpoint.objects.values_list("importer", "completed")) == {
+        (f"{dfs.get_importer_name()}:0/2", True),
+        (f"{dfs.get_importer_name()}:1/2", True),
+    }
+
+    resumed = StaffSSOUserS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name", workers=2
+    )
+    resumed.ingest_file = source
+    imported_pks = resumed.process_partitions(
+        lines=[sso_user_line(id, "Joan") for id in ids]
+    )
+
+    assert sorted(imported_pks) == ids
+    assert resumed.counts == SyncCounts()
+    assert not Profile.objects.filter(first_name="Joan").exists()
+    resumed.finish_checkpoint()
+    assert not IngestCheckpoint.objects.exists()
+
+
+def test_process_checkpointed_resumes_after_the_last_chunk(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+    dfs.chunk_size = 2
+    dfs.ingest_file = mocker.Mock(key="users/export.jsonl", e_tag='"abc"')
+    ids = [f"user{i}@example.com" for i in range(5)]
+    lines = [sso_user_line(id, "Jane") for id in ids]
+
+    def dying_feed():
+        yield from lines[:3]
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        dfs.process_checkpointed(lines=dying_feed())
+
+    assert dfs.checkpoint is not None
+    assert dfs.checkpoint.lines == 2
+    assert not dfs.checkpoint.completed
+    assert not Profile.objects.filter(pk=ids[2]).exists()
+    with pytest.raises(IngestScanIncomplete):
+        dfs.delete_unimported_profiles(imported_pks=ids[:2])
+
+    spy = mocker.spy(dfs, "process_chunk")
+    imported_pks = dfs.process_checkpointed(lines=lines)
+
+    assert imported_pks == ids
+    assert spy.call_args_list == [
+        call(lines=tuple(lines[2:4])),
+        call(lines=(lines[4],)),
+    ]
+    assert dfs.checkpoint is not None
+    assert dfs.checkpoint.completed
+    assert dfs.counts.created == 5
+
+
+def test_process_all_finishes_its_checkpoint(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_data_to_ingest",
+        return_value=[sso_user_line("jane@example.com", "Jane")],
+    )
+    mocker.patch("core.utils.StaffSSOUserS3Ingest.delete_unimported_profiles")
+    dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+    dfs.ingest_file = mocker.Mock(key="users/export.jsonl", e_tag='"abc"')
+
+    dfs.process_all()
+
+    assert dfs.checkpoint is None
+    assert not IngestCheckpoint.objects.exists()
+
+
+def country_line(i: int) -> str:
+    return json.dumps(
+        {
+            "reference_id": f"CTTEST{i}",
+            "name": f"Country {i}",
+            "type": "country",
+            "iso1_code": f"9{i}",
+            "iso2_code": f"Q{i}",
+            "iso3_code": f"QQ{i}",
+            "overseas_region": None,
+        }
+    )
+
+
+def test_countries_ingest_marks_deleted_only_once_complete(mocker):
+    mocker.patch(
+        "core.utils.CountriesS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    Country.objects.create(
+        reference_id="CTTEST9",
+        name="Country 9",
+        type="country",
+        iso_1_code="99",
+        iso_2_code="Q9",
+        iso_3_code="QQ9",
+    )
+    lines = [country_line(i) for i in range(3)]
+
+    def dying_export():
+        yield from lines[:2]
+        raise ConnectionError
+
+    mocker.patch(
+        "core.utils.CountriesS3Ingest._get_data_to_ingest",
+        side_effect=[dying_export(), iter(lines)],
     )
+    dfs = CountriesS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+    dfs.chunk_size = 2
+    dfs.ingest_file = mocker.Mock(key="countries/export.jsonl", e_tag='"abc"')
+
+    with pytest.raises(ConnectionError):
+        dfs.process_all()
+    with pytest.raises(IngestScanIncomplete):
+        dfs.mark_deleted_upstream()
+    assert Country.objects.filter(pk="CTTEST9").exists()
+
+    dfs.process_all()
+    dfs.mark_deleted_upstream()
+
+    assert dfs.imported_pks == ["CTTEST0", "CTTEST1", "CTTEST2"]
+    assert not Country.objects.filter(pk="CTTEST9").exists()
+
+
+def test_reference_ingest_skips_an_unchanged_export(mocker):
+    source = mocker.Mock(key="countries/export.jsonl", e_tag='"abc"', size=100)
+    mocker.patch(
+        "core.utils.CountriesS3Ingest._get_files_to_ingest",
+        return_value=[source],
+    )
+    mock_process_all = mocker.patch(
+        "core.utils.CountriesS3Ingest.process_all",
+        autospec=True,
+        side_effect=lambda self: setattr(self, "ingest_file", source),
+    )
+    mocker.patch("core.utils.CountriesS3Ingest._cleanup")
+
+    ingested = CountriesS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket")
+    skipped = CountriesS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket")
+
+    assert mock_process_all.call_count == 1
+    assert not ingested.unchanged
+    assert skipped.unchanged
+    stats = skipped.get_stats()
+    assert stats["importer"] == "core.utils.CountriesS3Ingest"
+    assert stats["unchanged"]
+    assert stats["ingests"] == 1
+    assert stats["skips"] == 1
+
+
+def test_reference_ingest_deletes_an_unchanged_export(mocker):
+    older = mocker.Mock(key="countries/older.jsonl", e_tag='"def"', size=100)
+    source = mocker.Mock(key="countries/export.jsonl", e_tag='"abc"', size=100)
+    mocker.patch(
+        "core.utils.CountriesS3Ingest._get_files_to_ingest",
+        return_value=[older, source],
+    )
+    mock_mark_deleted = mocker.patch(
+        "core.utils.CountriesS3Ingest.mark_deleted_upstream"
+    )
+    checkpoints.record_ingest(importer="core.utils.CountriesS3Ingest", source=source)
+    s3_resource = mocker.MagicMock()
+
+    skipped = CountriesS3Ingest(s3_resource=s3_resource, bucket_name="bucket")
+
+    assert skipped.unchanged
+    s3_resource.Bucket.return_value.delete_objects.assert_called_once_with(
+        Delete={"Objects": [{"Key": source.key}, {"Key": older.key}]}
+    )
+    mock_mark_deleted.assert_not_called()
+
+
+def sector_line(sector_id: str, name: str) -> str:
+    return json.dumps(
+        {
+            "field_01": sector_id,
+            "full_sector_name": name,
+            "sector_cluster__april_2023": "Cluster",
+            "field_03": "Old cluster",
+            "field_04": name,
+            "field_05": None,
+            "field_02": None,
+            "field_06": "2023-04-01",
+            "field_07": None,
+        }
+    )
+
+
+def test_upsert_objects(mocker):
+    mocker.patch(
+        "core.utils.SectorListS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    SectorList.objects.create(
+        sector_id="SL1",
+        full_sector_name="Old",
+        sector_cluster_name_april_2023_onwards="Cluster",
+        sector_cluster_name_before_april_2023="Old cluster",
+        sector_name="Old",
+        exists_in_last_import=False,
+    )
+    dfs = SectorListS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name", bulk=True
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        identifiers = dfs.process_chunk(
+            lines=[
+                sector_line("SL1", "Energy"),
+                sector_line("SL2", "Defence"),
+                sector_line("SL2", "Space"),
+            ]
+        )
+
+    assert identifiers == ["SL1", "SL2"]
+    assert len(queries) == 1
+    assert dict(SectorList.objects.values_list("sector_id", "sector_name")) == {
+        "SL1": "Energy",
+        "SL2": "Space",
+    }
+    assert SectorList.objects.get(sector_id="SL2").start_date == date(2023, 4, 1)
+
+
+def test_mark_deleted_upstream_by_identifier(mocker):
+    mocker.patch(
+        "core.utils.UkStaffLocationsS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    for code in ("LOC1", "LOC2"):
+        UkStaffLocation.objects.create(
+            code=code, name=code, city="London", organisation="DBT"
+        )
+    dfs = UkStaffLocationsS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name"
+    )
+    dfs.imported_pks = ["LOC1"]
+
+    dfs.mark_deleted_upstream()
+
+    assert list(UkStaffLocation.objects.values_list("code", flat=True)) == ["LOC1"]
+
+
+def test_process_chunk(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    create_identity(
+        id="existing@example.com",
+        first_name="Billy",
+        last_name="Smith",
+        all_emails=["work.existing@example.com"],
+        is_active=True,
+    )
+    dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+
+    ids = dfs.process_chunk(
+        lines=[
+            sso_user_line("new@example.com", "Jane"),
+            sso_user_line("existing@example.com", "Bill"),
+            sso_user_line("existing@example.com", "John", status="inactive"),
+        ]
+    )
+
+    assert ids == ["new@example.com", "existing@example.com"]
+    new = get_identity_by_id(id="new@example.com")
+    assert new.first_name == "Jane"
+    assert new.emails == ["work.new@example.com", "contact.new@example.com"]
+    assert new.primary_email == "work.new@example.com"
+    assert new.contact_email == "contact.new@example.com"
+    existing = get_identity_by_id(id="existing@example.com", include_inactive=True)
+    assert existing.first_name == "John"
+    assert not existing.is_active
+    assert set(existing.emails) == {
+        "work.existing@example.com",
+        "contact.existing@example.com",
+    }
+
+
+def test_process_chunk_skips_unchanged_users(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+    lines = [
+        sso_user_line("jane@example.com", "Jane"),
+        sso_user_line("john@example.com", "John"),
+    ]
+    dfs.process_chunk(lines=lines)
+    assert dfs.counts == SyncCounts(created=2)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert dfs.process_chunk(lines=lines) == [
+            "jane@example.com",
+            "john@example.com",
+        ]
+    assert len(queries) == 1
+    assert dfs.counts == SyncCounts(created=2, skipped=2)
+
+    dfs.process_chunk(lines=[lines[0], sso_user_line("john@example.com", "Johnny")])
+    assert dfs.counts == SyncCounts(created=2, changed=1, skipped=3)
+    assert get_identity_by_id(id="john@example.com").first_name == "Johnny"
+
+    # a write from elsewhere is overwritten by the next sync, though the
+    # record in the feed hasn't changed
+    partial_update_identity(
+        profile=get_identity_by_id(id="jane@example.com"), first_name="Janet"
+    )
+    dfs.process_chunk(lines=[lines[0]])
+    assert dfs.counts == SyncCounts(created=2, changed=2, skipped=3)
+    assert get_identity_by_id(id="jane@example.com").first_name == "Jane"
+
+
+def test_process_chunk_queries_do_not_grow_with_users(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+
+    def count_queries(prefix: str, users: int) -> int:
+        lines = [
+            sso_user_line(f"{prefix}{i}@example.com", "Jane") for i in range(users)
+        ]
+        dfs.process_chunk(lines=lines[: users // 2])
+        with CaptureQueriesContext(connection) as queries:
+            # half new and half existing users, whose names change
+            dfs.process_chunk(lines=[line.replace("Jane", "Joan") for line in lines])
+        return len(queries)
+
+    count_queries("warm-up", 2)  # warm up the content type cache
+    assert count_queries("few", 4) == count_queries("many", 40)
 
 
 def test_process_object(mocker):
@@ -295,41 +790,60 @@ def test_extract_emails_from_sso_user(mocker):
     )
 
 
+def create_users(count: int) -> list[str]:
+    profiles = bulk_create_identities(
+        identities=[
+            {
+                "id": f"user{i}@example.com",
+                "first_name": "First",
+                "last_name": "Last",
+                "all_emails": [f"user{i}@example.com"],
+                "is_active": True,
+            }
+            for i in range(count)
+        ]
+    )
+    return [profile.sso_email_id for profile in profiles]
+
+
+@override_settings(SSO_SYNC_MAX_DELETION_PERCENT=50)
 def test_delete_unimported_profiles(mocker):
     mocker.patch(
         "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
         return_value=None,
     )
-    mock_user_qs = mocker.Mock()
-    mock_user = mocker.patch("core.utils.User")  # mocker.Mock()
-    mock_user.objects.exclude.return_value = mock_user_qs
-    mock_user_qs.values_list.return_value = [55, 66, 77, 88]
-    # mocker.patch("django.contrib.auth.get_user_model", return_value=mock_user)
-    mock_svc_delete = mocker.patch("core.utils.delete_identity")
-    mock_svc_get = mocker.patch(
-        "core.utils.get_identity_by_id", return_value="--profile--"
-    )
+    ids = create_users(count=4)
     dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+    dfs.chunk_size = 1
 
-    dfs.delete_unimported_profiles(imported_pks=[543, 654, 765])
-    mock_user.objects.exclude.assert_called_once_with(sso_email_id__in=[543, 654, 765])
-    mock_svc_get.assert_has_calls(
-        [
-            call(id=55, include_inactive=True),
-            call(id=66, include_inactive=True),
-            call(id=77, include_inactive=True),
-            call(id=88, include_inactive=True),
-        ]
-    )
-    mock_svc_delete.assert_has_calls(
-        [
-            call(profile="--profile--"),
-            call(profile="--profile--"),
-            call(profile="--profile--"),
-            call(profile="--profile--"),
-        ]
+    dfs.delete_unimported_profiles(imported_pks=[ids[0], ids[2], ids[2], "other"])
+
+    assert sorted(User.objects.values_list("sso_email_id", flat=True)) == [
+        ids[0],
+        ids[2],
+    ]
+    assert sorted(Profile.objects.values_list("sso_email_id", flat=True)) == [
+        ids[0],
+        ids[2],
+    ]
+    assert not StaffSSOProfile.objects.filter(user_id__in=[ids[1], ids[3]]).exists()
+    assert dfs.counts.deleted == 2
+
+
+@override_settings(SSO_SYNC_MAX_DELETION_PERCENT=25)
+def test_delete_unimported_profiles_aborts_past_the_limit(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
     )
-    assert mock_svc_delete.call_count == 4
+    ids = create_users(count=4)
+    dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+
+    with pytest.raises(SyncDeletionLimitExceeded):
+        dfs.delete_unimported_profiles(imported_pks=ids[:2])
+
+    assert User.objects.count() == 4
+    assert dfs.counts.deleted == 0
 
 
 @pytest.mark.e2e
@@ -404,6 +918,7 @@ def test_changed_users_are_updated(create_ingest_source_files):
 @override_settings(DATA_FLOW_UPLOADS_BUCKET="dataflow.identity.local")
 @override_settings(DATA_FLOW_UPLOADS_BUCKET_PATH="test-e2e")
 @override_settings(DATA_FLOW_USERS_DIRECTORY="users/")
+@override_settings(SSO_SYNC_MAX_DELETION_PERCENT=100)
 def test_missing_users_are_deleted(create_ingest_source_files):
     create_identity(
         id="billy@example.com",
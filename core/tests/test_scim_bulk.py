@@ -0,0 +1,83 @@
+import pytest
+
+from core.schemas.scim import BulkOperation
+from core.scim_bulk import plan_operations
+from profiles.types import UNSET
+
+
+pytestmark = pytest.mark.django_db
+
+
+def user_data(id: str, emails: list[dict]) -> dict:
+    return {
+        "id": id,
+        "externalId": id,
+        "userName": id,
+        "name": {"givenName": "John", "familyName": "Doe"},
+        "active": True,
+        "emails": emails,
+    }
+
+
+def test_plan_operations():
+    operations = [
+        BulkOperation(
+            method="POST",
+            bulkId="new",
+            path="/Users",
+            data=user_data("new@id", [{"value": "new@example.com", "primary": True}]),
+        ),
+        BulkOperation(
+            method="PUT",
+            path="/Users/existing@id",
+            data=user_data("existing@id", [{"value": "existing@example.com"}]),
+        ),
+        BulkOperation(method="DELETE", path="/Users/other@id"),
+        # errors
+        BulkOperation(method="DELETE", path="/Users/existing@id"),
+        BulkOperation(method="DELETE", path="/Users/unknown@id"),
+        BulkOperation(method="POST", path="/Users", data=user_data("other@id", [])),
+        BulkOperation(method="PUT", path="/Users", data={}),
+        BulkOperation(method="POST", path="/Users", data={"externalId": "x@id"}),
+    ]
+
+    plan = plan_operations(
+        operations=operations,
+        existing_ids={"existing@id", "other@id"},
+        get_location=lambda id: f"/Users/{id}",
+    )
+
+    assert plan.creates == [
+        {
+            "id": "new@id",
+            "first_name": "John",
+            "last_name": "Doe",
+            "all_emails": ["new@example.com"],
+            "is_active": True,
+            "primary_email": "new@example.com",
+            "contact_email": None,
+        }
+    ]
+    assert plan.updates[0]["id"] == "existing@id"
+    assert plan.updates[0]["primary_email"] is UNSET
+    assert plan.deletes == ["other@id"]
+    assert plan.errors == 5
+    assert [result["status"] for result in plan.results] == [
+        "201",
+        "200",
+        "204",
+        "400",
+        "404",
+        "400",
+        "400",
+        "400",
+    ]
+    assert plan.results[0] == {
+        "method": "POST",
+        "bulkId": "new",
+        "status": "201",
+        "location": "/Users/new@id",
+    }
+    assert plan.results[3]["response"]["scimType"] == "invalidValue"
+    assert plan.results[6]["response"]["scimType"] == "invalidPath"
+    assert plan.results[7]["response"]["scimType"] == "invalidSyntax"
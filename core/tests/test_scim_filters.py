@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.scim_filters import (
+    InvalidCursor,
+    InvalidFilter,
+    decode_cursor,
+    encode_cursor,
+    parse_filter,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_parse_filter():
+    assert parse_filter('userName eq "john@example.com"') == {"id": "john@example.com"}
+    assert parse_filter(
+        'externalId eq "a and b" AND emails.value eq "John@Example.com" '
+        'and active eq False and meta.lastModified gt "2024-01-01T00:00:00"'
+    ) == {
+        "id": "a and b",
+        "email": "John@Example.com",
+        "is_active": False,
+        "modified_after": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        'userName co "john"',
+        'userName eq "a" or active eq true',
+        '(userName eq "a")',
+        'active eq "true"',
+        "userName eq true",
+        'meta.lastModified gt "yesterday"',
+        'userName eq "a" and externalId eq "b"',
+        'userName eq "a" and',
+    ],
+)
+def test_parse_filter_invalid(filter):
+    with pytest.raises(InvalidFilter):
+        parse_filter(filter)
+
+
+def test_cursor():
+    assert decode_cursor(encode_cursor("john@example.com")) == "john@example.com"
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not a cursor")
@@ -0,0 +1,67 @@
+import pytest
+
+from core.schemas.scim import PatchOperation
+from core.scim_patch import InvalidPatch, parse_patch
+from profiles.types import UNSET
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_parse_patch():
+    assert parse_patch(
+        [PatchOperation(op="replace", path="active", value=False)], emails=[]
+    ) == {"is_active": False}
+    assert parse_patch(
+        [
+            PatchOperation(
+                op="Replace",
+                value={"active": "True", "name": {"familyName": "Smith"}},
+            ),
+            PatchOperation(op="add", path="name", value={"givenName": "Jo"}),
+        ],
+        emails=[],
+    ) == {"is_active": True, "first_name": "Jo", "last_name": "Smith"}
+
+
+def test_parse_patch_emails():
+    emails = ["a@example.com", "b@example.com"]
+    assert parse_patch(
+        [PatchOperation(op="add", path="emails", value=[{"value": "c@example.com"}])],
+        emails=emails,
+    ) == {
+        "all_emails": ["a@example.com", "b@example.com", "c@example.com"],
+        "primary_email": None,
+        "contact_email": None,
+    }
+    assert parse_patch(
+        [
+            PatchOperation(
+                op="replace",
+                path="emails",
+                value=[{"value": "c@example.com", "primary": True}],
+            )
+        ],
+        emails=emails,
+    ) == {
+        "all_emails": ["c@example.com"],
+        "primary_email": "c@example.com",
+        "contact_email": UNSET,
+    }
+
+
+@pytest.mark.parametrize(
+    "operation,scim_type",
+    [
+        (PatchOperation(op="move", path="active", value=True), "invalidSyntax"),
+        (PatchOperation(op="replace", path="title", value="Dr"), "invalidPath"),
+        (PatchOperation(op="remove", path="active"), "mutability"),
+        (PatchOperation(op="replace", path="active", value="yes"), "invalidValue"),
+        (PatchOperation(op="replace", path="emails", value=[]), "invalidValue"),
+        (PatchOperation(op="replace", value=True), "invalidValue"),
+    ],
+)
+def test_parse_patch_invalid(operation, scim_type):
+    with pytest.raises(InvalidPatch) as e:
+        parse_patch([operation], emails=["a@example.com"])
+    assert e.value.scim_type == scim_type
@@ -2,6 +2,7 @@ import datetime as dt
 from unittest.mock import call
 
 import pytest
+from django.contrib.admin.models import LogEntry
 
 from core import services
 from core.services import (
@@ -136,6 +137,47 @@ def test_update_identity() -> None:
     ).is_active
 
 
+def test_update_identity_skips_unchanged_records() -> None:
+    emails = ["new_user@email.gov.uk"]
+    profile = services.create_identity(
+        "new_user@gov.uk",
+        first_name="Billy",
+        last_name="Bob",
+        all_emails=emails,
+        is_active=True,
+    )
+    sso_profile = StaffSSOProfile.objects.get(user_id="new_user@gov.uk")
+    log_entries = LogEntry.objects.count()
+
+    assert (
+        services.update_identity(
+            profile,
+            first_name="Billy",
+            last_name="Bob",
+            all_emails=emails,
+            is_active=True,
+        )
+        == 2
+    )
+    assert profile.history.count() == 1
+    assert sso_profile.history.count() == 1
+    assert LogEntry.objects.count() == log_entries
+
+    assert (
+        services.update_identity(
+            profile,
+            first_name="Billy",
+            last_name="Bobby",
+            all_emails=emails,
+            is_active=True,
+        )
+        == 0
+    )
+    assert profile.history.count() == 2
+    assert sso_profile.history.count() == 2
+    assert LogEntry.objects.count() == log_entries + 2
+
+
 def test_delete_identity() -> None:
     profile = services.create_identity(
         id="new_user@gov.uk",
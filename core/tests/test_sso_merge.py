@@ -0,0 +1,236 @@
+import json
+
+import pytest
+from data_flow_s3_import.tests.utils import S3BotoResource
+from django.contrib.admin.models import LogEntry
+
+from core import sso_merge
+from core.models import IngestCheckpoint
+from core.services import create_identity, get_identity_by_id
+from core.utils import StaffSSOUserS3Ingest, SyncCounts
+from profiles.models.combined import Profile, ProfileMinimalDocument
+from profiles.models.staff_sso import StaffSSOProfile, StaffSSOProfileEmail
+from user.models import User
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True, scope="function")
+def basic_user(): ...
+
+
+def sso_user_line(
+    sso_email_id: str,
+    first_name: str = "Jane",
+    status: str = "active",
+    emails: list[str] | None = None,
+) -> str:
+    return json.dumps(
+        {
+            "object": {
+                "dit:StaffSSO:User:emailUserId": sso_email_id,
+                "dit:StaffSSO:User:contactEmailAddress": f"contact.{sso_email_id}",
+                "dit:StaffSSO:User:status": status,
+                "dit:firstName": first_name,
+                "dit:lastName": "Doe",
+                "dit:emailAddress": emails or [f"work.{sso_email_id}"],
+            }
+        }
+    )
+
+
+def profile_values(prefix: str) -> list[tuple]:
+    return [
+        (
+            profile.sso_email_id.removeprefix(prefix),
+            profile.first_name,
+            profile.last_name,
+            profile.primary_email.replace(prefix, ""),
+            profile.contact_email.replace(prefix, ""),
+            [email.replace(prefix, "") for email in profile.emails],
+            profile.is_active,
+        )
+        for profile in Profile.objects.filter(sso_email_id__startswith=prefix).order_by(
+            "pk"
+        )
+    ]
+
+
+def history_types(model, **filters) -> list[str]:
+    return list(
+        model.history.filter(**filters)
+        .order_by("history_date", "history_id")
+        .values_list("history_type", flat=True)
+    )
+
+
+def test_merge_feed_creates_users():
+    result = sso_merge.merge_feed(
+        lines=[
+            sso_user_line("jane@example.com"),
+            sso_user_line("john@example.com", first_name="John", status="inactive"),
+            sso_user_line("john@example.com", first_name="Johnny", status="inactive"),
+        ]
+    )
+
+    assert result.created == {"jane@example.com", "john@example.com"}
+    assert result.changed == set()
+    assert result.skipped == set()
+    assert not User.objects.get(pk="john@example.com").is_active
+    jane = get_identity_by_id(id="jane@example.com")
+    assert jane.first_name == "Jane"
+    assert jane.emails == ["work.jane@example.com", "contact.jane@example.com"]
+    assert jane.primary_email == "work.jane@example.com"
+    assert jane.contact_email == "contact.jane@example.com"
+    john = Profile.objects.get(pk="john@example.com")
+    assert john.first_name == "Johnny"
+    assert not john.is_active
+    sso_profile = StaffSSOProfile.objects.get(user_id="jane@example.com")
+    assert sso_profile.primary_email == "work.jane@example.com"
+    assert sso_profile.contact_email == "contact.jane@example.com"
+    assert ProfileMinimalDocument.objects.filter(profile_id=jane.pk).exists()
+
+    assert history_types(Profile, sso_email_id=jane.pk) == ["+"]
+    assert history_types(StaffSSOProfile, user_id=jane.pk) == ["+"]
+    assert history_types(StaffSSOProfileEmail, profile_id=sso_profile.pk) == ["+", "+"]
+    assert set(
+        LogEntry.objects.filter(object_id=jane.pk).values_list(
+            "change_message", flat=True
+        )
+    ) == {"Creating new User record", "Creating new Profile"}
+    assert LogEntry.objects.get(
+        object_id=str(sso_profile.pk), change_message="Creating new StaffSSOProfile"
+    )
+
+
+def test_merge_feed_updates_and_skips_users():
+    for id in ("changed@example.com", "unchanged@example.com", "missing@example.com"):
+        create_identity(
+            id=id,
+            first_name="Jane",
+            last_name="Doe",
+            all_emails=[f"work.{id}", f"contact.{id}"],
+            primary_email=f"work.{id}",
+            contact_email=f"contact.{id}",
+            is_active=True,
+        )
+    changed = Profile.objects.get(pk="changed@example.com")
+    log_entries = LogEntry.objects.count()
+
+    result = sso_merge.merge_feed(
+        lines=[
+            sso_user_line(
+                "changed@example.com",
+                first_name="Janet",
+                status="inactive",
+                emails=["new.changed@example.com"],
+            ),
+            sso_user_line("unchanged@example.com"),
+        ]
+    )
+
+    assert result.created == set()
+    assert result.changed == {"changed@example.com"}
+    assert result.skipped == {"unchanged@example.com"}
+    assert result.missing == ["missing@example.com"]
+    profile = Profile.objects.get(pk="changed@example.com")
+    assert profile.first_name == "Janet"
+    assert not profile.is_active
+    assert profile.emails == ["contact.changed@example.com", "new.changed@example.com"]
+    assert profile.primary_email == "new.changed@example.com"
+    assert profile.revision == changed.revision + 1
+    assert history_types(Profile, sso_email_id=profile.pk) == ["+", "~"]
+    assert history_types(Profile, sso_email_id="unchanged@example.com") == ["+"]
+    sso_profile = StaffSSOProfile.objects.get(user_id=profile.pk)
+    assert "-" in history_types(StaffSSOProfileEmail, profile_id=sso_profile.pk)
+    assert set(
+        LogEntry.objects.order_by("pk")[log_entries:].values_list(
+            "change_message", flat=True
+        )
+    ) == {
+        "Archiving User record",
+        "Updating StaffSSOProfile record: first_name, emails",
+        "Archiving Profile record",
+        "Updating Profile record: first_name, primary_email, emails",
+    }
+
+
+def test_merge_feed_matches_the_orm_path(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    dfs = StaffSSOUserS3Ingest(s3_resource=S3BotoResource(), bucket_name="bucket_name")
+
+    def feed(prefix: str) -> list[str]:
+        return [
+            sso_user_line(f"{prefix}1@example.com"),
+            sso_user_line(f"{prefix}2@example.com", status="inactive"),
+            sso_user_line(
+                f"{prefix}3@example.com",
+                emails=[f"{prefix}3@example.com", f"contact.{prefix}3@example.com"],
+            ),
+        ]
+
+    dfs.process_chunk(lines=feed(prefix="orm"))
+    sso_merge.merge_feed(lines=feed(prefix="copy"))
+
+    assert profile_values(prefix="copy") == profile_values(prefix="orm")
+
+
+def test_merge_all(mocker, settings):
+    settings.SSO_SYNC_MAX_DELETION_PERCENT = 100
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_data_to_ingest",
+        return_value=[sso_user_line("jane@example.com")],
+    )
+    create_identity(
+        id="john@example.com",
+        first_name="John",
+        last_name="Doe",
+        all_emails=["john@example.com"],
+        is_active=True,
+    )
+    dfs = StaffSSOUserS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name", copy=True
+    )
+
+    dfs.process_all()
+
+    assert dfs.counts == SyncCounts(created=1, deleted=1)
+    assert list(Profile.objects.values_list("pk", flat=True)) == ["jane@example.com"]
+
+
+def test_merge_all_is_rerun_in_full_after_a_failure(mocker):
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_data_to_ingest",
+        return_value=[sso_user_line("jane@example.com")],
+    )
+    merge_profiles = sso_merge.merge_profiles
+    mocker.patch("core.sso_merge.merge_profiles", side_effect=ConnectionError)
+    dfs = StaffSSOUserS3Ingest(
+        s3_resource=S3BotoResource(), bucket_name="bucket_name", copy=True
+    )
+    dfs.ingest_file = mocker.Mock(key="users/export.jsonl", e_tag='"abc"')
+
+    # the merge isn't checkpointed: a run that dies commits none of the feed
+    with pytest.raises(ConnectionError):
+        dfs.process_all()
+
+    assert not User.objects.filter(pk="jane@example.com").exists()
+    assert not IngestCheckpoint.objects.exists()
+
+    mocker.patch("core.sso_merge.merge_profiles", side_effect=merge_profiles)
+    dfs.process_all()
+
+    assert dfs.counts == SyncCounts(created=1)
+    assert Profile.objects.filter(pk="jane@example.com").exists()
@@ -1,16 +1,32 @@
+import hashlib
 import json
 import logging
+import multiprocessing
+import os
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from itertools import batched, chain, islice, repeat
+from typing import Iterable, Optional
 
-import boto3
 from data_flow_s3_import import ingest
-from data_flow_s3_import.types import PrimaryKey
+from data_flow_s3_import.types import PrimaryKey, S3ObjectSummary
 from django.conf import settings
-from django.contrib.auth import get_user_model
+from django.db import connections
 
+from core import audit, checkpoints, sso_merge
+from core.exceptions import IngestScanIncomplete, SyncDeletionLimitExceeded
+from core.models import IngestCheckpoint
 from core.services import (
+    bulk_apply_identity_changes,
     create_identity,
-    delete_identity,
+    get_existing_identity_ids,
     get_identity_by_id,
+    get_identity_count,
+    get_identity_ids_missing_from,
+    get_unchanged_identity_ids,
+    record_identity_source_hashes,
     update_identity,
 )
 from profiles.models.combined import Profile
@@ -18,11 +34,12 @@ from profiles.models.generic import Country, SectorList, UkStaffLocation
 
 
 logger = logging.getLogger(__name__)
-User = get_user_model()
 
 
 def get_s3_resource():
     """Wrapper for boto resource initialiser allowing for local/test"""
+    import boto3
+
     if local_endpoint := getattr(settings, "S3_LOCAL_ENDPOINT_URL", None):
         logger.debug(
             f"DataFlow S3 Import: using local S3 endpoint %s",
@@ -38,6 +55,91 @@ def get_s3_resource():
     return boto3.resource("s3")
 
 
+class CheckpointedIngestMixin:
+    """
+    Process the export a chunk at a time, committing each chunk together with
+    a checkpoint, so that a run that dies is resumed after its last chunk by
+    the next run over the same S3 object.
+    """
+
+    # number of lines of the export read and written together
+    chunk_size: int = 1000
+    checkpoint: Optional[IngestCheckpoint] = None
+    # the S3 object being read, set by the DataFlowS3Ingest this is mixed into
+    # once the export starts being read
+    ingest_file: Optional[S3ObjectSummary]
+
+    def get_importer_name(self) -> str:
+        return f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+
+    def process_chunk(self, lines: Iterable[str]) -> list[PrimaryKey]:
+        raise NotImplementedError
+
+    def get_key(self, line: str) -> PrimaryKey:
+        """
+        The key process_chunk returns for the record of a line of the export
+        """
+        raise NotImplementedError
+
+    def process_checkpointed(self, lines: Iterable[str]) -> list[PrimaryKey]:
+        """
+        Process the lines of the export with process_chunk, a chunk at a time,
+        each in a transaction that moves the checkpoint on past it, skipping the
+        lines a previous run over the same S3 object got through. Returns the
+        keys of every record processed from the export, by this run and the
+        ones before it, whose keys are read back from the lines skipped rather
+        than stored with the checkpoint.
+        """
+        lines = iter(lines)
+        # the S3 object is only picked once the export starts being read
+        lines = chain(list(islice(lines, 1)), lines)
+        self.checkpoint = None
+        if self.ingest_file is not None:
+            self.checkpoint = checkpoints.start(
+                importer=self.get_importer_name(), source=self.ingest_file
+            )
+        return self.process_from_checkpoint(lines=lines)
+
+    def process_from_checkpoint(self, lines: Iterable[str]) -> list[PrimaryKey]:
+        """
+        Process the lines after those self.checkpoint has got through, as
+        process_checkpointed does once it has the checkpoint
+        """
+        lines = iter(lines)
+        keys: list[PrimaryKey] = []
+        if self.checkpoint is not None:
+            keys = [
+                self.get_key(line=line) for line in islice(lines, self.checkpoint.lines)
+            ]
+
+        for chunk in batched(lines, self.chunk_size):
+            with audit.atomic():
+                chunk_keys = self.process_chunk(lines=chunk)
+                if self.checkpoint is not None:
+                    checkpoints.advance(checkpoint=self.checkpoint, lines=len(chunk))
+            keys += chunk_keys
+
+        if self.checkpoint is not None:
+            checkpoints.complete(checkpoint=self.checkpoint)
+        return keys
+
+    def check_scan_completed(self) -> None:
+        """
+        Raise unless every line of the export has been processed, before
+        anything missing from it is deleted
+        """
+        if self.checkpoint is not None and not self.checkpoint.completed:
+            raise IngestScanIncomplete(
+                f"{self.get_importer_name()} has only processed "
+                f"{self.checkpoint.lines} lines of {self.checkpoint.source_key}"
+            )
+
+    def finish_checkpoint(self) -> None:
+        if self.checkpoint is not None:
+            checkpoints.finish(checkpoint=self.checkpoint)
+            self.checkpoint = None
+
+
 class DataFlowS3Ingest(ingest.DataFlowS3Ingest):
     """
     Set application specific behaviour for DataFlowS3Ingest.
@@ -47,60 +149,407 @@ class DataFlowS3Ingest(ingest.DataFlowS3Ingest):
         return get_s3_resource()
 
 
-class DataFlowS3IngestToModel(ingest.DataFlowS3IngestToModel):
+class DataFlowS3IngestToModel(CheckpointedIngestMixin, ingest.DataFlowS3IngestToModel):
     """
     Set  application specific behaviour for DataFlowS3IngestToModel.
     """
 
+    # whether the run was skipped, as the export was the one last ingested
+    unchanged: bool = False
+    # whether each chunk of the export is upserted with one INSERT ... ON
+    # CONFLICT, rather than a row at a time
+    bulk: bool = settings.DATA_FLOW_BULK_INGEST
+
+    def __init__(self, *args, bulk: Optional[bool] = None, **kwargs):
+        if bulk is not None:
+            self.bulk = bulk
+        super().__init__(*args, **kwargs)
+
     def get_s3_resource(self):
         return get_s3_resource()
 
+    def _process_all_workflow(self) -> None:
+        """
+        Skip the run when the newest export is the S3 object last ingested in
+        full, rather than rewrite every row from it, and record the object once
+        it has been ingested. A skipped export is cleaned up all the same.
+        """
+        files = self._get_files_to_ingest()
+        if files and checkpoints.is_unchanged(
+            importer=self.get_importer_name(), source=files[-1]
+        ):
+            self.unchanged = True
+            logger.info(
+                f"DataFlow S3 {self.__class__}: Skipping {files[-1].key}, unchanged "
+                "since it was last ingested"
+            )
+            self.ingest_file = files[-1]
+            self.other_files = files[:-1]
+            self._cleanup()
+            return
+
+        super()._process_all_workflow()
+        if self.ingest_file is not None:
+            checkpoints.record_ingest(
+                importer=self.get_importer_name(), source=self.ingest_file
+            )
+
+    def get_stats(self) -> dict:
+        """
+        Whether this run was skipped as its export was unchanged, and the
+        importer's ingested and skipped runs so far
+        """
+        return {
+            "importer": self.get_importer_name(),
+            "unchanged": self.unchanged,
+            **checkpoints.get_ingest_stats(importer=self.get_importer_name()),
+        }
+
+    def process_all(self):
+        self.imported_pks = self.process_checkpointed(
+            lines=self._get_data_to_ingest() or []
+        )
+
+    def process_chunk(self, lines: Iterable[str]) -> list[PrimaryKey]:
+        if self.bulk:
+            return self.upsert_objects(
+                objs=[self.get_object(line=line) for line in lines]
+            )
+        return [self.process_row(line=line) for line in lines]
+
+    def process_row(self, line: str) -> PrimaryKey:
+        """
+        Takes a row of the file, retrieves a dict of the instance it refers to and hands that off for processing
+        """
+        return self._process_object_workflow(obj=self.get_object(line=line))
+
+    def get_object(self, line: str) -> dict:
+        """
+        The dict of the instance a row of the file refers to
+        """
+        return json.loads(s=line)["object"]  # standard for the Data Flow structure
+
+    def get_key(self, line: str) -> PrimaryKey:
+        return self.get_object(line=line)[self.identifier_field_object_mapping]
+
+    def upsert_objects(self, objs: list[dict]) -> list[PrimaryKey]:
+        """
+        Create or update the instances of a chunk of the file together, mapped
+        as process_object maps them, with one INSERT ... ON CONFLICT on the
+        identifier field. The per-object hooks aren't run. Returns their
+        identifiers.
+        """
+        model = self.get_model()
+        instances = {}
+        for obj in objs:
+            values = {field: obj[key] for field, key in self.mapping.items()}
+            values[self.identifier_field_name] = obj[
+                self.identifier_field_object_mapping
+            ]
+            if self.model_uses_baseclass:
+                values["exists_in_last_import"] = True
+            # an instance listed twice is written once, as last listed
+            instances[values[self.identifier_field_name]] = model(**values)
+
+        update_fields = [
+            field for field in self.mapping if field != self.identifier_field_name
+        ]
+        if self.model_uses_baseclass:
+            update_fields += ["exists_in_last_import", "modified"]
+        self.get_model_manager().bulk_create(
+            list(instances.values()),
+            update_conflicts=True,
+            unique_fields=[self.identifier_field_name],
+            update_fields=update_fields,
+        )
+        logger.info(
+            f"DataFlow S3 {self.__class__}: Upserted {len(instances)} {self.model} "
+            "records"
+        )
+        return list(instances)
+
+    def mark_deleted_upstream(self) -> None:
+        """
+        Mark the instances missing from the file as deleted upstream, in one
+        statement, by the identifiers imported
+        """
+        self.check_scan_completed()
+        marked = (
+            self.get_model_manager()
+            .exclude(**{f"{self.identifier_field_name}__in": self.imported_pks or []})
+            .update(exists_in_last_import=False)
+        )
+        logger.info(
+            f"DataFlow S3 {self.__class__}: Marked {marked} {self.model} records "
+            "deleted upstream"
+        )
+
+    def _cleanup(self) -> None:
+        if self.unchanged:
+            # nothing was read, so nothing is marked deleted upstream; the
+            # exports are only deleted from S3
+            ingest.DataFlowS3Ingest._cleanup(self)
+            return
+        super()._cleanup()
+        self.finish_checkpoint()
+
+
+@dataclass
+class SyncCounts:
+    """
+    What a run of the Staff SSO user sync did, by number of users
+    """
+
+    created: int = 0
+    changed: int = 0
+    skipped: int = 0
+    deleted: int = 0
+
+    def add(self, other: "SyncCounts") -> None:
+        for field in fields(self):
+            setattr(
+                self, field.name, getattr(self, field.name) + getattr(other, field.name)
+            )
+
 
-class StaffSSOUserS3Ingest(DataFlowS3Ingest):
+class StaffSSOUserS3Ingest(CheckpointedIngestMixin, DataFlowS3Ingest):
     export_bucket: str = settings.DATA_FLOW_UPLOADS_BUCKET
     export_path: str = settings.DATA_FLOW_UPLOADS_BUCKET_PATH
     export_directory: str = settings.DATA_FLOW_USERS_DIRECTORY
+    # users whose records didn't change are left unsaved, so that the sync
+    # doesn't rewrite history for the whole population
+    history_rows_avoided: int = 0
+    # number of processes the feed is partitioned across, when more than one;
+    # only the sync_sso_users command forks them, never a web or Celery worker
+    workers: int = 1
+    # the checkpoint of each partition of the feed, when it's partitioned
+    partition_checkpoints: list[IngestCheckpoint]
+    # whether the feed is copied into a staging table and merged from it in SQL
+    copy: bool = settings.SSO_SYNC_COPY
+    counts: SyncCounts
+
+    def __init__(
+        self,
+        *args,
+        workers: Optional[int] = None,
+        copy: Optional[bool] = None,
+        **kwargs,
+    ):
+        self.counts = SyncCounts()
+        self.partition_checkpoints = []
+        if workers is not None:
+            self.workers = workers
+        if copy is not None:
+            self.copy = copy
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def for_partition(cls, chunk_size: int) -> "StaffSSOUserS3Ingest":
+        """
+        An ingest for a worker to process a partition of the feed with, that
+        doesn't run the S3 workflow of __init__
+        """
+        ingest = cls.__new__(cls)
+        ingest.counts = SyncCounts()
+        ingest.partition_checkpoints = []
+        ingest.chunk_size = chunk_size
+        return ingest
 
     def process_all(self):
+        self.history_rows_avoided = 0
+        lines: Iterable[str] = self._get_data_to_ingest() or []
+        if self.copy:
+            self.merge_all(lines=lines)
+        else:
+            if self.workers > 1:
+                imported_pks = self.process_partitions(lines=lines)
+            else:
+                imported_pks = self.process_checkpointed(lines=lines)
+            self.delete_unimported_profiles(imported_pks=imported_pks)
+            self.finish_checkpoint()
+        logger.info(
+            f"DataFlow S3 {self.__class__}: Created {self.counts.created}, changed "
+            f"{self.counts.changed}, skipped {self.counts.skipped} unchanged and "
+            f"deleted {self.counts.deleted} users"
+        )
+        logger.info(
+            f"DataFlow S3 {self.__class__}: Avoided {self.history_rows_avoided} "
+            "history rows for unchanged users"
+        )
+
+    def merge_all(self, lines: Iterable[str]) -> None:
+        """
+        Copy the feed into a staging table and merge every user from it with
+        set-based SQL, in one transaction, then delete the users missing from it.
+        Nothing is checkpointed: a run that dies commits none of the feed, and
+        the next one merges all of it.
+        """
+        result = sso_merge.merge_feed(lines=lines)
+        self.counts.created += len(result.created)
+        self.counts.changed += len(result.changed)
+        self.counts.skipped += len(result.skipped)
+        self.delete_users(ids=result.missing)
+
+    def process_partitions(self, lines: Iterable[str]) -> list[str]:
+        """
+        Split the feed by a hash of the users' IDs into a partition per worker,
+        and process the partitions in parallel in a pool of processes, each
+        with its own DB connection. Deleting the users missing from the feed is
+        left to the caller, once every partition is done. Each partition is
+        checkpointed as process_checkpointed would, by partition and number of
+        workers, so that a run that dies is resumed by the next run over the
+        same S3 object with as many workers. Mustn't be run in a transaction.
+        Returns the IDs of the users processed.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [
+                os.path.join(directory, f"{partition}.jsonl")
+                for partition in range(self.workers)
+            ]
+            files = [open(path, "w") for path in paths]
+            try:
+                for line in lines:
+                    files[self.get_partition(line=line)].write(line.rstrip("\n") + "\n")
+            finally:
+                for file in files:
+                    file.close()
+
+            if self.ingest_file is not None:
+                self.partition_checkpoints = [
+                    checkpoints.start(
+                        importer=f"{self.get_importer_name()}:{partition}/{self.workers}",
+                        source=self.ingest_file,
+                    )
+                    for partition in range(self.workers)
+                ]
+
+            # the workers are forked, so mustn't inherit this process' connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+            ) as pool:
+                results = list(
+                    pool.map(
+                        process_partition,
+                        paths,
+                        repeat(self.chunk_size),
+                        self.partition_checkpoints or repeat(None),
+                    )
+                )
+
         imported_pks = []
-        for item in self._get_data_to_ingest():
-            created_updated_pk = self.process_row(line=item)
-            imported_pks.append(created_updated_pk)
-        self.delete_unimported_profiles(imported_pks=imported_pks)
+        for ids, counts, history_rows_avoided in results:
+            imported_pks += ids
+            self.counts.add(counts)
+            self.history_rows_avoided += history_rows_avoided
+        return imported_pks
 
-    def process_object(self, obj, **kwargs):
+    def finish_checkpoint(self) -> None:
+        super().finish_checkpoint()
+        for checkpoint in self.partition_checkpoints:
+            checkpoints.finish(checkpoint=checkpoint)
+        self.partition_checkpoints = []
+
+    def get_partition(self, line: str) -> int:
+        """
+        The partition of a line of the feed, by a hash of the user's ID that is
+        stable across processes
+        """
+        return zlib.crc32(self.get_key(line=line).encode()) % self.workers
+
+    def process_chunk(self, lines: Iterable[str]) -> list[str]:
+        """
+        Create or update the users of a chunk of the feed together, in one
+        transaction and a fixed number of queries however many users it has.
+        Users whose record hashes the same as when they were last synced are
+        skipped before anything else is queried. Returns their IDs.
+        """
+        identities = {}
+        for line in lines:
+            identity = self.get_identity(obj=json.loads(s=line)["object"])
+            # a user listed twice is written once, as last listed
+            identities[identity["id"]] = identity
+
+        source_hashes = {
+            id: self.get_source_hash(identity=identity)
+            for id, identity in identities.items()
+        }
+        unchanged_ids = get_unchanged_identity_ids(source_hashes=source_hashes)
+        changed = {
+            id: identity
+            for id, identity in identities.items()
+            if id not in unchanged_ids
+        }
+        self.counts.skipped += len(unchanged_ids)
+        if not changed:
+            return list(identities)
+
+        existing_ids = get_existing_identity_ids(ids=list(changed))
+        self.history_rows_avoided += bulk_apply_identity_changes(
+            creates=[
+                identity for id, identity in changed.items() if id not in existing_ids
+            ],
+            updates=[
+                identity for id, identity in changed.items() if id in existing_ids
+            ],
+            deletes=[],
+        )
+        record_identity_source_hashes(
+            source_hashes={id: source_hashes[id] for id in changed}
+        )
+        self.counts.created += len(changed) - len(existing_ids)
+        self.counts.changed += len(existing_ids)
+        logger.info(
+            f"DataFlow S3 {self.__class__}: Created {len(changed) - len(existing_ids)},"
+            f" updated {len(existing_ids)} and skipped {len(unchanged_ids)} users"
+        )
+        return list(identities)
+
+    def get_key(self, line: str) -> str:
+        return json.loads(s=line)["object"]["dit:StaffSSO:User:emailUserId"]
+
+    def get_source_hash(self, identity: dict) -> str:
+        """
+        A stable hash of a user of the feed, that changes with any of the
+        fields synced from it
+        """
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+    def get_identity(self, obj: dict) -> dict:
+        """
+        The core.services.create_identity arguments for a user of the feed
+        """
         sso_email_id = obj["dit:StaffSSO:User:emailUserId"]
-        (
-            primary_email,
-            contact_email,
-            all_emails,
-        ) = self.extract_emails_from_sso_user(obj=obj)
+        primary_email, contact_email, all_emails = self.extract_emails_from_sso_user(
+            obj=obj
+        )
+        return {
+            "id": sso_email_id,
+            "first_name": obj["dit:firstName"],
+            "last_name": obj["dit:lastName"],
+            "all_emails": all_emails,
+            "is_active": obj["dit:StaffSSO:User:status"] == "active",
+            "primary_email": primary_email,
+            "contact_email": contact_email,
+        }
+
+    def process_object(self, obj, **kwargs):
+        """
+        Create or update a single user of the feed
+        """
+        identity = self.get_identity(obj=obj)
+        sso_email_id = identity.pop("id")
 
         try:
             profile: Profile = get_identity_by_id(
                 id=sso_email_id, include_inactive=True
             )
         except Profile.DoesNotExist:
-            create_identity(
-                id=sso_email_id,
-                first_name=obj["dit:firstName"],
-                last_name=obj["dit:lastName"],
-                all_emails=all_emails,
-                is_active=obj["dit:StaffSSO:User:status"] == "active",
-                primary_email=primary_email,
-                contact_email=contact_email,
-            )
+            create_identity(id=sso_email_id, **identity)
             logger.info(f"DataFlow S3 {self.__class__}: Created user {sso_email_id}")
         else:
-            update_identity(
-                profile=profile,
-                first_name=obj["dit:firstName"],
-                last_name=obj["dit:lastName"],
-                all_emails=all_emails,
-                is_active=obj["dit:StaffSSO:User:status"] == "active",
-                primary_email=primary_email,
-                contact_email=contact_email,
-            )
+            self.history_rows_avoided += update_identity(profile=profile, **identity)
             logger.info(f"DataFlow S3 {self.__class__}: Updated user {sso_email_id}")
         return sso_email_id
 
@@ -110,14 +559,53 @@ class StaffSSOUserS3Ingest(DataFlowS3Ingest):
         all_emails = obj["dit:emailAddress"] + [contact_email]
         return primary_email, contact_email, all_emails
 
-    def delete_unimported_profiles(self, imported_pks):
-        user_ids_to_delete = User.objects.exclude(
-            sso_email_id__in=imported_pks
-        ).values_list("sso_email_id", flat=True)
+    def delete_unimported_profiles(self, imported_pks: Iterable[str]) -> None:
+        """
+        Delete the users missing from the feed, found with an anti-join against
+        a staging table of the imported IDs, a chunk at a time. Aborts rather
+        than delete more than SSO_SYNC_MAX_DELETION_PERCENT of the users, or
+        before the whole feed has been processed.
+        """
+        self.check_scan_completed()
+        self.delete_users(ids=get_identity_ids_missing_from(ids=imported_pks))
+
+    def delete_users(self, ids: list[str]) -> None:
+        """
+        Delete the given users set-based, a chunk at a time. Aborts rather than
+        delete more than SSO_SYNC_MAX_DELETION_PERCENT of the users.
+        """
+        if not ids:
+            return
+
+        user_count = get_identity_count()
+        max_percent = settings.SSO_SYNC_MAX_DELETION_PERCENT
+        if len(ids) > user_count * max_percent / 100:
+            raise SyncDeletionLimitExceeded(
+                f"Syncing would delete {len(ids)} of {user_count} users, "
+                f"more than {max_percent}%"
+            )
 
-        for sso_email_id in user_ids_to_delete:
-            profile = get_identity_by_id(id=sso_email_id, include_inactive=True)
-            delete_identity(profile=profile)
+        for chunk in batched(ids, self.chunk_size):
+            bulk_apply_identity_changes(creates=[], updates=[], deletes=list(chunk))
+        self.counts.deleted += len(ids)
+
+
+def process_partition(
+    path: str, chunk_size: int, checkpoint: Optional[IngestCheckpoint] = None
+) -> tuple[list[str], SyncCounts, int]:
+    """
+    Create or update the users of a partition of the Staff SSO user feed, a
+    chunk at a time, each in a transaction moving the partition's checkpoint
+    on past it, in a worker process. Returns their IDs and what was done.
+    """
+    ingest = StaffSSOUserS3Ingest.for_partition(chunk_size=chunk_size)
+    ingest.checkpoint = checkpoint
+    try:
+        with open(path) as lines:
+            ids = ingest.process_from_checkpoint(lines=lines)
+    finally:
+        connections.close_all()
+    return ids, ingest.counts, ingest.history_rows_avoided
 
 
 class CountriesS3Ingest(DataFlowS3IngestToModel):
@@ -137,12 +625,8 @@ class CountriesS3Ingest(DataFlowS3IngestToModel):
         "overseas_region": "overseas_region",
     }
 
-    def process_row(self, line: str) -> PrimaryKey:
-        """
-        Takes a row of the file, retrieves a dict of the instance it refers to and hands that off for processing
-        """
-        obj: dict = json.loads(s=line)  # Countries does not wrap content in 'object'
-        return self._process_object_workflow(obj=obj)
+    def get_object(self, line: str) -> dict:
+        return json.loads(s=line)  # Countries does not wrap content in 'object'
 
 
 class UkStaffLocationsS3Ingest(DataFlowS3IngestToModel):
@@ -160,14 +644,8 @@ class UkStaffLocationsS3Ingest(DataFlowS3IngestToModel):
         "building_name": "building_name",
     }
 
-    def process_row(self, line: str) -> PrimaryKey:
-        """
-        Takes a row of the file, retrieves a dict of the instance it refers to and hands that off for processing
-        """
-        obj: dict = json.loads(
-            s=line
-        )  # UkStaffLocation does not wrap content in 'object'
-        return self._process_object_workflow(obj=obj)
+    def get_object(self, line: str) -> dict:
+        return json.loads(s=line)  # UkStaffLocation does not wrap content in 'object'
 
 
 class SectorListS3Ingest(DataFlowS3IngestToModel):
@@ -189,9 +667,5 @@ class SectorListS3Ingest(DataFlowS3IngestToModel):
         "end_date": "field_07",
     }
 
-    def process_row(self, line: str) -> PrimaryKey:
-        """
-        Takes a row of the file, retrieves a dict of the instance it refers to and hands that off for processing
-        """
-        obj: dict = json.loads(s=line)  # SectorList does not wrap content in 'object'
-        return self._process_object_workflow(obj=obj)
+    def get_object(self, line: str) -> dict:
+        return json.loads(s=line)  # SectorList does not wrap content in 'object'
@@ -0,0 +1,122 @@
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+
+
+BASELINE_PATH = Path(__file__).parent / "api_budgets_baseline.json"
+# Set to rewrite the stored baseline with this run's measurements
+UPDATE_BASELINE_ENV = "UPDATE_API_BUDGETS_BASELINE"
+
+
+@dataclass
+class Budget:
+    max_queries: int
+    max_ms: float
+
+
+@dataclass
+class Measurement:
+    name: str
+    queries: int
+    ms: float
+    peak_kib: float
+
+
+# Filled in by the budget tests, reported by the e2e conftest
+measurements: dict[str, Measurement] = {}
+
+
+def measure(name: str, call: Callable[[], HttpResponse], status: int) -> Measurement:
+    """
+    Measure a request to an endpoint, after a first request to warm up imports
+    and lazily built state. Each measured request starts from an empty cache,
+    so the database path is the one measured. Allocations are traced on a
+    separate request, as tracing slows down the one that is timed.
+    """
+    assert call().status_code == status
+
+    cache.clear()
+    with CaptureQueriesContext(connection) as captured:
+        start = time.perf_counter()
+        response = call()
+        ms = (time.perf_counter() - start) * 1000
+    # counted now, as the next request resets the connection's query log
+    queries = len(captured)
+    assert response.status_code == status
+
+    cache.clear()
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    measurement = Measurement(
+        name=name, queries=queries, ms=round(ms, 2), peak_kib=round(peak / 1024, 1)
+    )
+    measurements[name] = measurement
+    return measurement
+
+
+def load_baseline() -> dict[str, dict]:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def save_baseline() -> None:
+    baseline = load_baseline()
+    baseline.update(
+        {
+            name: {k: v for k, v in asdict(measurement).items() if k != "name"}
+            for name, measurement in measurements.items()
+        }
+    )
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=4, sort_keys=True) + "\n")
+
+
+def should_update_baseline() -> bool:
+    return bool(os.environ.get(UPDATE_BASELINE_ENV))
+
+
+def format_change(value: float, baseline: float | None) -> str:
+    if baseline is None:
+        return f"{value:g} (-)"
+    return f"{value:g} ({value - baseline:+g})"
+
+
+def format_table() -> list[str]:
+    """
+    The measurements of this run against the stored baseline, as lines of a
+    table
+    """
+    baseline = load_baseline()
+    rows = [("endpoint", "queries", "ms", "peak KiB")]
+    for name, measurement in sorted(measurements.items()):
+        stored = baseline.get(name, {})
+        rows.append(
+            (
+                name,
+                format_change(measurement.queries, stored.get("queries")),
+                format_change(measurement.ms, stored.get("ms")),
+                format_change(measurement.peak_kib, stored.get("peak_kib")),
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return [
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    ]
@@ -7,6 +7,8 @@ from django.contrib.auth.models import AbstractUser
 from django.test.client import Client
 from factory.faker import faker
 
+from e2e_tests import api_budgets
+
 
 @dataclass
 class State:
@@ -65,3 +67,14 @@ def scim_user_factory():
         )
 
     return _factory
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not api_budgets.measurements:
+        return
+    terminalreporter.section("API budgets (change against the stored baseline)")
+    for line in api_budgets.format_table():
+        terminalreporter.write_line(line)
+    if api_budgets.should_update_baseline():
+        api_budgets.save_baseline()
+        terminalreporter.write_line(f"Baseline written to {api_budgets.BASELINE_PATH}")
@@ -0,0 +1,278 @@
+import json
+from dataclasses import dataclass
+
+import pytest
+from django.test.client import Client
+from django.urls import reverse
+
+from core import services as core_services
+from e2e_tests.api_budgets import Budget, measure
+from profiles import services as profile_services
+from profiles.models.combined import Profile
+from profiles.models.generic import Country
+from profiles.models.peoplefinder import (
+    PeopleFinderTeam,
+    PeopleFinderTeamLeadersOrdering,
+    PeopleFinderTeamType,
+)
+
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.e2e,
+]
+
+
+# Number of identities, and teams per level of the hierarchy, the endpoints are
+# measured against
+IDENTITIES = 200
+TEAMS_PER_LEVEL = 5
+TEAM_LEVELS = 4
+COUNTRIES = 50
+
+# Query budgets are exact enough to catch a query per row (N+1) creeping in at
+# the volumes above; time budgets are generous on purpose, to catch
+# regressions rather than a few milliseconds of drift between machines.
+BUDGETS = {
+    "api:get_user": Budget(max_queries=2, max_ms=100),
+    "sso-profile:get_user": Budget(max_queries=2, max_ms=100),
+    "sso-profile:get_users": Budget(max_queries=3, max_ms=300),
+    "sso-profile:get_user_by_email": Budget(max_queries=2, max_ms=100),
+    "sso-profile:get_users_by_email": Budget(max_queries=3, max_ms=300),
+    "sso-profile:get_cache_stats": Budget(max_queries=0, max_ms=100),
+    "scim:list_users": Budget(max_queries=3, max_ms=300),
+    "scim:list_users (filtered)": Budget(max_queries=3, max_ms=200),
+    "scim:get_user": Budget(max_queries=2, max_ms=100),
+    "scim:create_user": Budget(max_queries=50, max_ms=500),
+    "scim:update_user": Budget(max_queries=40, max_ms=500),
+    "scim:patch_user": Budget(max_queries=30, max_ms=500),
+    "scim:delete_user": Budget(max_queries=40, max_ms=500),
+    "scim:bulk": Budget(max_queries=60, max_ms=3000),
+    "people-finder:get_profile": Budget(max_queries=6, max_ms=150),
+    "people-finder:get_hierarcy_of_all_teams": Budget(max_queries=3, max_ms=300),
+    "people-finder:get_team": Budget(max_queries=4, max_ms=100),
+    "people-finder:get_countries": Budget(max_queries=1, max_ms=100),
+    "people-finder:get_uk_staff_locations": Budget(max_queries=1, max_ms=100),
+    "people-finder:get_remote_working": Budget(max_queries=0, max_ms=100),
+    "people-finder:get_workdays": Budget(max_queries=0, max_ms=100),
+    "people-finder:get_learning_interests": Budget(max_queries=0, max_ms=100),
+    "people-finder:get_professions": Budget(max_queries=0, max_ms=100),
+    "people-finder:get_grades": Budget(max_queries=0, max_ms=100),
+    "people-finder:get_key_skills": Budget(max_queries=0, max_ms=100),
+    "people-finder:get_additional_roles": Budget(max_queries=0, max_ms=100),
+    "core:photo": Budget(max_queries=4, max_ms=100),
+}
+
+
+@dataclass
+class Volumes:
+    ids: list[str]
+    emails: list[str]
+    team: PeopleFinderTeam
+
+
+@pytest.fixture
+def volumes(peoplefinder_team) -> Volumes:
+    profiles = core_services.bulk_create_identities(
+        identities=[
+            {
+                "id": f"user{i}@id.test",
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "all_emails": [f"user{i}@work.test", f"user{i}@contact.test"],
+                "primary_email": f"user{i}@work.test",
+                "contact_email": f"user{i}@contact.test",
+                "is_active": True,
+            }
+            for i in range(IDENTITIES)
+        ]
+    )
+    profile_services.rebuild_minimal_documents()
+
+    parents = [peoplefinder_team]
+    for level in range(TEAM_LEVELS):
+        parents = [
+            profile_services.create_peoplefinder_team(
+                slug=f"team-{level}-{i}",
+                name=f"Team {level} {i}",
+                parent=parents[0],
+                leaders_ordering=PeopleFinderTeamLeadersOrdering("custom"),
+                team_type=PeopleFinderTeamType("portfolio"),
+            )
+            for i in range(TEAMS_PER_LEVEL)
+        ]
+
+    Country.objects.bulk_create(
+        [
+            Country(
+                reference_id=f"CTHMTC{i:05}",
+                name=f"Country {i}",
+                type="country",
+                iso_1_code=f"A{i:02}",
+                iso_2_code=f"{chr(65 + i // 26)}{chr(65 + i % 26)}",
+                iso_3_code=f"B{i:02}",
+            )
+            for i in range(COUNTRIES)
+        ]
+    )
+    return Volumes(
+        ids=[profile.sso_email_id for profile in profiles],
+        emails=[f"user{i}@contact.test" for i in range(IDENTITIES)],
+        team=parents[0],
+    )
+
+
+def assert_within_budget(name: str, call, status: int = 200):
+    measurement = measure(name=name, call=call, status=status)
+    budget = BUDGETS[name]
+    assert measurement.queries <= budget.max_queries, measurement
+    assert measurement.ms <= budget.max_ms, measurement
+
+
+def post_json(client: Client, url: str, data: dict, method: str = "post"):
+    return getattr(client, method)(
+        url, data=json.dumps(data), content_type="application/json"
+    )
+
+
+def test_main_api_budgets(volumes):
+    client = Client()
+    url = reverse("api:get_user", args=(volumes.ids[0],))
+    assert_within_budget("api:get_user", lambda: client.get(url))
+
+
+def test_sso_profile_api_budgets(volumes):
+    client = Client()
+    assert_within_budget(
+        "sso-profile:get_user",
+        lambda: client.get(reverse("sso-profile:get_user", args=(volumes.ids[0],))),
+    )
+    assert_within_budget(
+        "sso-profile:get_users",
+        lambda: post_json(
+            client, reverse("sso-profile:get_users"), {"ids": volumes.ids}
+        ),
+    )
+    assert_within_budget(
+        "sso-profile:get_user_by_email",
+        lambda: client.get(
+            reverse("sso-profile:get_user_by_email", args=(volumes.emails[0],))
+        ),
+    )
+    assert_within_budget(
+        "sso-profile:get_users_by_email",
+        lambda: post_json(
+            client,
+            reverse("sso-profile:get_users_by_email"),
+            {"emails": volumes.emails},
+        ),
+    )
+    assert_within_budget(
+        "sso-profile:get_cache_stats",
+        lambda: client.get(reverse("sso-profile:get_cache_stats")),
+    )
+
+
+def test_scim_api_budgets(volumes, scim_user_factory):
+    client = Client()
+    list_url = reverse("scim:list_users")
+    assert_within_budget(
+        "scim:list_users", lambda: client.get(list_url, {"count": IDENTITIES})
+    )
+    assert_within_budget(
+        "scim:list_users (filtered)",
+        lambda: client.get(
+            list_url, {"filter": f'emails.value eq "{volumes.emails[0]}"'}
+        ),
+    )
+    id = volumes.ids[0]
+    user_url = reverse("scim:get_user", kwargs={"id": id})
+    assert_within_budget("scim:get_user", lambda: client.get(user_url))
+    assert_within_budget(
+        "scim:create_user",
+        lambda: client.post(
+            reverse("scim:create_user"),
+            data=scim_user_factory(),
+            content_type="application/json",
+        ),
+        status=201,
+    )
+    assert_within_budget(
+        "scim:update_user",
+        lambda: client.put(
+            user_url, data=scim_user_factory(id=id), content_type="application/json"
+        ),
+    )
+    assert_within_budget(
+        "scim:patch_user",
+        lambda: post_json(
+            client,
+            user_url,
+            {"Operations": [{"op": "replace", "path": "active", "value": True}]},
+            method="patch",
+        ),
+    )
+    # each request deletes another user
+    to_delete = iter(volumes.ids[1:])
+    assert_within_budget(
+        "scim:delete_user",
+        lambda: client.delete(
+            reverse("scim:delete_user", kwargs={"id": next(to_delete)})
+        ),
+        status=204,
+    )
+    assert_within_budget(
+        "scim:bulk",
+        lambda: post_json(
+            client,
+            reverse("scim:bulk"),
+            {
+                "Operations": [
+                    {"method": "POST", "path": "/Users", "data": data}
+                    for data in (
+                        json.loads(scim_user_factory()) for _ in range(IDENTITIES)
+                    )
+                ]
+            },
+        ),
+    )
+    assert Profile.objects.count() >= IDENTITIES
+
+
+def test_peoplefinder_api_budgets(volumes, peoplefinder_profile):
+    client = Client()
+    assert_within_budget(
+        "people-finder:get_profile",
+        lambda: client.get(
+            reverse("people-finder:get_profile", args=(str(peoplefinder_profile.slug),))
+        ),
+    )
+    assert_within_budget(
+        "people-finder:get_hierarcy_of_all_teams",
+        lambda: client.get(reverse("people-finder:get_hierarcy_of_all_teams")),
+    )
+    assert_within_budget(
+        "people-finder:get_team",
+        lambda: client.get(
+            reverse("people-finder:get_team", args=(volumes.team.slug,))
+        ),
+    )
+    for name in (
+        "people-finder:get_countries",
+        "people-finder:get_uk_staff_locations",
+        "people-finder:get_remote_working",
+        "people-finder:get_workdays",
+        "people-finder:get_learning_interests",
+        "people-finder:get_professions",
+        "people-finder:get_grades",
+        "people-finder:get_key_skills",
+        "people-finder:get_additional_roles",
+    ):
+        assert_within_budget(name, lambda name=name: client.get(reverse(name)))
+
+
+def test_photo_view_budgets(peoplefinder_profile):
+    client = Client()
+    client.force_login(peoplefinder_profile.user)
+    url = reverse("core:photo", args=(str(peoplefinder_profile.slug),))
+    assert_within_budget("core:photo", lambda: client.get(url))
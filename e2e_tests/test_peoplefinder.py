@@ -71,6 +71,25 @@ def test_get_profile(peoplefinder_profile):
     assert response.status_code == 404
 
 
+def test_get_profile_not_modified(peoplefinder_profile):
+    client = Client()
+    url = reverse("people-finder:get_profile", args=(str(peoplefinder_profile.slug),))
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    peoplefinder_profile.first_name = "James"
+    peoplefinder_profile.save()
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["first_name"] == "James"
+
+
 def test_create(combined_profile):
     client = Client()
     url = reverse("people-finder:create_profile")
@@ -290,6 +309,23 @@ def test_get_team(peoplefinder_team):
     }
 
 
+def test_get_team_not_modified(peoplefinder_team):
+    url = reverse("people-finder:get_team", args=[peoplefinder_team.slug])
+    client = Client()
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    peoplefinder_team.save()
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
 def test_create_team(peoplefinder_team):
     url = reverse("people-finder:create_team")
     client = Client()
@@ -0,0 +1,68 @@
+import json
+import time
+
+import pytest
+from data_flow_s3_import.tests.utils import S3BotoResource
+
+from core.utils import SectorListS3Ingest
+from profiles.models.generic import SectorList
+
+
+pytestmark = [pytest.mark.django_db, pytest.mark.e2e]
+
+
+# Number of rows in the sector list ingested by each run
+ROWS = 10_000
+
+
+def sector_list(prefix: str, name: str) -> list[str]:
+    return [
+        json.dumps(
+            {
+                "field_01": f"{prefix}{i}",
+                "full_sector_name": f"{name} {i}",
+                "sector_cluster__april_2023": "Cluster",
+                "field_03": "Old cluster",
+                "field_04": f"{name} {i}",
+                "field_05": None,
+                "field_02": None,
+                "field_06": "2023-04-01",
+                "field_07": None,
+            }
+        )
+        for i in range(ROWS)
+    ]
+
+
+def test_sector_list_ingest_throughput(mocker, capsys):
+    """
+    Rows ingested a second by the per-row and bulk paths, creating a sector
+    list and then updating every row of it. Isn't asserted on, as it depends
+    on the machine and DB.
+    """
+    mocker.patch(
+        "core.utils.SectorListS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    throughput = {}
+    for bulk in (False, True):
+        dfs = SectorListS3Ingest(
+            s3_resource=S3BotoResource(), bucket_name="bucket_name", bulk=bulk
+        )
+        prefix = "bulk" if bulk else "row"
+        for run, name in (("create", "Sector"), ("update", "Renamed sector")):
+            lines = sector_list(prefix=prefix, name=name)
+
+            start = time.perf_counter()
+            identifiers = dfs.process_checkpointed(lines=lines)
+            throughput[f"{prefix} {run}"] = ROWS / (time.perf_counter() - start)
+
+            assert len(identifiers) == ROWS
+    assert SectorList.objects.filter(sector_name__startswith="Renamed").count() == (
+        ROWS * 2
+    )
+
+    with capsys.disabled():
+        print(f"\nSector list ingest of {ROWS:,} rows, rows a second:")
+        for run, rows_a_second in throughput.items():
+            print(f"  {run}: {rows_a_second:,.0f}")
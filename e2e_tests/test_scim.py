@@ -1,11 +1,15 @@
 import json
 
 import pytest
+from django.db import connection
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from core import services
+from core.models import StaffSSOSyncState
 from profiles.models.combined import Profile
+from user.models import User
 
 
 pytestmark = [
@@ -69,3 +73,269 @@ def test_create(scim_user_factory):
         content_type="application/json",
     )
     assert response.status_code == 400
+
+
+def test_list_users(combined_profile):
+    for i in range(3):
+        services.create_identity(
+            id=f"user{i}@id.example.com",
+            first_name="Jane",
+            last_name=f"Doe {i}",
+            all_emails=[f"user{i}@example.com"],
+            is_active=i != 2,
+        )
+    client = Client()
+    url = reverse("scim:list_users")
+
+    # walk every page with the cursor
+    ids = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(url, {"count": 2, "cursor": cursor})
+        assert response.status_code == 200
+        data = response.json()
+        assert "totalResults" not in data
+        assert "startIndex" not in data
+        ids += [user["id"] for user in data["Resources"]]
+        cursor = data.get("nextCursor")
+    assert ids == sorted(Profile.objects.values_list("sso_email_id", flat=True))
+
+    # or by index
+    response = client.get(url, {"count": 2, "startIndex": 3})
+    data = response.json()
+    assert data["totalResults"] == 4
+    assert data["startIndex"] == 3
+    assert [user["id"] for user in data["Resources"]] == ids[2:]
+
+    response = client.get(
+        url, {"filter": 'emails.value eq "USER1@example.com" and active eq true'}
+    )
+    data = response.json()
+    assert data["totalResults"] == 1
+    assert data["Resources"][0]["id"] == "user1@id.example.com"
+
+    response = client.get(url, {"filter": "active eq false"})
+    assert [user["id"] for user in response.json()["Resources"]] == [
+        "user2@id.example.com"
+    ]
+
+    response = client.get(url, {"filter": 'name.givenName eq "Jane"'})
+    assert response.status_code == 400
+    assert response.json()["scimType"] == "invalidFilter"
+
+
+def bulk_request(operations: list[dict], **kwargs) -> str:
+    return json.dumps(
+        {
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"],
+            "Operations": operations,
+            **kwargs,
+        }
+    )
+
+
+def test_bulk(combined_profile, scim_user_factory):
+    client = Client()
+    url = reverse("scim:bulk")
+    new_users = [json.loads(scim_user_factory()) for _ in range(3)]
+    updated_user = json.loads(scim_user_factory(id=combined_profile.sso_email_id))
+    updated_user["active"] = False
+
+    response = client.post(
+        url,
+        bulk_request(
+            [
+                *[
+                    {"method": "POST", "bulkId": str(i), "path": "/Users", "data": user}
+                    for i, user in enumerate(new_users)
+                ],
+                {
+                    "method": "PUT",
+                    "path": f"/Users/{combined_profile.sso_email_id}",
+                    "data": updated_user,
+                },
+                {"method": "DELETE", "path": "/Users/unknown@example.com"},
+            ]
+        ),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    results = response.json()["Operations"]
+    assert [result["status"] for result in results] == [
+        "201",
+        "201",
+        "201",
+        "200",
+        "404",
+    ]
+    assert results[0]["bulkId"] == "0"
+    assert results[0]["location"].endswith(f"/Users/{new_users[0]['externalId']}")
+    for user in new_users:
+        profile = services.get_identity_by_id(user["externalId"])
+        assert profile.first_name == user["name"]["givenName"]
+        assert sorted(profile.emails) == sorted(e["value"] for e in user["emails"])
+    combined_profile.refresh_from_db()
+    assert not combined_profile.is_active
+    assert combined_profile.first_name == updated_user["name"]["givenName"]
+
+    response = client.post(
+        url,
+        bulk_request(
+            [
+                {"method": "DELETE", "path": f"/Users/{user['externalId']}"}
+                for user in new_users
+            ]
+        ),
+        content_type="application/json",
+    )
+    assert [result["status"] for result in response.json()["Operations"]] == [
+        "204",
+        "204",
+        "204",
+    ]
+    assert not Profile.objects.filter(
+        sso_email_id__in=[user["externalId"] for user in new_users]
+    ).exists()
+
+
+def test_bulk_fail_on_errors(combined_profile, scim_user_factory):
+    client = Client()
+    new_user = json.loads(scim_user_factory())
+
+    response = client.post(
+        reverse("scim:bulk"),
+        bulk_request(
+            [
+                {"method": "POST", "path": "/Users", "data": new_user},
+                {
+                    "method": "POST",
+                    "path": "/Users",
+                    "data": json.loads(
+                        scim_user_factory(id=combined_profile.sso_email_id)
+                    ),
+                },
+            ],
+            failOnErrors=1,
+        ),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    results = response.json()["Operations"]
+    assert len(results) == 1
+    assert results[0]["status"] == "409"
+    assert results[0]["response"]["scimType"] == "uniqueness"
+    assert not Profile.objects.filter(sso_email_id=new_user["externalId"]).exists()
+
+
+def test_bulk_queries_do_not_grow_with_operations(scim_user_factory):
+    client = Client()
+
+    def count_queries(users: int) -> int:
+        operations = [
+            {
+                "method": "POST",
+                "path": "/Users",
+                "data": json.loads(scim_user_factory()),
+            }
+            for _ in range(users)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                reverse("scim:bulk"),
+                bulk_request(operations),
+                content_type="application/json",
+            )
+        assert response.status_code == 200
+        return len(queries)
+
+    count_queries(1)  # warm up the content type cache
+    assert count_queries(50) == count_queries(5)
+
+
+def patch_request(operations: list[dict]) -> str:
+    return json.dumps(
+        {
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:PatchOp"],
+            "Operations": operations,
+        }
+    )
+
+
+def test_patch_active_only_archives(mocker, combined_profile):
+    client = Client()
+    url = reverse("scim:patch_user", kwargs={"id": combined_profile.sso_email_id})
+    mock_update = mocker.patch("profiles.services.staff_sso.update")
+
+    response = client.patch(
+        url,
+        patch_request([{"op": "Replace", "path": "active", "value": "False"}]),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["active"] is False
+    combined_profile.refresh_from_db()
+    assert not combined_profile.is_active
+    assert not User.objects.get(pk=combined_profile.sso_email_id).is_active
+    mock_update.assert_not_called()
+
+
+def test_patch(combined_profile):
+    client = Client()
+    url = reverse("scim:patch_user", kwargs={"id": combined_profile.sso_email_id})
+
+    response = client.patch(
+        url,
+        patch_request(
+            [
+                {"op": "replace", "value": {"name": {"givenName": "Johnny"}}},
+                {
+                    "op": "add",
+                    "path": "emails",
+                    "value": [{"value": "email3@email.com", "type": "contact"}],
+                },
+            ]
+        ),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    combined_profile.refresh_from_db()
+    assert combined_profile.first_name == "Johnny"
+    assert combined_profile.last_name == "Doe"
+    assert sorted(combined_profile.emails) == [
+        "email1@email.com",
+        "email2@email.com",
+        "email3@email.com",
+    ]
+    assert combined_profile.primary_email == "email2@email.com"
+    assert combined_profile.contact_email == "email3@email.com"
+
+    response = client.patch(
+        url,
+        patch_request([{"op": "remove", "path": "name.familyName"}]),
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    assert response.json()["scimType"] == "mutability"
+
+
+def test_writes_forget_the_sync_state(combined_profile):
+    client = Client()
+    services.record_identity_source_hashes(
+        source_hashes={combined_profile.sso_email_id: "__hash__"}
+    )
+
+    response = client.patch(
+        reverse("scim:patch_user", kwargs={"id": combined_profile.sso_email_id}),
+        patch_request([{"op": "replace", "value": {"name": {"givenName": "John"}}}]),
+        content_type="application/json",
+    )
+
+    # the next sync writes the user, even from a record that hashes the same
+    assert response.status_code == 200
+    assert not StaffSSOSyncState.objects.filter(
+        user_id=combined_profile.sso_email_id
+    ).exists()
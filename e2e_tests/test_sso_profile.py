@@ -1,4 +1,122 @@
+import json
+
 import pytest
+from django.test.client import Client
+from django.urls import reverse
+
+from profiles.services import combined as profile_services
+
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.e2e,
+]
+
+
+def test_get_user(combined_profile):
+    client = Client()
+    url = reverse("sso-profile:get_user", args=(combined_profile.sso_email_id,))
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": combined_profile.sso_email_id,
+        "first_name": "John",
+        "last_name": "Doe",
+        "primary_email": "email2@email.com",
+        "contact_email": "email@email.com",
+        "emails": ["email1@email.com", "email2@email.com"],
+    }
+
+    response = client.get(reverse("sso-profile:get_user", args=("missing",)))
+    assert response.status_code == 404
+
+
+def test_get_user_not_modified(combined_profile):
+    client = Client()
+    url = reverse("sso-profile:get_user", args=(combined_profile.sso_email_id,))
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    profile_services.update(
+        combined_profile,
+        first_name="Tom",
+        last_name=None,
+        all_emails=["email1@email.com", "email2@email.com"],
+    )
+    profile_services.drop_minimal_cache(combined_profile.sso_email_id)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_get_users(combined_profile):
+    client = Client()
+    url = reverse("sso-profile:get_users")
+
+    response = client.post(
+        url,
+        data=json.dumps({"ids": [combined_profile.sso_email_id, "missing"]}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [user["id"] for user in data["results"]] == [combined_profile.sso_email_id]
+    assert data["inactive"] == []
+    assert data["missing"] == ["missing"]
+
+    response = client.post(
+        url,
+        data=json.dumps({"ids": [str(i) for i in range(501)]}),
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+
+
+def test_get_user_by_email(combined_profile):
+    profile_services.rebuild_minimal_documents()
+    client = Client()
+
+    response = client.get(
+        reverse("sso-profile:get_user_by_email", args=("Email1@Email.com",))
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == combined_profile.sso_email_id
+
+    response = client.get(
+        reverse("sso-profile:get_user_by_email", args=("missing@email.com",))
+    )
+    assert response.status_code == 404
+
+
+def test_get_users_by_email(combined_profile):
+    profile_services.rebuild_minimal_documents()
+    client = Client()
+    url = reverse("sso-profile:get_users_by_email")
+
+    response = client.post(
+        url,
+        data=json.dumps({"emails": ["EMAIL@email.com", "missing@email.com"]}),
+        content_type="application/json",
+    )
 
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"]["EMAIL@email.com"]["id"] == combined_profile.sso_email_id
+    assert data["missing"] == ["missing@email.com"]
 
-pytestmark = pytest.mark.e2e
+    response = client.post(
+        url,
+        data=json.dumps({"emails": [f"{i}@email.com" for i in range(501)]}),
+        content_type="application/json",
+    )
+    assert response.status_code == 400
@@ -0,0 +1,69 @@
+import json
+import time
+
+import pytest
+from data_flow_s3_import.tests.utils import S3BotoResource
+
+from core.utils import StaffSSOUserS3Ingest
+from profiles.models.combined import Profile
+
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True, serialized_rollback=True),
+    pytest.mark.e2e,
+]
+
+
+# Number of users in the feed synced by each run
+USERS = 2000
+WORKERS = [1, 2, 4, 8]
+
+
+def feed(prefix: str) -> list[str]:
+    return [
+        json.dumps(
+            {
+                "object": {
+                    "dit:StaffSSO:User:emailUserId": f"{prefix}{i}@id.test",
+                    "dit:StaffSSO:User:contactEmailAddress": f"{prefix}{i}@contact.test",
+                    "dit:StaffSSO:User:status": "active",
+                    "dit:firstName": f"First{i}",
+                    "dit:lastName": f"Last{i}",
+                    "dit:emailAddress": [f"{prefix}{i}@work.test"],
+                }
+            }
+        )
+        for i in range(USERS)
+    ]
+
+
+def test_partitioned_sync_throughput(mocker, capsys):
+    """
+    Users synced a second by the partitioned sync, for each number of workers.
+    Every run creates a population of new users, and isn't asserted on, as it
+    depends on the cores and DB of the machine.
+    """
+    mocker.patch(
+        "core.utils.StaffSSOUserS3Ingest._get_files_to_ingest",
+        return_value=None,
+    )
+    throughput = {}
+    for workers in WORKERS:
+        dfs = StaffSSOUserS3Ingest(
+            s3_resource=S3BotoResource(), bucket_name="bucket_name", workers=workers
+        )
+        dfs.chunk_size = 250
+        lines = feed(prefix=f"workers{workers}-user")
+
+        start = time.perf_counter()
+        imported_pks = dfs.process_partitions(lines=lines)
+        throughput[workers] = USERS / (time.perf_counter() - start)
+
+        assert len(imported_pks) == USERS
+        assert dfs.counts.created == USERS
+    assert Profile.objects.count() == USERS * len(WORKERS)
+
+    with capsys.disabled():
+        print("\nPartitioned SSO sync, users a second:")
+        for workers, users_a_second in throughput.items():
+            print(f"  {workers} worker(s): {users_a_second:,.0f}")
@@ -0,0 +1,176 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import redis
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def approximate_size(obj: Any) -> int:
+    """
+    Rough in-memory size in bytes of a cached value; good enough for sizing a
+    cache, not for accounting.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += approximate_size(key) + approximate_size(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            size += approximate_size(item)
+    return size
+
+
+class LocalCache:
+    """
+    A bounded, thread-safe, in-process LRU cache where every entry expires
+    after `timeout` seconds.
+    """
+
+    def __init__(self, max_entries: int, timeout: int) -> None:
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        size = approximate_size(key) + approximate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.timeout, size, value)
+            self._size += size
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "approximate_bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+
+###############################################################
+# Cross-process invalidation
+###############################################################
+
+
+_redis_client: Optional[redis.Redis] = None
+_listener_pid: Optional[int] = None
+_listener_lock = threading.Lock()
+
+
+def get_redis_client() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.IDENTITY_REDIS_URL)
+    return _redis_client
+
+
+def publish_invalidation(channel: str, key: str) -> None:
+    """
+    Tell every process listening on the channel to drop the key from its local
+    cache. A failed broadcast doesn't fail the write; local entries expire anyway.
+    """
+    try:
+        get_redis_client().publish(channel, key)
+    except redis.RedisError:
+        logger.warning("Failed to publish cache invalidation for %s", key)
+
+
+def publish_invalidations(channel: str, keys: list[str]) -> None:
+    """
+    publish_invalidation for many keys, in one round trip
+    """
+    try:
+        pipeline = get_redis_client().pipeline(transaction=False)
+        for key in keys:
+            pipeline.publish(channel, key)
+        pipeline.execute()
+    except redis.RedisError:
+        logger.warning("Failed to publish cache invalidation for %s keys", len(keys))
+
+
+def ensure_invalidation_listener(channel: str, local_cache: LocalCache) -> None:
+    """
+    Start (once per process) a daemon thread that drops keys published on the
+    channel from the local cache.
+    """
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        # forked processes must not share the parent's connection or state
+        local_cache.clear()
+        thread = threading.Thread(
+            target=listen_for_invalidations,
+            args=(channel, local_cache),
+            name="local-cache-invalidation",
+            daemon=True,
+        )
+        thread.start()
+        _listener_pid = os.getpid()
+
+
+def listen_for_invalidations(channel: str, local_cache: LocalCache) -> None:
+    client = redis.Redis.from_url(settings.IDENTITY_REDIS_URL)
+    while True:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+            # anything published while we weren't subscribed has been missed
+            local_cache.clear()
+            for message in pubsub.listen():
+                local_cache.delete(message["data"].decode())
+        except redis.RedisError:
+            logger.warning("Lost cache invalidation subscription, reconnecting")
+            local_cache.clear()
+            time.sleep(1)
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.9 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0014_sectorlist"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileMinimalDocument",
+            fields=[
+                (
+                    "profile",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="minimal_document",
+                        serialize=False,
+                        to="profiles.profile",
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True)),
+                ("document", models.BinaryField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.1.9 on 2026-10-18 11:00
+
+import json
+from itertools import batched
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def build_document(ProfileMinimalDocument, profile):
+    document = json.dumps(
+        {
+            "id": profile.sso_email_id,
+            "first_name": profile.first_name,
+            "last_name": profile.last_name,
+            "primary_email": profile.primary_email,
+            "contact_email": profile.contact_email,
+            "emails": profile.emails,
+        },
+        separators=(",", ":"),
+    ).encode()
+    emails = {
+        email.strip().lower()
+        for email in [*profile.emails, profile.primary_email, profile.contact_email]
+        if email
+    }
+    return ProfileMinimalDocument(
+        profile_id=profile.sso_email_id,
+        is_active=profile.is_active,
+        document=document,
+        emails=sorted(emails),
+    )
+
+
+def build_documents(apps, schema_editor):
+    """
+    Build the minimal document of every profile the way the combined profile
+    service does, so existing profiles can be found by email straight away
+    """
+    Profile = apps.get_model("profiles", "Profile")
+    ProfileMinimalDocument = apps.get_model("profiles", "ProfileMinimalDocument")
+
+    profiles = Profile.objects.order_by("pk").iterator(chunk_size=BATCH_SIZE)
+    for batch in batched(profiles, BATCH_SIZE):
+        ProfileMinimalDocument.objects.bulk_create(
+            [build_document(ProfileMinimalDocument, profile) for profile in batch],
+            update_conflicts=True,
+            unique_fields=["profile"],
+            update_fields=["is_active", "document", "emails"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0015_profileminimaldocument"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profileminimaldocument",
+            name="emails",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                default=list,
+                size=None,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profileminimaldocument",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["emails"], name="profile_minimal_emails_gin"
+            ),
+        ),
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.9 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0016_profileminimaldocument_emails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalpeoplefinderprofile",
+            name="revision",
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="historicalpeoplefinderteam",
+            name="revision",
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="historicalprofile",
+            name="revision",
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="peoplefinderprofile",
+            name="revision",
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="peoplefinderteam",
+            name="revision",
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="revision",
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+    ]
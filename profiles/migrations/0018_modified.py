@@ -0,0 +1,71 @@
+# Generated by Django 5.1.9 on 2026-10-18 15:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0017_revisions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalpeoplefinderprofile",
+            name="modified",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                editable=False,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="historicalpeoplefinderteam",
+            name="modified",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                editable=False,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="historicalprofile",
+            name="modified",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                editable=False,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="peoplefinderprofile",
+            name="modified",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="peoplefinderteam",
+            name="modified",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="modified",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.9 on 2026-10-18 03:33
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0018_modified"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="email",
+            index=models.Index(
+                django.db.models.functions.text.Upper("address"),
+                name="profiles_email_address_upper",
+            ),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 from simple_history.models import HistoricalRecords  # type: ignore
 
 from user.models import User
@@ -25,3 +25,37 @@ class AbstractProfile(models.Model):
     @property
     def sso_email_id(self):
         return self.user.sso_email_id
+
+
+class AbstractRevisionedModel(models.Model):
+    """
+    Keeps a revision number that is bumped on every save, and the time of that
+    save, to version the records served by the APIs (e.g. as ETags) without
+    re-serialising them.
+    """
+
+    class Meta:
+        abstract = True
+
+    revision = models.PositiveBigIntegerField(default=1, editable=False)
+    modified = models.DateTimeField(auto_now=True, db_index=True)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "revision", "modified"}
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            # bump the stored revision under a row lock, so concurrent saves
+            # can't write the same one
+            self.revision = (
+                type(self)
+                ._base_manager.using(using)
+                .select_for_update()
+                .values_list("revision", flat=True)
+                .get(pk=self.pk)
+                + 1
+            )
+            super().save(*args, **kwargs)
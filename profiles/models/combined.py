@@ -1,10 +1,14 @@
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
-from .abstract import AbstractHistoricalModel
+from .abstract import AbstractHistoricalModel, AbstractRevisionedModel
 
 
-class Profile(AbstractHistoricalModel):
+class Profile(AbstractHistoricalModel, AbstractRevisionedModel):
+    class Meta(AbstractHistoricalModel.Meta, AbstractRevisionedModel.Meta):
+        pass
+
     sso_email_id = models.CharField(primary_key=True, unique=True)
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
@@ -17,3 +21,29 @@ class Profile(AbstractHistoricalModel):
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
+
+
+class ProfileMinimalDocument(models.Model):
+    """
+    The pre-serialised JSON served by the SSO profile API for a Profile, kept
+    in step with it by the combined profile service.
+    """
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["emails"], name="profile_minimal_emails_gin"),
+        ]
+
+    profile = models.OneToOneField(
+        Profile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="minimal_document",
+    )
+    is_active = models.BooleanField(default=True)
+    document = models.BinaryField()
+    # lower-cased copies of every address on the profile, for reverse lookups
+    emails = ArrayField(models.CharField(max_length=100), default=list)
+
+    def __str__(self):
+        return f"Minimal document: {self.profile_id}"
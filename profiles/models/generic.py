@@ -1,6 +1,7 @@
 from data_flow_s3_import.models import IngestedModel
 from django.core.validators import EmailValidator
 from django.db import models
+from django.db.models.functions import Upper
 
 from .abstract import AbstractHistoricalModel
 
@@ -94,6 +95,12 @@ class Profession(models.TextChoices):
 
 
 class Email(AbstractHistoricalModel):
+    class Meta:
+        indexes = [
+            # for case-insensitive (iexact) lookups by address
+            models.Index(Upper("address"), name="profiles_email_address_upper"),
+        ]
+
     address = models.EmailField(validators=[EmailValidator()], unique=True)
 
     def __str__(self):
@@ -6,7 +6,7 @@ from django.db.models import F, Q
 from django_chunk_upload_handlers.clam_av import validate_virus_check_result
 
 from core.models import ChoiceArrayField
-from profiles.models.abstract import AbstractHistoricalModel
+from profiles.models.abstract import AbstractHistoricalModel, AbstractRevisionedModel
 from profiles.models.generic import Grade, Profession, Workday
 
 
@@ -129,8 +129,8 @@ class RemoteWorking(models.TextChoices):
     SPLIT = "split", "Split"
 
 
-class PeopleFinderProfile(AbstractHistoricalModel):
-    class Meta:
+class PeopleFinderProfile(AbstractHistoricalModel, AbstractRevisionedModel):
+    class Meta(AbstractHistoricalModel.Meta, AbstractRevisionedModel.Meta):
         constraints = [
             models.CheckConstraint(
                 check=~Q(id=F("manager")), name="manager_cannot_be_self"
@@ -416,8 +416,8 @@ class PeopleFinderHierarchyData(TypedDict):
     children: Optional[list]
 
 
-class PeopleFinderTeam(AbstractHistoricalModel):
-    class Meta:
+class PeopleFinderTeam(AbstractHistoricalModel, AbstractRevisionedModel):
+    class Meta(AbstractHistoricalModel.Meta, AbstractRevisionedModel.Meta):
         indexes = [
             models.Index(fields=["slug"]),
         ]
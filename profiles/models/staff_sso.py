@@ -24,7 +24,10 @@ class StaffSSOProfile(AbstractProfile):
 
     @property
     def email_addresses(self):
-        return [e["email__address"] for e in self.emails.values("email__address")]
+        return [
+            e["email__address"]
+            for e in self.emails.order_by("pk").values("email__address")
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
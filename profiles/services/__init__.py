@@ -5,7 +5,9 @@ from datetime import datetime
 from typing import Optional
 
 from django.db import models
+from django.db.models import Exists, OuterRef
 
+from core.models import StaffSSOSyncState
 from profiles.exceptions import (
     NonCombinedProfileExists,
     TeamChildError,
@@ -26,7 +28,7 @@ from profiles.models.peoplefinder import (
     PeopleFinderTeamType,
     RemoteWorking,
 )
-from profiles.models.staff_sso import StaffSSOProfile
+from profiles.models.staff_sso import StaffSSOProfile, StaffSSOProfileEmail
 from profiles.services import combined, staff_sso
 from profiles.services.peoplefinder import profile as peoplefinder_profile_services
 from profiles.services.peoplefinder import team as peoplefinder_team_services
@@ -47,6 +49,100 @@ def get_by_id(sso_email_id: str, include_inactive: bool = False) -> Profile:
     )
 
 
+async def aget_by_id(sso_email_id: str, include_inactive: bool = False) -> Profile:
+    """
+    Retrieve a profile by its User ID, asynchronously.
+    """
+    return await combined.aget_by_id(
+        sso_email_id=sso_email_id, include_inactive=include_inactive
+    )
+
+
+def get_filtered_profiles(
+    sso_email_id: Optional[str] = None,
+    email: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    modified_after: Optional[datetime] = None,
+) -> models.QuerySet[Profile]:
+    """
+    Retrieve the profiles matching every given filter.
+    """
+    return combined.get_filtered(
+        sso_email_id=sso_email_id,
+        email=email,
+        is_active=is_active,
+        modified_after=modified_after,
+    )
+
+
+def get_profiles_page(
+    profiles: models.QuerySet[Profile],
+    count: int,
+    after: Optional[str] = None,
+    offset: int = 0,
+) -> list[Profile]:
+    """
+    Retrieve a page of profiles, after the given User ID or offset.
+    """
+    return combined.get_page(profiles=profiles, count=count, after=after, offset=offset)
+
+
+def get_minimal_by_id(sso_email_id: str) -> bytes:
+    """
+    Retrieve the pre-serialised minimal document of an active profile by its User ID.
+    """
+    return combined.get_minimal_by_id(sso_email_id=sso_email_id)
+
+
+async def aget_minimal_by_id(sso_email_id: str) -> bytes:
+    """
+    Retrieve the pre-serialised minimal document of an active profile by its User ID, asynchronously.
+    """
+    return await combined.aget_minimal_by_id(sso_email_id=sso_email_id)
+
+
+def get_minimal_by_ids(sso_email_ids: list[str]) -> dict[str, list]:
+    """
+    Retrieve the pre-serialised minimal documents of many profiles by their User IDs.
+    """
+    return combined.get_minimal_by_ids(sso_email_ids=sso_email_ids)
+
+
+def get_minimal_by_email(email: str) -> bytes:
+    """
+    Retrieve the pre-serialised minimal document of an active profile by any of its email addresses.
+    """
+    return combined.get_minimal_by_email(email=email)
+
+
+def get_minimal_by_emails(emails: list[str]) -> dict:
+    """
+    Retrieve the pre-serialised minimal documents of many profiles by their email addresses.
+    """
+    return combined.get_minimal_by_emails(emails=emails)
+
+
+def rebuild_minimal_documents(batch_size: int = 1000) -> int:
+    """
+    (Re)build the pre-serialised minimal documents of every profile.
+    """
+    return combined.rebuild_minimal_documents(batch_size=batch_size)
+
+
+def refresh_minimal_documents(sso_email_ids: list[str]) -> None:
+    """
+    Rebuild the pre-serialised minimal documents of the given profiles.
+    """
+    combined.refresh_minimal_documents(sso_email_ids=sso_email_ids)
+
+
+def get_minimal_cache_stats() -> dict:
+    """
+    Retrieve the minimal profile cache statistics for this process.
+    """
+    return combined.get_minimal_cache_stats()
+
+
 def get_by_slug(slug: str, include_inactive: bool = False) -> PeopleFinderProfile:
     """
     Retrieve a peoplefinder profile by its slug.
@@ -125,11 +221,15 @@ def update_from_sso(
     all_emails: list[str],
     primary_email: str | Unset | None = None,
     contact_email: str | Unset | None = None,
-) -> None:
+) -> int:
+    """
+    Returns the number of history rows avoided, one per profile that was left
+    unsaved as nothing in it changed
+    """
     sso_profile = staff_sso.get_by_id(
         sso_email_id=profile.sso_email_id, include_inactive=True
     )
-    staff_sso.update(
+    sso_profile_changed = staff_sso.update(
         staff_sso_profile=sso_profile,
         first_name=first_name,
         last_name=last_name,
@@ -145,7 +245,7 @@ def update_from_sso(
         sso_email_id=profile.sso_email_id
     )
 
-    combined.update(
+    combined_profile_changed = combined.update(
         profile=combined_profile,
         first_name=combined_profile_data["first_name"],
         last_name=combined_profile_data["last_name"],
@@ -154,6 +254,170 @@ def update_from_sso(
         all_emails=combined_profile_data["emails"],
         is_active=combined_profile_data["is_active"],
     )
+    return [sso_profile_changed, combined_profile_changed].count(False)
+
+
+def partial_update_from_sso(
+    profile: Profile,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    all_emails: Optional[list[str]] = None,
+    primary_email: str | Unset | None = None,
+    contact_email: str | Unset | None = None,
+) -> None:
+    """
+    Like update_from_sso, but only writes the given fields: the emails are only
+    reconciled, and the combined email fields regenerated, when all_emails is given.
+    """
+    if first_name is None and last_name is None and all_emails is None:
+        return
+    sso_profile = staff_sso.get_by_id(
+        sso_email_id=profile.sso_email_id, include_inactive=True
+    )
+    staff_sso.update(
+        staff_sso_profile=sso_profile,
+        first_name=first_name,
+        last_name=last_name,
+        all_emails=all_emails,
+        primary_email=primary_email,
+        contact_email=contact_email,
+    )
+
+    if all_emails is None:
+        combined.update(
+            profile=profile,
+            first_name=first_name,
+            last_name=last_name,
+            all_emails=None,
+        )
+        return
+    combined_profile_data = generate_combined_profile_data(
+        sso_email_id=profile.sso_email_id
+    )
+    combined.update(
+        profile=profile,
+        first_name=first_name,
+        last_name=last_name,
+        primary_email=combined_profile_data["primary_email"],
+        contact_email=combined_profile_data["contact_email"],
+        all_emails=combined_profile_data["emails"],
+    )
+
+
+def bulk_create_from_sso(profiles: list[dict]) -> list[Profile]:
+    """
+    Set-based version of create_from_sso, for users that have no profiles yet.
+    Each dict holds the create_from_sso arguments and is_active of a user.
+    """
+    staff_sso.bulk_create(profiles=profiles)
+    return combined.bulk_create(profiles=generate_combined_profiles_data(profiles))
+
+
+def bulk_update_from_sso(profiles: list[dict]) -> int:
+    """
+    Set-based version of update_from_sso, by User ID rather than profile, that
+    also archives or unarchives the combined profiles. Each dict holds the
+    update_from_sso arguments, sso_email_id and is_active of a user. Returns
+    the number of history rows avoided.
+    """
+    sso_profiles = staff_sso.bulk_update(profiles=profiles)
+    combined_profiles = combined.bulk_update(
+        profiles=generate_combined_profiles_data(profiles)
+    )
+    return 2 * len(profiles) - len(sso_profiles) - len(combined_profiles)
+
+
+def generate_combined_profiles_data(profiles: list[dict]) -> list[dict]:
+    """
+    Set-based version of generate_combined_profile_data, for the staff sso
+    profiles just written from the given data, reading every email in one query.
+    """
+    emails: dict[str, list[dict]] = {}
+    for profile_email in (
+        StaffSSOProfileEmail.objects.filter(
+            profile__user_id__in=[profile["sso_email_id"] for profile in profiles]
+        )
+        .order_by("pk")
+        .values("profile__user_id", "email__address", "is_primary", "is_contact")
+    ):
+        emails.setdefault(profile_email["profile__user_id"], []).append(profile_email)
+
+    combined_profiles_data = []
+    for profile in profiles:
+        profile_emails = emails.get(profile["sso_email_id"], [])
+        primary_email = next(
+            (e["email__address"] for e in profile_emails if e["is_primary"]), None
+        )
+        if primary_email is None and profile_emails:
+            primary_email = profile_emails[0]["email__address"]
+        contact_email = next(
+            (e["email__address"] for e in profile_emails if e["is_contact"]), None
+        )
+        if contact_email is None:
+            contact_email = primary_email
+        combined_profiles_data.append(
+            {
+                "sso_email_id": profile["sso_email_id"],
+                "first_name": profile["first_name"],
+                "last_name": profile["last_name"],
+                "primary_email": primary_email,
+                "contact_email": contact_email,
+                "all_emails": [e["email__address"] for e in profile_emails],
+                "is_active": profile["is_active"],
+            }
+        )
+    return combined_profiles_data
+
+
+def get_unchanged_sso_ids(source_hashes: dict[str, str]) -> set[str]:
+    """
+    Which of the given users were last synced from a Staff SSO record with the
+    same hash, by User ID, and haven't had their combined Profile written to
+    since.
+    """
+    states = StaffSSOSyncState.objects.filter(
+        Exists(
+            Profile.objects.filter(
+                sso_email_id=OuterRef("user_id"),
+                revision=OuterRef("profile_revision"),
+            )
+        ),
+        user_id__in=list(source_hashes),
+    ).values_list("user_id", "source_hash")
+    return {
+        user_id
+        for user_id, source_hash in states
+        if source_hashes[user_id] == source_hash
+    }
+
+
+def record_sso_source_hashes(source_hashes: dict[str, str]) -> None:
+    """
+    Record the hashes of the Staff SSO records the given users were just synced
+    from, by User ID, along with the revision of their combined Profile.
+    """
+    revisions = Profile.objects.filter(
+        sso_email_id__in=list(source_hashes)
+    ).values_list("sso_email_id", "revision")
+    StaffSSOSyncState.objects.bulk_create(
+        [
+            StaffSSOSyncState(
+                user_id=id, source_hash=source_hashes[id], profile_revision=revision
+            )
+            for id, revision in revisions
+        ],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["source_hash", "profile_revision", "synced"],
+    )
+
+
+def forget_sso_sync_states(sso_email_ids: list[str]) -> None:
+    """
+    Forget the Staff SSO records the given users were last synced from, by User
+    ID, so that the next sync writes them whatever their records hash to
+    """
+    StaffSSOSyncState.objects.filter(user_id__in=sso_email_ids).delete()
 
 
 def create_from_peoplefinder(
@@ -416,6 +680,15 @@ def delete(profile_id: str) -> dict[str, models.Model]:
     return all_profiles
 
 
+def bulk_delete(profile_ids: list[str]) -> None:
+    """
+    Set-based version of delete, removing every profile of the given users
+    """
+    peoplefinder_profile_services.bulk_delete_from_database(sso_email_ids=profile_ids)
+    staff_sso.bulk_delete_from_database(sso_email_ids=profile_ids)
+    combined.bulk_delete_from_database(sso_email_ids=profile_ids)
+
+
 def get_peoplefinder_profile_by_slug(slug: str) -> PeopleFinderProfile:
     """
     Gets peoplefinder profile from peoplefinder service
@@ -424,6 +697,21 @@ def get_peoplefinder_profile_by_slug(slug: str) -> PeopleFinderProfile:
     return peoplefinder_profile_services.get_by_slug(slug=slug)
 
 
+def get_peoplefinder_profile_version(slug: str) -> str:
+    """
+    Gets the version token of a peoplefinder profile, for conditional requests
+    :param slug: Peoplefinder profile slug
+    """
+    return peoplefinder_profile_services.get_version_by_slug(slug=slug)
+
+
+def get_peoplefinder_team_version(slug: str) -> str:
+    """
+    Gets the version token of a People Finder Team, for conditional requests
+    """
+    return peoplefinder_team_services.get_version_by_slug(slug=slug)
+
+
 def get_peoplefinder_team_by_slug(slug: str) -> PeopleFinderTeam:
     """
     Retrieve a People Finder Team by its slug.
@@ -1,11 +1,31 @@
+import json
+import uuid
+from datetime import datetime
+from itertools import batched
 from typing import TYPE_CHECKING, Optional
 
-from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
-from django.contrib.admin.options import get_content_type_for_model
+from django.conf import settings
+from django.contrib.admin.models import ADDITION, CHANGE, DELETION
 from django.contrib.auth import get_user_model
-
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef, QuerySet
+from django.utils import timezone
+from simple_history.utils import (  # type: ignore
+    bulk_create_with_history,
+    bulk_update_with_history,
+)
+
+from core import audit
+from profiles.cache import (
+    LocalCache,
+    ensure_invalidation_listener,
+    publish_invalidation,
+    publish_invalidations,
+)
 from profiles.exceptions import ProfileExists, ProfileIsArchived, ProfileIsNotArchived
-from profiles.models.combined import Profile
+from profiles.models.combined import Profile, ProfileMinimalDocument
+from profiles.models.staff_sso import StaffSSOProfileEmail
 
 
 if TYPE_CHECKING:
@@ -33,6 +53,253 @@ def get_by_id(sso_email_id: str, include_inactive: bool = False) -> Profile:
     return Profile.objects.get(sso_email_id=sso_email_id, is_active=True)
 
 
+async def aget_by_id(sso_email_id: str, include_inactive: bool = False) -> Profile:
+    """
+    Async version of get_by_id
+    """
+    if include_inactive:
+        return await Profile.objects.aget(sso_email_id=sso_email_id)
+
+    return await Profile.objects.aget(sso_email_id=sso_email_id, is_active=True)
+
+
+def get_filtered(
+    sso_email_id: Optional[str] = None,
+    email: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    modified_after: Optional[datetime] = None,
+) -> QuerySet[Profile]:
+    """
+    Retrieve the profiles matching every given filter, each of which is backed
+    by an index.
+    """
+    profiles = Profile.objects.all()
+    if sso_email_id is not None:
+        profiles = profiles.filter(sso_email_id=sso_email_id)
+    if email is not None:
+        # the emails the combined profile is generated from, rather than the
+        # minimal documents, which may not have been built yet
+        profiles = profiles.filter(
+            Exists(
+                StaffSSOProfileEmail.objects.filter(
+                    profile__user_id=OuterRef("sso_email_id"),
+                    email__address__iexact=email.strip(),
+                )
+            )
+        )
+    if is_active is not None:
+        profiles = profiles.filter(is_active=is_active)
+    if modified_after is not None:
+        profiles = profiles.filter(modified__gt=modified_after)
+    return profiles
+
+
+def get_page(
+    profiles: QuerySet[Profile],
+    count: int,
+    after: Optional[str] = None,
+    offset: int = 0,
+) -> list[Profile]:
+    """
+    Retrieve a page of profiles in User ID order. Given the last User ID of the
+    previous page as `after`, it seeks straight to the page on the primary key
+    rather than counting past `offset` rows, so deep pages stay as cheap as
+    the first.
+    """
+    profiles = profiles.order_by("sso_email_id")
+    if after is not None:
+        return list(profiles.filter(sso_email_id__gt=after)[:count])
+    return list(profiles[offset : offset + count])
+
+
+def get_minimal_by_id(sso_email_id: str) -> bytes:
+    """
+    Retrieve the pre-serialised minimal document of an active profile, reading
+    through the local (in-process) cache, if enabled, then the shared cache.
+    """
+    document = get_local_minimal_document(sso_email_id=sso_email_id)
+    if document is not None:
+        return document
+
+    documents, generations = get_cached_minimal_documents(sso_email_ids=[sso_email_id])
+    if sso_email_id in documents:
+        minimal_cache_stats["hits"] += 1
+        document = documents[sso_email_id]
+        if settings.SSO_PROFILE_LOCAL_CACHE_ENABLED:
+            local_minimal_cache.set(sso_email_id, document)
+        return document
+
+    minimal_cache_stats["misses"] += 1
+    row = get_minimal_document_query(sso_email_id=sso_email_id).first()
+    if row is None:
+        raise Profile.DoesNotExist("Profile matching query does not exist.")
+    _, document = row
+    if document is None:
+        # not built yet, see the rebuild_minimal_profile_documents command
+        document = build_minimal_document(
+            profile=get_by_id(sso_email_id=sso_email_id)
+        ).document
+    document = bytes(document)
+    cache_minimal_documents(documents={sso_email_id: document}, generations=generations)
+    return document
+
+
+async def aget_minimal_by_id(sso_email_id: str) -> bytes:
+    """
+    Async version of get_minimal_by_id, for the ASGI deployment mode
+    """
+    document = get_local_minimal_document(sso_email_id=sso_email_id)
+    if document is not None:
+        return document
+
+    documents, generations = await aget_cached_minimal_documents(
+        sso_email_ids=[sso_email_id]
+    )
+    if sso_email_id in documents:
+        minimal_cache_stats["hits"] += 1
+        document = documents[sso_email_id]
+        if settings.SSO_PROFILE_LOCAL_CACHE_ENABLED:
+            local_minimal_cache.set(sso_email_id, document)
+        return document
+
+    minimal_cache_stats["misses"] += 1
+    row = await get_minimal_document_query(sso_email_id=sso_email_id).afirst()
+    if row is None:
+        raise Profile.DoesNotExist("Profile matching query does not exist.")
+    _, document = row
+    if document is None:
+        document = build_minimal_document(
+            profile=await aget_by_id(sso_email_id=sso_email_id)
+        ).document
+    document = bytes(document)
+    await acache_minimal_documents(
+        documents={sso_email_id: document}, generations=generations
+    )
+    return document
+
+
+def get_minimal_document_query(sso_email_id: str) -> QuerySet:
+    """
+    The stored minimal document of an active profile, joined from the profile
+    so that a missing profile and a document that hasn't been built yet can be
+    told apart in one query
+    """
+    return Profile.objects.filter(
+        sso_email_id=sso_email_id, is_active=True
+    ).values_list("sso_email_id", "minimal_document__document")
+
+
+def get_minimal_by_ids(sso_email_ids: list[str]) -> dict[str, list]:
+    """
+    Retrieve the pre-serialised minimal documents of many profiles at once,
+    reading through the caches then falling back to a single query for the rest.
+
+    Returns the documents of the active profiles in the order requested,
+    alongside the IDs that are inactive or don't exist.
+    """
+    sso_email_ids = list(dict.fromkeys(sso_email_ids))
+    found: dict[str, bytes] = {}
+
+    if settings.SSO_PROFILE_LOCAL_CACHE_ENABLED:
+        for sso_email_id in sso_email_ids:
+            document = local_minimal_cache.get(sso_email_id)
+            if document is not None:
+                found[sso_email_id] = document
+
+    uncached = [id for id in sso_email_ids if id not in found]
+    cached, generations = get_cached_minimal_documents(sso_email_ids=uncached)
+    minimal_cache_stats["hits"] += len(cached)
+    minimal_cache_stats["misses"] += len(uncached) - len(cached)
+    if settings.SSO_PROFILE_LOCAL_CACHE_ENABLED:
+        for sso_email_id, document in cached.items():
+            local_minimal_cache.set(sso_email_id, document)
+    found.update(cached)
+
+    inactive = set()
+    to_cache = {}
+    remaining = [id for id in uncached if id not in found]
+    if remaining:
+        not_built = []
+        rows = Profile.objects.filter(sso_email_id__in=remaining).values_list(
+            "sso_email_id", "is_active", "minimal_document__document"
+        )
+        for sso_email_id, is_active, document in rows:
+            if not is_active:
+                inactive.add(sso_email_id)
+            elif document is None:
+                not_built.append(sso_email_id)
+            else:
+                to_cache[sso_email_id] = bytes(document)
+
+        # not built yet, see the rebuild_minimal_profile_documents command
+        if not_built:
+            for profile in Profile.objects.filter(sso_email_id__in=not_built):
+                to_cache[profile.sso_email_id] = build_minimal_document(
+                    profile=profile
+                ).document
+
+    if to_cache:
+        found.update(to_cache)
+        cache_minimal_documents(documents=to_cache, generations=generations)
+
+    return {
+        "results": [found[id] for id in sso_email_ids if id in found],
+        "inactive": [id for id in sso_email_ids if id in inactive],
+        "missing": [
+            id for id in sso_email_ids if id not in found and id not in inactive
+        ],
+    }
+
+
+def get_minimal_by_email(email: str) -> bytes:
+    """
+    Retrieve the pre-serialised minimal document of the active profile with
+    the given email address (any of its addresses, case-insensitive).
+    """
+    document = (
+        ProfileMinimalDocument.objects.filter(
+            emails__contains=[normalise_email(email)], is_active=True
+        )
+        .order_by("profile_id")
+        .values_list("document", flat=True)
+        .first()
+    )
+    if document is None:
+        raise Profile.DoesNotExist("Profile matching query does not exist.")
+    return bytes(document)
+
+
+def get_minimal_by_emails(emails: list[str]) -> dict:
+    """
+    Retrieve the pre-serialised minimal documents of the active profiles with
+    the given email addresses in a single query.
+
+    Returns the documents keyed by the email addresses as requested, alongside
+    the addresses that don't belong to an active profile.
+    """
+    requested = {email: normalise_email(email) for email in dict.fromkeys(emails)}
+    by_email: dict[str, bytes] = {}
+    rows = (
+        ProfileMinimalDocument.objects.filter(
+            emails__overlap=list(set(requested.values())), is_active=True
+        )
+        .order_by("profile_id")
+        .values_list("emails", "document")
+    )
+    for profile_emails, document in rows:
+        for email in profile_emails:
+            by_email.setdefault(email, bytes(document))
+
+    results = {}
+    missing = []
+    for email, normalised_email in requested.items():
+        if normalised_email in by_email:
+            results[email] = by_email[normalised_email]
+        else:
+            missing.append(email)
+    return {"results": results, "missing": missing}
+
+
 def create(
     sso_email_id: str,
     first_name: str,
@@ -62,19 +329,19 @@ def create(
         )
         profile.full_clean()
         profile.save()
+        save_minimal_documents(documents=[build_minimal_document(profile=profile)])
+        invalidate_minimal_cache(sso_email_id=profile.sso_email_id)
 
         if reason is None:
             reason = "Creating new Profile"
         requesting_user_id = "via-api"
         if requesting_user is not None:
             requesting_user_id = requesting_user.pk
-        LogEntry.objects.log_action(
+        audit.log_action(
             user_id=requesting_user_id,
-            content_type_id=get_content_type_for_model(profile).pk,
-            object_id=profile.pk,
-            object_repr=str(profile),
-            change_message=reason,
+            obj=profile,
             action_flag=ADDITION,
+            change_message=reason,
         )
 
         return profile
@@ -88,46 +355,48 @@ def update(
     profile: Profile,
     first_name: Optional[str],
     last_name: Optional[str],
-    all_emails: list[str],
+    all_emails: Optional[list[str]],
     primary_email: Optional[str] = None,
     contact_email: Optional[str] = None,
     is_active: Optional[bool] = None,
     reason: Optional[str] = None,
     requesting_user: Optional[User] = None,
-) -> None:
-    update_fields = []
-    if first_name is not None:
-        update_fields.append("first_name")
-        profile.first_name = first_name
-    if last_name is not None:
-        update_fields.append("last_name")
-        profile.last_name = last_name
-    if primary_email is not None:
-        update_fields.append("primary_email")
-        profile.primary_email = primary_email
-    if contact_email is not None:
-        update_fields.append("contact_email")
-        profile.contact_email = contact_email
-    if all_emails is not None:
-        update_fields.append("emails")
-        profile.emails = all_emails
+) -> bool:
+    """
+    Update the given fields. Nothing is saved or logged when none of them
+    change; returns whether any did.
+    """
+    changed_fields = []
+    for field, value in (
+        ("first_name", first_name),
+        ("last_name", last_name),
+        ("primary_email", primary_email),
+        ("contact_email", contact_email),
+        ("emails", all_emails),
+    ):
+        if value is not None and getattr(profile, field) != value:
+            changed_fields.append(field)
+            setattr(profile, field, value)
+    if not changed_fields:
+        return False
 
     profile.full_clean()
-    profile.save(update_fields=update_fields)
+    profile.save(update_fields=changed_fields)
+    save_minimal_documents(documents=[build_minimal_document(profile=profile)])
+    invalidate_minimal_cache(sso_email_id=profile.sso_email_id)
 
     if reason is None:
-        reason = f"Updating Profile record: {", ".join(update_fields)}"
+        reason = f"Updating Profile record: {", ".join(changed_fields)}"
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(profile).pk,
-        object_id=profile.pk,
-        object_repr=str(profile),
-        change_message=reason,
+        obj=profile,
         action_flag=CHANGE,
+        change_message=reason,
     )
+    return True
 
 
 def archive(
@@ -144,17 +413,17 @@ def archive(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(profile).pk,
-        object_id=profile.pk,
-        object_repr=str(profile),
-        change_message=reason,
+        obj=profile,
         action_flag=CHANGE,
+        change_message=reason,
     )
 
     profile.is_active = False
     profile.save(update_fields=("is_active",))
+    save_minimal_documents(documents=[build_minimal_document(profile=profile)])
+    invalidate_minimal_cache(sso_email_id=profile.sso_email_id)
 
 
 def unarchive(
@@ -171,17 +440,17 @@ def unarchive(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(profile).pk,
-        object_id=profile.pk,
-        object_repr=str(profile),
-        change_message=reason,
+        obj=profile,
         action_flag=CHANGE,
+        change_message=reason,
     )
 
     profile.is_active = True
     profile.save(update_fields=("is_active",))
+    save_minimal_documents(documents=[build_minimal_document(profile=profile)])
+    invalidate_minimal_cache(sso_email_id=profile.sso_email_id)
 
 
 def delete_from_database(
@@ -195,13 +464,511 @@ def delete_from_database(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(profile).pk,
-        object_id=profile.pk,
-        object_repr=str(profile),
-        change_message=reason,
+        obj=profile,
         action_flag=DELETION,
+        change_message=reason,
     )
 
+    sso_email_id = profile.sso_email_id
     profile.delete()
+    invalidate_minimal_cache(sso_email_id=sso_email_id)
+
+
+###############################################################
+# Bulk methods
+###############################################################
+
+
+def bulk_create(
+    profiles: list[dict],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> list[Profile]:
+    """
+    Set-based version of create, for profiles that don't exist yet. Each dict
+    holds the arguments create takes for one profile.
+    """
+    created = bulk_create_with_history(
+        [
+            Profile(
+                sso_email_id=profile["sso_email_id"],
+                first_name=profile["first_name"],
+                last_name=profile["last_name"],
+                emails=profile["all_emails"],
+                primary_email=profile["primary_email"],
+                contact_email=profile["contact_email"],
+                is_active=profile["is_active"],
+            )
+            for profile in profiles
+        ],
+        Profile,
+    )
+    save_minimal_documents(
+        documents=[build_minimal_document(profile=profile) for profile in created]
+    )
+    invalidate_minimal_caches(sso_email_ids=[profile.pk for profile in created])
+
+    if reason is None:
+        reason = "Creating new Profile"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=created,
+        action_flag=ADDITION,
+        change_message=reason,
+    )
+
+    return created
+
+
+# Profile field -> the bulk_update argument it's set from
+BULK_UPDATE_FIELDS = {
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "primary_email": "primary_email",
+    "contact_email": "contact_email",
+    "emails": "all_emails",
+    "is_active": "is_active",
+}
+
+
+@transaction.atomic
+def bulk_update(
+    profiles: list[dict],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> list[Profile]:
+    """
+    Set-based version of update, that also archives and unarchives profiles
+    whose is_active changes. Each dict holds the sso_email_id of a profile and
+    the arguments update takes for it; missing profiles are skipped. Returns
+    the profiles that changed.
+    """
+    # lock the rows (in a fixed order) so that the revisions bumped below
+    # can't be bumped concurrently from the same values
+    existing = (
+        Profile.objects.select_for_update()
+        .order_by("pk")
+        .in_bulk([profile["sso_email_id"] for profile in profiles])
+    )
+    modified = timezone.now()
+    updated = []
+    archived = []
+    unarchived = []
+    # change message -> the profiles it's logged for
+    changes: dict[str, list[Profile]] = {}
+    for profile in profiles:
+        combined_profile = existing.get(profile["sso_email_id"])
+        if combined_profile is None:
+            continue
+        changed_fields = []
+        for field, key in BULK_UPDATE_FIELDS.items():
+            value = profile[key]
+            if value is not None and getattr(combined_profile, field) != value:
+                setattr(combined_profile, field, value)
+                changed_fields.append(field)
+        # profiles that didn't change get no history row or log entry
+        if not changed_fields:
+            continue
+        if "is_active" in changed_fields:
+            changed_fields.remove("is_active")
+            if combined_profile.is_active:
+                unarchived.append(combined_profile)
+            else:
+                archived.append(combined_profile)
+        if changed_fields:
+            change_message = reason
+            if change_message is None:
+                change_message = f"Updating Profile record: {", ".join(changed_fields)}"
+            changes.setdefault(change_message, []).append(combined_profile)
+        # bulk_update bypasses save(), so version the profiles here
+        combined_profile.revision += 1
+        combined_profile.modified = modified
+        updated.append(combined_profile)
+
+    bulk_update_with_history(
+        updated, Profile, fields=[*BULK_UPDATE_FIELDS, "revision", "modified"]
+    )
+    save_minimal_documents(
+        documents=[build_minimal_document(profile=profile) for profile in updated]
+    )
+    invalidate_minimal_caches(sso_email_ids=[profile.pk for profile in updated])
+
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    for profiles_changed, change_message in (
+        (archived, "Archiving Profile record"),
+        (unarchived, "Unarchiving Profile record"),
+        *((objs, change_message) for change_message, objs in changes.items()),
+    ):
+        audit.log_actions(
+            user_id=requesting_user_id,
+            objs=profiles_changed,
+            action_flag=CHANGE,
+            change_message=change_message,
+        )
+
+    return updated
+
+
+def bulk_delete_from_database(
+    sso_email_ids: list[str],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> None:
+    """Set-based version of delete_from_database, by User ID"""
+    profiles = list(Profile.objects.filter(sso_email_id__in=sso_email_ids))
+
+    if reason is None:
+        reason = "Deleting Profile record"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=profiles,
+        action_flag=DELETION,
+        change_message=reason,
+    )
+
+    Profile.objects.filter(pk__in=[profile.pk for profile in profiles]).delete()
+    invalidate_minimal_caches(sso_email_ids=[profile.pk for profile in profiles])
+
+
+###############################################################
+# Minimal document methods
+###############################################################
+
+
+def build_minimal_document(profile: Profile) -> ProfileMinimalDocument:
+    """
+    Serialise a profile into the JSON served by the SSO profile API, matching
+    the core.schemas.profiles.ProfileMinimal schema.
+    """
+    document = json.dumps(
+        {
+            "id": profile.sso_email_id,
+            "first_name": profile.first_name,
+            "last_name": profile.last_name,
+            "primary_email": profile.primary_email,
+            "contact_email": profile.contact_email,
+            "emails": profile.emails,
+        },
+        separators=(",", ":"),
+    ).encode()
+    emails = {
+        normalise_email(email)
+        for email in [*profile.emails, profile.primary_email, profile.contact_email]
+        if email
+    }
+    return ProfileMinimalDocument(
+        profile_id=profile.sso_email_id,
+        is_active=profile.is_active,
+        document=document,
+        emails=sorted(emails),
+    )
+
+
+def normalise_email(email: str) -> str:
+    """
+    The form email addresses are stored and looked up by in the reverse index
+    """
+    return email.strip().lower()
+
+
+def save_minimal_documents(documents: list[ProfileMinimalDocument]) -> None:
+    """
+    Insert or overwrite minimal documents in a single query
+    """
+    ProfileMinimalDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["profile"],
+        update_fields=["is_active", "document", "emails"],
+    )
+
+
+def refresh_minimal_documents(sso_email_ids: list[str], batch_size: int = 1000) -> None:
+    """
+    Rebuild the minimal documents of the given profiles, e.g. after they were
+    written in SQL rather than through this service, a batch at a time
+    """
+    for batch in batched(sso_email_ids, batch_size):
+        save_minimal_documents(
+            documents=[
+                build_minimal_document(profile=profile)
+                for profile in Profile.objects.filter(sso_email_id__in=batch)
+            ]
+        )
+    invalidate_minimal_caches(sso_email_ids=sso_email_ids)
+
+
+def rebuild_minimal_documents(batch_size: int = 1000) -> int:
+    """
+    (Re)build the minimal documents of every profile, e.g. after a change to
+    their shape. Returns the number of documents written.
+    """
+    count = 0
+    batch = []
+    for profile in Profile.objects.order_by("pk").iterator(chunk_size=batch_size):
+        batch.append(build_minimal_document(profile=profile))
+        if len(batch) == batch_size:
+            save_minimal_documents(documents=batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        save_minimal_documents(documents=batch)
+        count += len(batch)
+    return count
+
+
+###############################################################
+# Cache methods
+###############################################################
+
+
+# Bump this whenever the shape of the minimal documents changes, so that entries
+# written by older code are never read back.
+MINIMAL_CACHE_VERSION = 3
+
+minimal_cache_stats: dict[str, int] = {"hits": 0, "misses": 0}
+
+local_minimal_cache = LocalCache(
+    max_entries=settings.SSO_PROFILE_LOCAL_CACHE_MAX_ENTRIES,
+    timeout=settings.SSO_PROFILE_LOCAL_CACHE_TIMEOUT,
+)
+
+
+def get_minimal_cache_key(sso_email_id: str) -> str:
+    return f"profile-minimal:{sso_email_id}"
+
+
+def get_minimal_generation_key(sso_email_id: str) -> str:
+    return f"profile-minimal-generation:{sso_email_id}"
+
+
+def get_local_minimal_document(sso_email_id: str) -> Optional[bytes]:
+    """
+    Read a minimal document from the local (in-process) cache, if it's enabled
+    """
+    if not settings.SSO_PROFILE_LOCAL_CACHE_ENABLED:
+        return None
+    if settings.SSO_PROFILE_CACHE_INVALIDATION_CHANNEL:
+        ensure_invalidation_listener(
+            channel=settings.SSO_PROFILE_CACHE_INVALIDATION_CHANNEL,
+            local_cache=local_minimal_cache,
+        )
+    return local_minimal_cache.get(sso_email_id)
+
+
+# Each profile has a generation in the shared cache, replaced whenever a write
+# to it commits. Documents are cached tagged with the generation read before
+# the database was, and only served while it's still the current one, so that a
+# read racing a write can't put the pre-commit document back in the cache.
+
+
+def get_minimal_cache_keys(sso_email_ids: list[str]) -> list[str]:
+    return [
+        key
+        for sso_email_id in sso_email_ids
+        for key in (
+            get_minimal_cache_key(sso_email_id=sso_email_id),
+            get_minimal_generation_key(sso_email_id=sso_email_id),
+        )
+    ]
+
+
+def read_minimal_cache_entries(
+    sso_email_ids: list[str], cached: dict
+) -> tuple[dict[str, bytes], dict[str, Optional[str]]]:
+    generations = {
+        sso_email_id: cached.get(get_minimal_generation_key(sso_email_id=sso_email_id))
+        for sso_email_id in sso_email_ids
+    }
+    documents = {}
+    for sso_email_id in sso_email_ids:
+        entry = cached.get(get_minimal_cache_key(sso_email_id=sso_email_id))
+        if entry is not None and entry[0] == generations[sso_email_id]:
+            documents[sso_email_id] = entry[1]
+    return documents, generations
+
+
+def get_cached_minimal_documents(
+    sso_email_ids: list[str],
+) -> tuple[dict[str, bytes], dict[str, Optional[str]]]:
+    """
+    The shared cache's documents for the profiles that are of their current
+    generation, and every profile's generation to tag the documents read from
+    the database for it with
+    """
+    if not sso_email_ids:
+        return {}, {}
+    cached = cache.get_many(
+        get_minimal_cache_keys(sso_email_ids=sso_email_ids),
+        version=MINIMAL_CACHE_VERSION,
+    )
+    return read_minimal_cache_entries(sso_email_ids=sso_email_ids, cached=cached)
+
+
+async def aget_cached_minimal_documents(
+    sso_email_ids: list[str],
+) -> tuple[dict[str, bytes], dict[str, Optional[str]]]:
+    """
+    Async version of get_cached_minimal_documents
+    """
+    cached = await cache.aget_many(
+        get_minimal_cache_keys(sso_email_ids=sso_email_ids),
+        version=MINIMAL_CACHE_VERSION,
+    )
+    return read_minimal_cache_entries(sso_email_ids=sso_email_ids, cached=cached)
+
+
+def get_unchanged_generations(
+    generations: dict[str, Optional[str]], current: dict
+) -> list[str]:
+    return [
+        sso_email_id
+        for sso_email_id, generation in generations.items()
+        if current.get(get_minimal_generation_key(sso_email_id=sso_email_id))
+        == generation
+    ]
+
+
+def cache_minimal_documents(
+    documents: dict[str, bytes], generations: dict[str, Optional[str]]
+) -> None:
+    """
+    Cache documents read from the database, tagged with the generations read
+    before them. The local cache has no generations, so they're only cached
+    locally if no write has committed since.
+    """
+    cache.set_many(
+        {
+            get_minimal_cache_key(sso_email_id=sso_email_id): (
+                generations.get(sso_email_id),
+                document,
+            )
+            for sso_email_id, document in documents.items()
+        },
+        timeout=settings.SSO_PROFILE_CACHE_TIMEOUT,
+        version=MINIMAL_CACHE_VERSION,
+    )
+    if not settings.SSO_PROFILE_LOCAL_CACHE_ENABLED:
+        return
+    current = cache.get_many(
+        [get_minimal_generation_key(sso_email_id=id) for id in documents],
+        version=MINIMAL_CACHE_VERSION,
+    )
+    for sso_email_id in get_unchanged_generations(
+        generations={id: generations.get(id) for id in documents}, current=current
+    ):
+        local_minimal_cache.set(sso_email_id, documents[sso_email_id])
+
+
+async def acache_minimal_documents(
+    documents: dict[str, bytes], generations: dict[str, Optional[str]]
+) -> None:
+    """
+    Async version of cache_minimal_documents
+    """
+    await cache.aset_many(
+        {
+            get_minimal_cache_key(sso_email_id=sso_email_id): (
+                generations.get(sso_email_id),
+                document,
+            )
+            for sso_email_id, document in documents.items()
+        },
+        timeout=settings.SSO_PROFILE_CACHE_TIMEOUT,
+        version=MINIMAL_CACHE_VERSION,
+    )
+    if not settings.SSO_PROFILE_LOCAL_CACHE_ENABLED:
+        return
+    current = await cache.aget_many(
+        [get_minimal_generation_key(sso_email_id=id) for id in documents],
+        version=MINIMAL_CACHE_VERSION,
+    )
+    for sso_email_id in get_unchanged_generations(
+        generations={id: generations.get(id) for id in documents}, current=current
+    ):
+        local_minimal_cache.set(sso_email_id, documents[sso_email_id])
+
+
+def invalidate_minimal_cache(sso_email_id: str) -> None:
+    """
+    Move the profile on to a new generation once the current transaction
+    commits, so that its cached document, and any a concurrent read caches from
+    the pre-commit state, is no longer served.
+    """
+    transaction.on_commit(lambda: drop_minimal_cache(sso_email_id=sso_email_id))
+
+
+def invalidate_minimal_caches(sso_email_ids: list[str]) -> None:
+    """
+    Set-based version of invalidate_minimal_cache
+    """
+    transaction.on_commit(lambda: drop_minimal_caches(sso_email_ids=sso_email_ids))
+
+
+def new_minimal_generations(sso_email_ids: list[str]) -> None:
+    # generations never expire: one that did would let a document tagged with
+    # no generation be served again
+    cache.set_many(
+        {
+            get_minimal_generation_key(sso_email_id=sso_email_id): uuid.uuid4().hex
+            for sso_email_id in sso_email_ids
+        },
+        timeout=None,
+        version=MINIMAL_CACHE_VERSION,
+    )
+    cache.delete_many(
+        [
+            get_minimal_cache_key(sso_email_id=sso_email_id)
+            for sso_email_id in sso_email_ids
+        ],
+        version=MINIMAL_CACHE_VERSION,
+    )
+
+
+def drop_minimal_cache(sso_email_id: str) -> None:
+    """
+    Drop the minimal document from the shared cache by moving the profile on to
+    a new generation, and from this process' local cache and (via broadcast)
+    every other process' local cache.
+    """
+    new_minimal_generations(sso_email_ids=[sso_email_id])
+    local_minimal_cache.delete(sso_email_id)
+    if settings.SSO_PROFILE_CACHE_INVALIDATION_CHANNEL:
+        publish_invalidation(
+            channel=settings.SSO_PROFILE_CACHE_INVALIDATION_CHANNEL,
+            key=sso_email_id,
+        )
+
+
+def drop_minimal_caches(sso_email_ids: list[str]) -> None:
+    """
+    Set-based version of drop_minimal_cache
+    """
+    new_minimal_generations(sso_email_ids=sso_email_ids)
+    for sso_email_id in sso_email_ids:
+        local_minimal_cache.delete(sso_email_id)
+    if settings.SSO_PROFILE_CACHE_INVALIDATION_CHANNEL:
+        publish_invalidations(
+            channel=settings.SSO_PROFILE_CACHE_INVALIDATION_CHANNEL,
+            keys=sso_email_ids,
+        )
+
+
+def get_minimal_cache_stats() -> dict:
+    """
+    Cache statistics for this process
+    """
+    return {
+        "shared": dict(minimal_cache_stats),
+        "local": local_minimal_cache.stats(),
+    }
@@ -1,10 +1,10 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from django.contrib.admin.models import DELETION, LogEntry
-from django.contrib.admin.options import get_content_type_for_model
+from django.contrib.admin.models import DELETION
 from django.contrib.auth import get_user_model
 
+from core import audit
 from profiles.exceptions import ProfileExists
 from profiles.models import LearningInterest, Workday
 from profiles.models.generic import Country, Email, Grade, Profession, UkStaffLocation
@@ -38,6 +38,19 @@ def get_by_slug(slug: str, include_inactive: bool = False) -> PeopleFinderProfil
     return PeopleFinderProfile.objects.get(slug=slug, is_active=True)
 
 
+def get_version_by_slug(slug: str) -> str:
+    """
+    Retrieve the version token of an active People Finder profile by its Slug,
+    without loading the profile.
+    """
+    revision = (
+        PeopleFinderProfile.objects.filter(slug=slug, is_active=True)
+        .values_list("revision", flat=True)
+        .get()
+    )
+    return str(revision)
+
+
 def create(
     slug: str,
     user: User,
@@ -398,18 +411,43 @@ def delete_from_database(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(peoplefinder_profile).pk,
-        object_id=peoplefinder_profile.pk,
-        object_repr=str(peoplefinder_profile),
-        change_message=reason,
+        obj=peoplefinder_profile,
         action_flag=DELETION,
+        change_message=reason,
     )
 
     peoplefinder_profile.delete()
 
 
+def bulk_delete_from_database(
+    sso_email_ids: list[str],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> None:
+    """Set-based version of delete_from_database, by User ID"""
+    peoplefinder_profiles = list(
+        PeopleFinderProfile.objects.filter(user_id__in=sso_email_ids)
+    )
+
+    if reason is None:
+        reason = "Deleting People Finder Profile record"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=peoplefinder_profiles,
+        action_flag=DELETION,
+        change_message=reason,
+    )
+
+    PeopleFinderProfile.objects.filter(
+        pk__in=[profile.pk for profile in peoplefinder_profiles]
+    ).delete()
+
+
 ###############################################################
 # Email data methods
 ###############################################################
@@ -32,6 +32,25 @@ def get_by_slug(slug: str) -> PeopleFinderTeam:
     return PeopleFinderTeam.objects.get(slug=slug)
 
 
+def get_version_by_slug(slug: str) -> str:
+    """
+    Retrieve the version token of a People Finder Team by its Slug. It covers
+    the team's parents too, as their details are served alongside the team.
+    """
+    branches = (
+        PeopleFinderTeamTree.objects.filter(child__slug=slug)
+        .order_by("depth")
+        .values_list("parent_id", "depth", "parent__revision")
+    )
+    if not branches:
+        raise PeopleFinderTeam.DoesNotExist(
+            "PeopleFinderTeam matching query does not exist."
+        )
+    return ";".join(
+        f"{parent_id}.{depth}.{revision}" for parent_id, depth, revision in branches
+    )
+
+
 def create(
     slug: str,
     name: str,
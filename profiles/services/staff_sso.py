@@ -1,9 +1,15 @@
+from itertools import batched
 from typing import TYPE_CHECKING, Optional
 
-from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
-from django.contrib.admin.options import get_content_type_for_model
+from django.contrib.admin.models import ADDITION, CHANGE, DELETION
 from django.contrib.auth import get_user_model
+from django.db import connection, models
+from simple_history.utils import (  # type: ignore
+    bulk_create_with_history,
+    bulk_update_with_history,
+)
 
+from core import audit
 from profiles.models.generic import Email
 from profiles.models.staff_sso import StaffSSOProfile, StaffSSOProfileEmail
 from profiles.types import UNSET, Unset
@@ -66,31 +72,24 @@ def create(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(staff_sso_profile).pk,
-        object_id=staff_sso_profile.pk,
-        object_repr=str(staff_sso_profile),
-        change_message=reason,
+        obj=staff_sso_profile,
         action_flag=ADDITION,
+        change_message=reason,
+    )
+    reconcile_emails(
+        profiles=[
+            (
+                staff_sso_profile,
+                {
+                    "all_emails": all_emails,
+                    "primary_email": primary_email,
+                    "contact_email": contact_email,
+                },
+            )
+        ]
     )
-    for email in all_emails:
-        email_object, _ = Email.objects.get_or_create(
-            address=email,
-        )
-        is_primary = None
-        if email == primary_email:
-            is_primary = True
-        is_contact = None
-        if email == contact_email:
-            is_contact = True
-
-        set_email_details(
-            profile=staff_sso_profile,
-            email=email_object,
-            is_primary=is_primary,
-            is_contact=is_contact,
-        )
 
     return staff_sso_profile
 
@@ -99,73 +98,65 @@ def update(
     staff_sso_profile: StaffSSOProfile,
     first_name: Optional[str],
     last_name: Optional[str],
-    all_emails: list[str],
+    all_emails: Optional[list[str]],
     primary_email: str | Unset | None = None,
     contact_email: str | Unset | None = None,
     reason: Optional[str] = None,
     requesting_user: Optional[User] = None,
-) -> None:
-    if (
-        primary_email is not None
-        and primary_email is not UNSET
-        and primary_email not in all_emails
-    ):
-        raise ValueError("primary_email not in all_emails")
-    if (
-        contact_email is not None
-        and contact_email is not UNSET
-        and contact_email not in all_emails
-    ):
-        raise ValueError("contact_email not in all_emails")
+) -> bool:
+    """
+    Update the given fields; the emails are only reconciled when all_emails is given.
+    Nothing is saved or logged when nothing changes; returns whether anything did.
+    """
+    if all_emails is not None:
+        validate_emails(
+            profile={
+                "all_emails": all_emails,
+                "primary_email": primary_email,
+                "contact_email": contact_email,
+            }
+        )
 
-    update_fields = []
-    if first_name is not None:
-        update_fields.append("first_name")
-        staff_sso_profile.first_name = first_name
-    if last_name is not None:
-        update_fields.append("last_name")
-        staff_sso_profile.last_name = last_name
+    changed_fields = []
+    for field, value in (("first_name", first_name), ("last_name", last_name)):
+        if value is not None and getattr(staff_sso_profile, field) != value:
+            changed_fields.append(field)
+            setattr(staff_sso_profile, field, value)
 
-    staff_sso_profile.full_clean()
-    staff_sso_profile.save(update_fields=update_fields)
+    if changed_fields:
+        staff_sso_profile.full_clean()
+        staff_sso_profile.save(update_fields=changed_fields)
 
-    # add / update staff sso email records
-    for email in all_emails:
-        email_object, _ = Email.objects.get_or_create(
-            address=email,
-        )
-        is_primary: bool | Unset | None = None
-        if primary_email == UNSET:
-            is_primary = UNSET
-        elif email == primary_email:
-            is_primary = True
-        is_contact: bool | Unset | None = None
-        if contact_email == UNSET:
-            is_contact = UNSET
-        elif email == contact_email:
-            is_contact = True
-        set_email_details(
-            profile=staff_sso_profile,
-            email=email_object,
-            is_primary=is_primary,
-            is_contact=is_contact,
+    if all_emails is not None:
+        emails_changed = reconcile_emails(
+            profiles=[
+                (
+                    staff_sso_profile,
+                    {
+                        "all_emails": all_emails,
+                        "primary_email": primary_email,
+                        "contact_email": contact_email,
+                    },
+                )
+            ]
         )
-    # remove emails not in the all_emails list
-    staff_sso_profile.emails.exclude(email__address__in=all_emails).delete()
+        if emails_changed:
+            changed_fields.append("emails")
+    if not changed_fields:
+        return False
 
     if reason is None:
-        reason = f"Updating StaffSSOProfile record: {", ".join(update_fields)}"
+        reason = f"Updating StaffSSOProfile record: {", ".join(changed_fields)}"
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(staff_sso_profile).pk,
-        object_id=staff_sso_profile.pk,
-        object_repr=str(staff_sso_profile),
-        change_message=reason,
+        obj=staff_sso_profile,
         action_flag=CHANGE,
+        change_message=reason,
     )
+    return True
 
 
 def delete_from_database(
@@ -179,13 +170,11 @@ def delete_from_database(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(sso_profile).pk,
-        object_id=sso_profile.pk,
-        object_repr=str(sso_profile),
-        change_message=reason,
+        obj=sso_profile,
         action_flag=DELETION,
+        change_message=reason,
     )
 
     sso_profile.delete()
@@ -196,40 +185,280 @@ def delete_from_database(
 ###############################################################
 
 
-def set_email_details(
-    profile: StaffSSOProfile,
-    email: Email,
-    is_primary: bool | Unset | None = None,
-    is_contact: bool | Unset | None = None,
-) -> None:
+def insert_new(model: type[models.Model], objs: list, unique_fields: list[str]) -> list:
+    """
+    Insert the objects with ON CONFLICT DO NOTHING, a batch per statement,
+    setting the pks of the ones inserted from its RETURNING and writing history
+    rows for them alone. Returns the objects inserted.
     """
-    Update a staff sso email
+    quote_name = connection.ops.quote_name
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    keys = [model._meta.get_field(name) for name in unique_fields]
+    columns = ", ".join(quote_name(field.column) for field in fields)
+    key_columns = ", ".join(quote_name(key.column) for key in keys)
+    row = f"({", ".join(["%s"] * len(fields))})"
+    inserted = []
+    for batch in batched(objs, 1000):
+        by_key = {
+            tuple(getattr(obj, key.attname) for key in keys): obj for obj in batch
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote_name(model._meta.db_table)} ({columns}) "
+                f"VALUES {", ".join([row] * len(batch))} "
+                f"ON CONFLICT ({key_columns}) DO NOTHING "
+                f"RETURNING {quote_name(model._meta.pk.column)}, {key_columns}",
+                [
+                    field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+                    for obj in batch
+                    for field in fields
+                ],
+            )
+            for pk, *key in cursor.fetchall():
+                obj = by_key[tuple(key)]
+                obj.pk = pk
+                inserted.append(obj)
+    model.history.bulk_history_create(inserted)  # type: ignore
+    return inserted
+
+
+def get_or_create_emails(addresses: set[str]) -> dict[str, Email]:
     """
-    staff_sso_profile_email, _ = StaffSSOProfileEmail.objects.get_or_create(
-        email=email, profile=profile
+    Set-based version of Email.objects.get_or_create, keyed by address
+    """
+    emails = {
+        email.address: email for email in Email.objects.filter(address__in=addresses)
+    }
+    missing = [address for address in addresses if address not in emails]
+    if missing:
+        # ON CONFLICT DO NOTHING, in case another writer has since created some
+        for email in insert_new(
+            Email, [Email(address=address) for address in missing], ["address"]
+        ):
+            emails[email.address] = email
+        # and read back the ones they created
+        conflicting = [address for address in missing if address not in emails]
+        if conflicting:
+            for email in Email.objects.filter(address__in=conflicting):
+                emails[email.address] = email
+    return emails
+
+
+def reconcile_emails(profiles: list[tuple[StaffSSOProfile, dict]]) -> set[int]:
+    """
+    Bring the email records of many profiles in line with their all_emails,
+    primary_email and contact_email (as create and update take them), with a
+    fixed number of queries however many emails there are: a bulk insert of
+    the missing emails and links (ON CONFLICT DO NOTHING), a single update of
+    the changed primary / contact flags and a single delete of the links to
+    addresses the profiles no longer have. Returns the pks of the profiles
+    whose links changed.
+    """
+    emails = get_or_create_emails(
+        addresses={
+            address for _, profile in profiles for address in profile["all_emails"]
+        }
     )
+    existing = {
+        (profile_email.profile_id, profile_email.email_id): profile_email
+        for profile_email in StaffSSOProfileEmail.objects.filter(
+            profile__in=[staff_sso_profile for staff_sso_profile, _ in profiles]
+        )
+    }
 
-    update_fields = []
-    if is_primary is not None:
-        # ensure only one is marked as primary
-        profile.emails.filter(is_primary=True).exclude(email=email).update(
-            is_primary=False
+    to_create = []
+    to_update = []
+    kept = set()
+    for staff_sso_profile, profile in profiles:
+        for address in dict.fromkeys(profile["all_emails"]):
+            email = emails[address]
+            key = (staff_sso_profile.pk, email.pk)
+            kept.add(key)
+            profile_email = existing.get(key)
+            if profile_email is None:
+                profile_email = StaffSSOProfileEmail(
+                    profile=staff_sso_profile, email=email
+                )
+                to_create.append(profile_email)
+            changed = False
+            # None leaves a flag as it is, UNSET clears it from every address
+            for flag, flagged_address in (
+                ("is_primary", profile.get("primary_email")),
+                ("is_contact", profile.get("contact_email")),
+            ):
+                if flagged_address is None:
+                    continue
+                value = flagged_address is not UNSET and address == flagged_address
+                if getattr(profile_email, flag) != value:
+                    setattr(profile_email, flag, value)
+                    changed = True
+            if changed and profile_email.pk is not None:
+                to_update.append(profile_email)
+
+    if to_create:
+        to_create = insert_new(StaffSSOProfileEmail, to_create, ["profile", "email"])
+    if to_update:
+        bulk_update_with_history(
+            to_update, StaffSSOProfileEmail, fields=["is_primary", "is_contact"]
         )
-        if is_primary == UNSET:
-            staff_sso_profile_email.is_primary = False
-        else:
-            staff_sso_profile_email.is_primary = True
-        update_fields.append("is_primary")
-    if is_contact is not None:
-        # ensure only one is marked as contact
-        profile.emails.filter(is_contact=True).exclude(email=email).update(
-            is_contact=False
+    removed = [
+        profile_email for key, profile_email in existing.items() if key not in kept
+    ]
+    if removed:
+        StaffSSOProfileEmail.objects.filter(
+            pk__in=[profile_email.pk for profile_email in removed]
+        ).delete()
+
+    return {
+        profile_email.profile_id for profile_email in [*to_create, *to_update, *removed]
+    }
+
+
+###############################################################
+# Bulk methods
+###############################################################
+
+
+def bulk_create(
+    profiles: list[dict],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> list[StaffSSOProfile]:
+    """
+    Set-based version of create, for users that exist but have no staff sso
+    profile yet. Each dict holds the arguments create takes for one profile.
+    """
+    for profile in profiles:
+        validate_emails(profile=profile)
+
+    staff_sso_profiles = bulk_create_with_history(
+        [
+            StaffSSOProfile(
+                user_id=profile["sso_email_id"],
+                first_name=profile["first_name"],
+                last_name=profile["last_name"],
+            )
+            for profile in profiles
+        ],
+        StaffSSOProfile,
+    )
+
+    if reason is None:
+        reason = "Creating new StaffSSOProfile"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=staff_sso_profiles,
+        action_flag=ADDITION,
+        change_message=reason,
+    )
+
+    reconcile_emails(profiles=list(zip(staff_sso_profiles, profiles)))
+    return staff_sso_profiles
+
+
+def bulk_update(
+    profiles: list[dict],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> list[StaffSSOProfile]:
+    """
+    Set-based version of update. Each dict holds the sso_email_id of a profile
+    and the arguments update takes for it; users without a staff sso profile
+    are skipped. Returns the profiles that changed.
+    """
+    for profile in profiles:
+        validate_emails(profile=profile)
+
+    staff_sso_profiles = StaffSSOProfile.objects.in_bulk(
+        [profile["sso_email_id"] for profile in profiles], field_name="user_id"
+    )
+    to_update = {}
+    # staff sso profile pk -> its changed fields
+    changed_fields: dict[int, list[str]] = {}
+    for profile in profiles:
+        staff_sso_profile = staff_sso_profiles.get(profile["sso_email_id"])
+        if staff_sso_profile is None:
+            continue
+        for field in ("first_name", "last_name"):
+            value = profile[field]
+            if value is not None and getattr(staff_sso_profile, field) != value:
+                setattr(staff_sso_profile, field, value)
+                changed_fields.setdefault(staff_sso_profile.pk, []).append(field)
+        to_update[profile["sso_email_id"]] = (staff_sso_profile, profile)
+
+    # profiles that didn't change get no history row or log entry
+    bulk_update_with_history(
+        [
+            staff_sso_profile
+            for staff_sso_profile, _ in to_update.values()
+            if staff_sso_profile.pk in changed_fields
+        ],
+        StaffSSOProfile,
+        fields=["first_name", "last_name"],
+    )
+    for pk in reconcile_emails(profiles=list(to_update.values())):
+        changed_fields.setdefault(pk, []).append("emails")
+    updated = [
+        staff_sso_profile
+        for staff_sso_profile, _ in to_update.values()
+        if staff_sso_profile.pk in changed_fields
+    ]
+
+    # change message -> the profiles it's logged for
+    changes: dict[str, list[StaffSSOProfile]] = {}
+    for staff_sso_profile in updated:
+        change_message = reason
+        if change_message is None:
+            fields = changed_fields[staff_sso_profile.pk]
+            change_message = f"Updating StaffSSOProfile record: {", ".join(fields)}"
+        changes.setdefault(change_message, []).append(staff_sso_profile)
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    for change_message, staff_sso_profiles_changed in changes.items():
+        audit.log_actions(
+            user_id=requesting_user_id,
+            objs=staff_sso_profiles_changed,
+            action_flag=CHANGE,
+            change_message=change_message,
         )
-        if is_contact == UNSET:
-            staff_sso_profile_email.is_contact = False
-        else:
-            staff_sso_profile_email.is_contact = True
-        update_fields.append("is_contact")
-
-    if len(update_fields) > 0:
-        staff_sso_profile_email.save(update_fields=update_fields)
+    return updated
+
+
+def bulk_delete_from_database(
+    sso_email_ids: list[str],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> None:
+    """Set-based version of delete_from_database, by User ID"""
+    sso_profiles = list(StaffSSOProfile.objects.filter(user_id__in=sso_email_ids))
+
+    if reason is None:
+        reason = "Deleting Staff SSO Profile record"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=sso_profiles,
+        action_flag=DELETION,
+        change_message=reason,
+    )
+
+    StaffSSOProfile.objects.filter(
+        pk__in=[sso_profile.pk for sso_profile in sso_profiles]
+    ).delete()
+
+
+def validate_emails(profile: dict) -> None:
+    for key in ("primary_email", "contact_email"):
+        email = profile.get(key)
+        if (
+            email is not None
+            and email is not UNSET
+            and email not in profile["all_emails"]
+        ):
+            raise ValueError(f"{key} not in all_emails")
@@ -71,6 +71,27 @@ def test_update(peoplefinder_profile, combined_profile):
     assert peoplefinder_profile.grade == None
 
 
+def test_get_version_by_slug(peoplefinder_profile, combined_profile):
+    version = peoplefinder_profile_services.get_version_by_slug(
+        slug=peoplefinder_profile.slug
+    )
+
+    peoplefinder_profile_services.update(
+        peoplefinder_profile=peoplefinder_profile,
+        is_active=combined_profile.is_active,
+        first_name="James",
+    )
+    assert (
+        peoplefinder_profile_services.get_version_by_slug(
+            slug=peoplefinder_profile.slug
+        )
+        != version
+    )
+
+    with pytest.raises(PeopleFinderProfile.DoesNotExist):
+        peoplefinder_profile_services.get_version_by_slug(slug=str(uuid.uuid4()))
+
+
 def test_delete_from_database(peoplefinder_profile):
     obj_repr = str(peoplefinder_profile)
     peoplefinder_profile.refresh_from_db()
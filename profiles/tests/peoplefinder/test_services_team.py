@@ -141,6 +141,35 @@ def test_update_team(peoplefinder_team):
     }
 
 
+def test_get_version_by_slug(peoplefinder_team):
+    team = peoplefinder_team_services.create(
+        slug="employee-experience",
+        name="Employee Experience",
+        leaders_ordering=PeopleFinderTeamLeadersOrdering("custom"),
+        team_type=PeopleFinderTeamType("portfolio"),
+        parent=peoplefinder_team,
+    )
+    version = peoplefinder_team_services.get_version_by_slug(slug=team.slug)
+
+    # the parents are part of the team's representation, so changing them
+    # changes the team's version
+    peoplefinder_team.name = "Department for Business and Trade"
+    peoplefinder_team.save()
+    parent_changed_version = peoplefinder_team_services.get_version_by_slug(
+        slug=team.slug
+    )
+    assert parent_changed_version != version
+
+    team.save()
+    assert (
+        peoplefinder_team_services.get_version_by_slug(slug=team.slug)
+        != parent_changed_version
+    )
+
+    with pytest.raises(PeopleFinderTeam.DoesNotExist):
+        peoplefinder_team_services.get_version_by_slug(slug="missing")
+
+
 def test_get_team_hierarchy(peoplefinder_team):
     # Add a child node with depth 1 to the root team
     ex = peoplefinder_team_services.create(
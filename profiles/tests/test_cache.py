@@ -0,0 +1,65 @@
+import pytest
+
+from profiles.cache import LocalCache, approximate_size
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_local_cache_get_set_delete():
+    local_cache = LocalCache(max_entries=10, timeout=60)
+    assert local_cache.get("a") is None
+    local_cache.set("a", {"first_name": "John"})
+    assert local_cache.get("a") == {"first_name": "John"}
+    local_cache.delete("a")
+    assert local_cache.get("a") is None
+    # deleting a missing key is a no-op
+    local_cache.delete("a")
+
+    stats = local_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 0
+    assert stats["approximate_bytes"] == 0
+
+
+def test_local_cache_evicts_least_recently_used():
+    local_cache = LocalCache(max_entries=2, timeout=60)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+    # reading "a" makes "b" the least recently used
+    local_cache.get("a")
+    local_cache.set("c", 3)
+
+    assert local_cache.get("b") is None
+    assert local_cache.get("a") == 1
+    assert local_cache.get("c") == 3
+    assert local_cache.stats()["evictions"] == 1
+    assert local_cache.stats()["entries"] == 2
+
+
+def test_local_cache_expires_entries(mocker):
+    mock_monotonic = mocker.patch("profiles.cache.time.monotonic", return_value=100)
+    local_cache = LocalCache(max_entries=10, timeout=60)
+    local_cache.set("a", 1)
+
+    mock_monotonic.return_value = 160
+    assert local_cache.get("a") == 1
+    mock_monotonic.return_value = 161
+    assert local_cache.get("a") is None
+    assert local_cache.stats()["entries"] == 0
+
+
+def test_local_cache_tracks_size():
+    local_cache = LocalCache(max_entries=10, timeout=60)
+    value = {"emails": ["email1@email.com", "email2@email.com"]}
+    local_cache.set("a", value)
+    expected_size = approximate_size("a") + approximate_size(value)
+    assert local_cache.stats()["approximate_bytes"] == expected_size
+
+    # replacing a value doesn't double count it
+    local_cache.set("a", value)
+    assert local_cache.stats()["approximate_bytes"] == expected_size
+
+    local_cache.clear()
+    assert local_cache.stats()["approximate_bytes"] == 0
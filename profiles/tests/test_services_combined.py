@@ -1,8 +1,14 @@
+import json
+from importlib import import_module
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.apps import apps
 from django.contrib.admin.models import LogEntry
+from django.test import override_settings
 
 from profiles.exceptions import ProfileExists, ProfileIsArchived, ProfileIsNotArchived
-from profiles.models.combined import Profile
+from profiles.models.combined import Profile, ProfileMinimalDocument
 from profiles.services import combined as profile_services
 
 
@@ -107,6 +113,69 @@ def test_update(combined_profile):
     )
 
 
+def test_update_logs_the_changed_fields(combined_profile):
+    profile_services.update(
+        combined_profile,
+        first_name="John",
+        last_name="Jones",
+        all_emails=combined_profile.emails,
+    )
+
+    log = LogEntry.objects.get()
+    assert log.get_change_message() == "Updating Profile record: last_name"
+
+
+def test_saves_bump_the_stored_revision(combined_profile):
+    first = Profile.objects.get(pk=combined_profile.pk)
+    second = Profile.objects.get(pk=combined_profile.pk)
+
+    first.first_name = "Tom"
+    first.save()
+    second.last_name = "Jones"
+    second.save()
+
+    assert first.revision == 2
+    assert second.revision == 3
+    assert Profile.objects.get(pk=combined_profile.pk).revision == 3
+
+
+def test_bulk_update_logs_the_changed_fields(combined_profile):
+    other_profile = Profile.objects.create(
+        sso_email_id="other@email.com",
+        first_name="Jane",
+        last_name="Doe",
+        primary_email="other@email.com",
+        contact_email="other@email.com",
+        emails=["other@email.com"],
+        is_active=True,
+    )
+    unchanged = {
+        "first_name": None,
+        "last_name": None,
+        "primary_email": None,
+        "contact_email": None,
+        "all_emails": None,
+        "is_active": None,
+    }
+
+    profile_services.bulk_update(
+        profiles=[
+            {
+                **unchanged,
+                "sso_email_id": combined_profile.pk,
+                "first_name": "Tom",
+                "last_name": "Doe",
+            },
+            {**unchanged, "sso_email_id": other_profile.pk, "is_active": False},
+        ]
+    )
+
+    assert set(LogEntry.objects.values_list("object_id", "change_message")) == {
+        (combined_profile.pk, "Updating Profile record: first_name"),
+        (other_profile.pk, "Archiving Profile record"),
+    }
+
+
 def test_archive(combined_profile):
     assert combined_profile.is_active
     profile_services.archive(combined_profile)
@@ -159,3 +228,334 @@ def test_delete_from_database(combined_profile):
     assert log.user.pk == "via-api"
     assert log.object_repr == obj_repr
     assert log.get_change_message() == "Deleting Profile record"
+
+
+def test_get_minimal_by_id(combined_profile, django_assert_num_queries):
+    profile_services.minimal_cache_stats.update(hits=0, misses=0)
+    profile_services.save_minimal_documents(
+        [profile_services.build_minimal_document(combined_profile)]
+    )
+
+    # A miss reads from the database and populates the cache
+    with django_assert_num_queries(1):
+        document = profile_services.get_minimal_by_id(combined_profile.sso_email_id)
+    assert json.loads(document) == {
+        "id": combined_profile.sso_email_id,
+        "first_name": "John",
+        "last_name": "Doe",
+        "primary_email": "email2@email.com",
+        "contact_email": "email@email.com",
+        "emails": ["email1@email.com", "email2@email.com"],
+    }
+    assert profile_services.minimal_cache_stats == {"hits": 0, "misses": 1}
+
+    # A hit doesn't touch the database
+    with django_assert_num_queries(0):
+        assert (
+            profile_services.get_minimal_by_id(combined_profile.sso_email_id)
+            == document
+        )
+    assert profile_services.minimal_cache_stats == {"hits": 1, "misses": 1}
+
+    # Inactive and non-existent profiles aren't cached
+    with pytest.raises(Profile.DoesNotExist):
+        profile_services.get_minimal_by_id("9999")
+    with pytest.raises(Profile.DoesNotExist):
+        profile_services.get_minimal_by_id("9999")
+    assert profile_services.minimal_cache_stats == {"hits": 1, "misses": 3}
+
+
+def test_aget_minimal_by_id(combined_profile, django_assert_num_queries):
+    aget_minimal_by_id = async_to_sync(profile_services.aget_minimal_by_id)
+    document = aget_minimal_by_id(combined_profile.sso_email_id)
+    assert (
+        document == profile_services.build_minimal_document(combined_profile).document
+    )
+
+    # shares its cache with the sync path
+    with django_assert_num_queries(0):
+        assert profile_services.get_minimal_by_id(combined_profile.sso_email_id) == (
+            document
+        )
+        assert aget_minimal_by_id(combined_profile.sso_email_id) == document
+
+    with pytest.raises(Profile.DoesNotExist):
+        aget_minimal_by_id("9999")
+
+
+def test_get_minimal_by_id_without_document(combined_profile):
+    # profiles whose document hasn't been built yet are serialised on the fly
+    document = profile_services.get_minimal_by_id(combined_profile.sso_email_id)
+    assert (
+        document == profile_services.build_minimal_document(combined_profile).document
+    )
+
+
+def test_writes_maintain_minimal_document(combined_profile):
+    profile_services.update(
+        combined_profile,
+        first_name="Tom",
+        last_name=None,
+        all_emails=["email1@email.com", "email2@email.com"],
+    )
+    minimal_document = ProfileMinimalDocument.objects.get(profile=combined_profile)
+    assert json.loads(minimal_document.document)["first_name"] == "Tom"
+    assert minimal_document.is_active
+
+    profile_services.archive(combined_profile)
+    minimal_document.refresh_from_db()
+    assert not minimal_document.is_active
+
+    profile_services.unarchive(combined_profile)
+    minimal_document.refresh_from_db()
+    assert minimal_document.is_active
+
+    profile_services.delete_from_database(combined_profile)
+    assert not ProfileMinimalDocument.objects.exists()
+
+
+def test_rebuild_minimal_documents(combined_profile):
+    Profile.objects.create(
+        sso_email_id="other@email.com",
+        first_name="Jane",
+        last_name="Doe",
+        primary_email="jane@email.com",
+        emails=["jane@email.com"],
+    )
+    assert profile_services.rebuild_minimal_documents(batch_size=1) == 2
+    assert ProfileMinimalDocument.objects.count() == 2
+    # rebuilding overwrites rather than duplicates
+    assert profile_services.rebuild_minimal_documents() == 2
+    assert ProfileMinimalDocument.objects.count() == 2
+
+
+def test_migration_builds_minimal_documents(combined_profile):
+    # profiles that existed before the documents are built by the migration
+    # adding the email index, so they can be found by email after deploying
+    migration = import_module("profiles.migrations.0016_profileminimaldocument_emails")
+    combined_profile.emails = [" Email1@Email.com ", "email2@email.com"]
+    combined_profile.save()
+    assert not ProfileMinimalDocument.objects.exists()
+
+    migration.build_documents(apps, schema_editor=None)
+
+    expected = profile_services.build_minimal_document(combined_profile)
+    minimal_document = ProfileMinimalDocument.objects.get(profile=combined_profile)
+    assert bytes(minimal_document.document) == expected.document
+    assert minimal_document.emails == [
+        "email1@email.com",
+        "email2@email.com",
+        "email@email.com",
+    ]
+    assert profile_services.get_minimal_by_email("email1@email.com") == (
+        expected.document
+    )
+
+
+def test_writes_invalidate_minimal_cache(
+    combined_profile, django_capture_on_commit_callbacks
+):
+    sso_email_id = combined_profile.sso_email_id
+    profile_services.get_minimal_by_id(sso_email_id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile_services.update(
+            combined_profile,
+            first_name="Tom",
+            last_name=None,
+            all_emails=["email1@email.com", "email2@email.com"],
+        )
+    document = profile_services.get_minimal_by_id(sso_email_id)
+    assert json.loads(document)["first_name"] == "Tom"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile_services.archive(combined_profile)
+    with pytest.raises(Profile.DoesNotExist):
+        profile_services.get_minimal_by_id(sso_email_id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile_services.unarchive(combined_profile)
+    document = profile_services.get_minimal_by_id(sso_email_id)
+    assert json.loads(document)["first_name"] == "Tom"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile_services.delete_from_database(combined_profile)
+    with pytest.raises(Profile.DoesNotExist):
+        profile_services.get_minimal_by_id(sso_email_id)
+
+
+def test_minimal_cache_is_only_invalidated_on_commit(combined_profile):
+    sso_email_id = combined_profile.sso_email_id
+    profile_services.get_minimal_by_id(sso_email_id)
+
+    # the test transaction never commits, so the cached value survives
+    profile_services.update(
+        combined_profile,
+        first_name="Tom",
+        last_name=None,
+        all_emails=["email1@email.com", "email2@email.com"],
+    )
+    document = profile_services.get_minimal_by_id(sso_email_id)
+    assert json.loads(document)["first_name"] == "John"
+
+
+def test_minimal_cache_isnt_repopulated_by_a_read_racing_a_write(
+    combined_profile, django_capture_on_commit_callbacks
+):
+    sso_email_id = combined_profile.sso_email_id
+    # a read that misses the cache before a write commits...
+    _, generations = profile_services.get_cached_minimal_documents(
+        sso_email_ids=[sso_email_id]
+    )
+    stale = profile_services.build_minimal_document(combined_profile).document
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile_services.update(
+            combined_profile,
+            first_name="Tom",
+            last_name=None,
+            all_emails=["email1@email.com", "email2@email.com"],
+        )
+    # ...and caches what it read only after the write's invalidation
+    profile_services.cache_minimal_documents(
+        documents={sso_email_id: stale}, generations=generations
+    )
+
+    document = profile_services.get_minimal_by_id(sso_email_id)
+    assert json.loads(document)["first_name"] == "Tom"
+
+
+@override_settings(SSO_PROFILE_LOCAL_CACHE_ENABLED=True)
+def test_get_minimal_by_id_local_cache(combined_profile, django_assert_num_queries):
+    profile_services.minimal_cache_stats.update(hits=0, misses=0)
+    sso_email_id = combined_profile.sso_email_id
+
+    document = profile_services.get_minimal_by_id(sso_email_id)
+    assert profile_services.local_minimal_cache.get(sso_email_id) == document
+
+    # served from the local cache without going to the shared cache
+    with django_assert_num_queries(0):
+        assert profile_services.get_minimal_by_id(sso_email_id) == document
+    assert profile_services.minimal_cache_stats == {"hits": 0, "misses": 1}
+
+    # a cold local cache falls back to the shared cache
+    profile_services.local_minimal_cache.clear()
+    with django_assert_num_queries(0):
+        assert profile_services.get_minimal_by_id(sso_email_id) == document
+    assert profile_services.minimal_cache_stats == {"hits": 1, "misses": 1}
+
+
+@override_settings(
+    SSO_PROFILE_LOCAL_CACHE_ENABLED=True,
+    SSO_PROFILE_CACHE_INVALIDATION_CHANNEL="invalidation-channel",
+)
+def test_drop_minimal_cache_broadcasts(mocker, combined_profile):
+    mocker.patch("profiles.services.combined.ensure_invalidation_listener")
+    mock_publish = mocker.patch("profiles.services.combined.publish_invalidation")
+    sso_email_id = combined_profile.sso_email_id
+    profile_services.get_minimal_by_id(sso_email_id)
+
+    profile_services.drop_minimal_cache(sso_email_id)
+
+    assert profile_services.local_minimal_cache.get(sso_email_id) is None
+    mock_publish.assert_called_once_with(
+        channel="invalidation-channel", key=sso_email_id
+    )
+
+
+def test_get_minimal_cache_stats():
+    profile_services.minimal_cache_stats.update(hits=3, misses=2)
+    stats = profile_services.get_minimal_cache_stats()
+    assert stats["shared"] == {"hits": 3, "misses": 2}
+    assert stats["local"]["max_entries"] > 0
+
+
+def test_get_minimal_by_ids(combined_profile, django_assert_num_queries):
+    inactive_profile = Profile.objects.create(
+        sso_email_id="inactive@email.com",
+        first_name="Jane",
+        last_name="Doe",
+        primary_email="jane@email.com",
+        emails=["jane@email.com"],
+        is_active=False,
+    )
+    profile_services.rebuild_minimal_documents()
+
+    with django_assert_num_queries(1):
+        result = profile_services.get_minimal_by_ids(
+            [
+                "missing@email.com",
+                inactive_profile.sso_email_id,
+                combined_profile.sso_email_id,
+                combined_profile.sso_email_id,
+            ]
+        )
+    assert result == {
+        "results": [profile_services.build_minimal_document(combined_profile).document],
+        "inactive": [inactive_profile.sso_email_id],
+        "missing": ["missing@email.com"],
+    }
+
+    # active profiles are now cached, so only the others are queried
+    with django_assert_num_queries(1):
+        assert (
+            profile_services.get_minimal_by_ids(
+                [
+                    "missing@email.com",
+                    inactive_profile.sso_email_id,
+                    combined_profile.sso_email_id,
+                ]
+            )
+            == result
+        )
+    with django_assert_num_queries(0):
+        profile_services.get_minimal_by_ids([combined_profile.sso_email_id])
+
+
+def test_get_minimal_by_email(combined_profile, django_assert_num_queries):
+    profile_services.rebuild_minimal_documents()
+    document = profile_services.build_minimal_document(combined_profile).document
+
+    # every address on the profile is indexed, case-insensitively
+    with django_assert_num_queries(1):
+        assert profile_services.get_minimal_by_email(" Email1@Email.com ") == document
+    assert profile_services.get_minimal_by_email("email@email.com") == document
+
+    with pytest.raises(Profile.DoesNotExist):
+        profile_services.get_minimal_by_email("missing@email.com")
+
+    profile_services.archive(combined_profile)
+    with pytest.raises(Profile.DoesNotExist):
+        profile_services.get_minimal_by_email("email1@email.com")
+
+
+def test_get_minimal_by_emails(combined_profile, django_assert_num_queries):
+    profile_services.rebuild_minimal_documents()
+    document = profile_services.build_minimal_document(combined_profile).document
+
+    with django_assert_num_queries(1):
+        result = profile_services.get_minimal_by_emails(
+            ["EMAIL1@email.com", "email2@email.com", "missing@email.com"]
+        )
+    assert result == {
+        "results": {"EMAIL1@email.com": document, "email2@email.com": document},
+        "missing": ["missing@email.com"],
+    }
+
+
+def test_get_page(combined_profile, django_assert_num_queries):
+    for i in range(4):
+        Profile.objects.create(
+            sso_email_id=f"user{i}@id.example.com",
+            first_name="Jane",
+            last_name="Doe",
+            primary_email=f"user{i}@example.com",
+            emails=[f"user{i}@example.com"],
+        )
+    profiles = profile_services.get_filtered(is_active=True)
+    ids = sorted(profiles.values_list("sso_email_id", flat=True))
+
+    with django_assert_num_queries(1):
+        page = profile_services.get_page(profiles, count=2, after=ids[1])
+    assert [profile.sso_email_id for profile in page] == ids[2:4]
+    assert profile_services.get_page(profiles, count=2, offset=2) == page
@@ -1,5 +1,7 @@
 import pytest
 from django.contrib.admin.models import LogEntry
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from profiles.models.generic import Email
 from profiles.models.staff_sso import StaffSSOProfile, StaffSSOProfileEmail
@@ -198,12 +200,93 @@ def test_update(sso_profile):
     assert log.is_change()
     assert log.user.pk == "via-api"
     assert log.object_repr == str(sso_profile)
+    assert log.get_change_message() == "Updating StaffSSOProfile record: emails"
     assert (
-        log.get_change_message()
-        == "Updating StaffSSOProfile record: first_name, last_name"
+        LogEntry.objects.last().get_change_message()
+        == "Updating StaffSSOProfile record: first_name, last_name, emails"
     )
 
 
+def test_update_emails_queries_do_not_grow_with_emails(sso_profile):
+    def count_queries(all_emails: list[str]) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            staff_sso_services.update(
+                staff_sso_profile=sso_profile,
+                first_name=None,
+                last_name=None,
+                all_emails=all_emails,
+                primary_email=all_emails[-1],
+                contact_email=all_emails[-1],
+            )
+        return len(queries)
+
+    emails = ["email1@email.com", "email2@email.com"]
+    count_queries(emails)  # warm up the content type cache
+    few = count_queries(emails := [*emails, "a0@email.com", "a1@email.com"])
+    many = count_queries(emails := [*emails, *(f"b{i}@email.com" for i in range(20))])
+
+    assert few == many
+    assert sso_profile.emails.count() == 24
+    assert sso_profile.primary_email == "b19@email.com"
+    assert sso_profile.contact_email == "b19@email.com"
+
+
+def test_bulk_update_logs_the_changed_fields(sso_profile, django_user_model):
+    other_profile = StaffSSOProfile.objects.create(
+        user=django_user_model.objects.create_user(sso_email_id="other@email.com"),
+        first_name="Jane",
+        last_name="Doe",
+    )
+    StaffSSOProfileEmail.objects.create(
+        profile=other_profile,
+        email=Email.objects.create(address="other@email.com"),
+        is_primary=True,
+    )
+
+    staff_sso_services.bulk_update(
+        profiles=[
+            {
+                "sso_email_id": sso_profile.user_id,
+                "first_name": "John",
+                "last_name": "Doe",
+                "all_emails": ["email1@email.com", "email3@email.com"],
+                "primary_email": "email1@email.com",
+                "contact_email": None,
+            },
+            {
+                "sso_email_id": other_profile.user_id,
+                "first_name": "Janet",
+                "last_name": "Doe",
+                "all_emails": ["other@email.com"],
+                "primary_email": "other@email.com",
+                "contact_email": None,
+            },
+        ]
+    )
+
+    assert set(LogEntry.objects.values_list("object_id", "change_message")) == {
+        (str(sso_profile.pk), "Updating StaffSSOProfile record: emails"),
+        (str(other_profile.pk), "Updating StaffSSOProfile record: first_name"),
+    }
+
+
+def test_insert_new_skips_conflicting_rows():
+    existing = Email.objects.create(address="existing@email.com")
+
+    inserted = staff_sso_services.insert_new(
+        Email,
+        [Email(address="existing@email.com"), Email(address="new@email.com")],
+        ["address"],
+    )
+
+    assert [(email.pk, email.address) for email in inserted] == [
+        (Email.objects.get(address="new@email.com").pk, "new@email.com")
+    ]
+    assert Email.history.filter(address="existing@email.com").count() == 1
+    assert Email.history.get(address="new@email.com").id == inserted[0].pk
+    assert Email.objects.get(pk=existing.pk).address == "existing@email.com"
+
+
 def test_delete_from_database(sso_profile):
     obj_repr = str(sso_profile)
     sso_profile.refresh_from_db()
@@ -217,94 +300,3 @@ def test_delete_from_database(sso_profile):
     assert log.user.pk == "via-api"
     assert log.object_repr == obj_repr
     assert log.get_change_message() == "Deleting Staff SSO Profile record"
-
-
-def test_set_email_details(sso_profile):
-    email = Email.objects.create(address="andy@adams.com")
-    second_email = Email.objects.create(address="barney@bates.com")
-    #
-    # Through record
-    #
-    # no through record exists
-    with pytest.raises(StaffSSOProfileEmail.DoesNotExist):
-        assert StaffSSOProfileEmail.objects.get(
-            profile=sso_profile,
-            email=email,
-        )
-    staff_sso_services.set_email_details(
-        profile=sso_profile,
-        email=email,
-    )
-    # through record created
-    assert StaffSSOProfileEmail.objects.get(
-        profile=sso_profile,
-        email=email,
-    )
-    # existing through record allowed
-    staff_sso_services.set_email_details(
-        profile=sso_profile,
-        email=email,
-    )
-    #
-    # Primary email
-    #
-    assert sso_profile.primary_email != email.address
-    staff_sso_services.set_email_details(
-        profile=sso_profile,
-        email=email,
-        is_primary=True,
-    )
-    assert sso_profile.primary_email == email.address
-    # only 1 primary address allowed
-    assert (
-        StaffSSOProfileEmail.objects.filter(
-            profile=sso_profile, is_primary=True
-        ).count()
-        == 1
-    )
-    staff_sso_services.set_email_details(
-        profile=sso_profile,
-        email=second_email,
-        is_primary=True,
-    )
-    assert sso_profile.primary_email == second_email.address
-    assert (
-        StaffSSOProfileEmail.objects.filter(
-            profile=sso_profile, is_primary=True
-        ).count()
-        == 1
-    )
-    #
-    #  Contact email
-    #
-    assert (
-        StaffSSOProfileEmail.objects.filter(
-            profile=sso_profile, is_contact=True
-        ).count()
-        == 0
-    )
-    assert sso_profile.contact_email is None
-    staff_sso_services.set_email_details(
-        profile=sso_profile,
-        email=email,
-        is_contact=True,
-    )
-    assert sso_profile.contact_email == email.address  # type: ignore
-    assert (
-        StaffSSOProfileEmail.objects.filter(
-            profile=sso_profile, is_contact=True
-        ).count()
-        == 1
-    )
-    staff_sso_services.set_email_details(
-        profile=sso_profile,
-        email=second_email,
-        is_contact=True,
-    )
-    assert sso_profile.contact_email == second_email.address  # type: ignore
-    assert (
-        StaffSSOProfileEmail.objects.filter(
-            profile=sso_profile, is_contact=True
-        ).count()
-        == 1
-    )
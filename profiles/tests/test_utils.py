@@ -1,6 +1,8 @@
 from re import A
 from unittest.mock import call
 
+import PIL.Image
+import PIL.ImageOps
 import pytest
 
 from profiles import types, utils
@@ -361,8 +363,8 @@ def test_get_crop_dimensions():
 
 
 def test_resize_image(mocker):
-    PILImage = mocker.patch("profiles.utils.Image")
-    PILImageOps = mocker.patch("profiles.utils.ImageOps")
+    PILImage = mocker.patch("PIL.Image")
+    PILImageOps = mocker.patch("PIL.ImageOps")
     file = mocker.Mock()
     img = mocker.Mock()
     img.mode = "HSB"
@@ -3,7 +3,6 @@ from io import BytesIO
 
 from django.core.files.base import File
 from django.core.files.storage import storages
-from PIL import Image, ImageOps
 
 from profiles.types import (
     Dimension,
@@ -40,6 +39,10 @@ def resize_image(
     focus_point: FocusPointOption | Point = FocusPointOption.CENTER,
     approach: RatioApproach = RatioApproach.CROP,
 ):
+    # Pillow is only needed here, so isn't loaded by the processes that import
+    # this module without resizing anything
+    from PIL import Image, ImageOps
+
     image: Image.Image = Image.open(file)
     original_dimensions = image.size
     orig_width, orig_height = original_dimensions
@@ -1,6 +1,5 @@
 from django.contrib import admin
 
-from core.utils import StaffSSOUserS3Ingest
 from user.models import User
 
 
@@ -10,4 +9,7 @@ class SSOSyncUserAdmin(admin.ModelAdmin):
 
     @admin.action(description="Sync identity users with Staff SSO")
     def sync_sso_users(self, request, queryset) -> None:
+        # the ingest (boto3, smart_open) is only loaded when it's run
+        from core.utils import StaffSSOUserS3Ingest
+
         StaffSSOUserS3Ingest()
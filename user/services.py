@@ -1,9 +1,10 @@
 from typing import TYPE_CHECKING, Optional
 
-from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
-from django.contrib.admin.options import get_content_type_for_model
+from django.contrib.admin.models import ADDITION, CHANGE, DELETION
 from django.contrib.auth import get_user_model
+from django.db import connection
 
+from core import audit
 from user.exceptions import UserExists, UserIsArchived, UserIsNotArchived
 
 
@@ -62,13 +63,11 @@ def create(
         requesting_user_id = "via-api"
         if requesting_user is not None:
             requesting_user_id = requesting_user.pk
-        LogEntry.objects.log_action(
+        audit.log_action(
             user_id=requesting_user_id,
-            content_type_id=get_content_type_for_model(user).pk,
-            object_id=user.pk,
-            object_repr=str(user),
-            change_message=reason,
+            obj=user,
             action_flag=ADDITION,
+            change_message=reason,
         )
 
         return user
@@ -104,13 +103,11 @@ def update(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(user).pk,
-        object_id=user.pk,
-        object_repr=str(user),
-        change_message=reason,
+        obj=user,
         action_flag=CHANGE,
+        change_message=reason,
     )
 
 
@@ -126,13 +123,11 @@ def archive(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(user).pk,
-        object_id=user.pk,
-        object_repr=str(user),
-        change_message=reason,
+        obj=user,
         action_flag=CHANGE,
+        change_message=reason,
     )
 
     user.is_active = False
@@ -151,13 +146,11 @@ def unarchive(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(user).pk,
-        object_id=user.pk,
-        object_repr=str(user),
-        change_message=reason,
+        obj=user,
         action_flag=CHANGE,
+        change_message=reason,
     )
 
     user.is_active = True
@@ -173,18 +166,167 @@ def delete_from_database(
     requesting_user_id = "via-api"
     if requesting_user is not None:
         requesting_user_id = requesting_user.pk
-    LogEntry.objects.log_action(
+    audit.log_action(
         user_id=requesting_user_id,
-        content_type_id=get_content_type_for_model(user).pk,
-        object_id=user.pk,
-        object_repr=str(user),
-        change_message=reason,
+        obj=user,
         action_flag=DELETION,
+        change_message=reason,
     )
 
     user.delete()
 
 
+###############################################################
+# Bulk methods
+###############################################################
+
+
+def get_existing_ids(sso_email_ids: list[str]) -> set[str]:
+    """
+    Which of the given IDs belong to a user, active or not.
+    """
+    return set(
+        User.objects.filter(sso_email_id__in=sso_email_ids).values_list(
+            "sso_email_id", flat=True
+        )
+    )
+
+
+def get_ids_missing_from(table: str, column: str) -> list[str]:
+    """
+    The IDs of the users, active or not, that aren't in the given column of a
+    (staging) table, found with an anti-join rather than a list of IDs.
+    """
+    qn = connection.ops.quote_name
+    users = qn(User._meta.db_table)
+    pk = f"{users}.{qn(User._meta.pk.column)}"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {pk} FROM {users} WHERE {pk} <> %s AND NOT EXISTS "
+            f"(SELECT 1 FROM {table} WHERE {table}.{qn(column)} = {pk})",
+            [User.objects.via_api_id],
+        )
+        return [sso_email_id for (sso_email_id,) in cursor.fetchall()]
+
+
+def get_count() -> int:
+    """
+    The number of users, active or not.
+    """
+    return User.objects.count()
+
+
+def get_by_ids(sso_email_ids: list[str]) -> list[User]:
+    """
+    Retrieve many users, active or not, by their IDs.
+    """
+    return list(User.objects.filter(sso_email_id__in=sso_email_ids))
+
+
+def bulk_create(
+    users: list[dict],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> list[User]:
+    """
+    Set-based version of create, for users that don't exist yet. Each dict has
+    the sso_email_id and is_active of a user.
+    """
+    created = User.objects.bulk_create(
+        [
+            User(sso_email_id=user["sso_email_id"], is_active=user["is_active"])
+            for user in users
+        ]
+    )
+
+    if reason is None:
+        reason = "Creating new User record"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=created,
+        action_flag=ADDITION,
+        change_message=reason,
+    )
+
+    return created
+
+
+def bulk_archive(
+    users: list[User],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> None:
+    """Set-based version of archive"""
+    if any(not user.is_active for user in users):
+        raise UserIsArchived("User is already archived")
+
+    if reason is None:
+        reason = "Archiving User record"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=users,
+        action_flag=CHANGE,
+        change_message=reason,
+    )
+
+    for user in users:
+        user.is_active = False
+    User.objects.bulk_update(users, fields=("is_active",))
+
+
+def bulk_unarchive(
+    users: list[User],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> None:
+    """Set-based version of unarchive"""
+    if any(user.is_active for user in users):
+        raise UserIsNotArchived("User is not archived")
+
+    if reason is None:
+        reason = "Unarchiving User record"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=users,
+        action_flag=CHANGE,
+        change_message=reason,
+    )
+
+    for user in users:
+        user.is_active = True
+    User.objects.bulk_update(users, fields=("is_active",))
+
+
+def bulk_delete_from_database(
+    users: list[User],
+    reason: Optional[str] = None,
+    requesting_user: Optional[User] = None,
+) -> None:
+    """Set-based version of delete_from_database"""
+    if reason is None:
+        reason = "Deleting User record"
+    requesting_user_id = "via-api"
+    if requesting_user is not None:
+        requesting_user_id = requesting_user.pk
+    audit.log_actions(
+        user_id=requesting_user_id,
+        objs=users,
+        action_flag=DELETION,
+        change_message=reason,
+    )
+
+    User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+
 ###############################################################
 # Utility methods
 ###############################################################